@@ -1,10 +1,17 @@
-import sys
 import os
 import json
-from collections import defaultdict
-from typing import Dict, List, Set, Tuple, Any
+import multiprocessing
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, List, Set, Tuple, Any, Iterable, Optional
+import argparse
 import re
 
+from categorize_diagnostic import classifier_for
+from diagnostic_templates import SAMPLE_LIMIT, template_message
+
 # Helper function to parse the input
 def parse_error_data(raw_data_string):
     parsed_data = []
@@ -33,18 +40,20 @@ error_categories = {
         "keywords": [
             "import", "could not be resolved", "no required module provides package",
             "expected module name", "does not match the expected package",
-            "use of package .* not in selector", # Go specific
             "module", # General keyword
-            "use of package .* not in selector", # For package usage without proper import
-            "from \\.\\./.*_test\\.go" # For import/file resolution errors in test files，
             # Resolution Error (Type/Variable/Function Not Found)
             "cannot be resolved to a type", "is not defined", "undefined:", "cannot be resolved",
             "cannot find symbol", "missing type", "lambda expression refers to the missing type",
-            "is not a type" # Go: pflag.Flag is not a type，
+            "is not a type", # Go: pflag.Flag is not a type
             # File/Structural Error (e.g., Java package)
-            "must be defined in its own file", "declared package .* does not match",
+            "must be defined in its own file",
             "should be declared in a file named", "implicitly declared class must have"
         ],
+        "patterns": [
+            r"use of package .* not in selector", # Go: package used without a selector
+            r"from \.\./.*_test\.go", # For import/file resolution errors in test files
+            r"declared package .* does not match"
+        ],
         "description": "Failures related to importing modules or packages, including modules not found, resolution issues, or structural mismatches like package names.",
         "example_context_needed": "Project structure (file paths, go.mod/pyproject.toml etc.), import statements, environment configuration (GOPATH, PYTHONPATH), version of external libraries."
     },
@@ -57,21 +66,22 @@ error_categories = {
             "positional argument cannot appear after keyword arguments", "unterminated",
             "illegal character", "await allowed only within async function", "expecting \"}\"",
             "invalid escape sequence", "not properly closed by a double-quote",
-            "missing ',' in composite literal", "enum classes must not be local" # Java specific,
+            "missing ',' in composite literal", "enum classes must not be local", # Java specific
             "missing ',' before newline in composite literal", # For Go composite literal syntax
-            # Import/Module Resolution Error,
+            # Import/Module Resolution Error
             "import", "could not be resolved", "no required module provides package",
             "expected module name", "does not match the expected package",
-            "use of package .* not in selector", # Go specific
             "module", # General keyword
-            "use of package .* not in selector", # For package usage without proper import
-            "from \\.\\./.*_test\\.go" # For import/file resolution errors in test files
-            # Unused Identifier Error,
+            # Unused Identifier Error
             "must implement the inherited abstract method", 
             "must override or implement a supertype method",
             "name clash", "does not override", "cannot override final method",
             "cannot reduce the visibility of the inherited method"
         ],
+        "patterns": [
+            r"use of package .* not in selector", # Go specific
+            r"from \.\./.*_test\.go" # For import/file resolution errors in test files
+        ],
         "description": "Errors related to the grammatical structure of the code, such as incorrect punctuation, keywords, or statement formation.",
         "example_context_needed": "The line of code with the syntax error, surrounding lines for context, the specific language being used."
     },
@@ -81,11 +91,13 @@ error_categories = {
             "is not visible", "not a field", "no field or method",
             "undefined (type", # Go: c.name undefined (type *Command has no field or method name)
             "private access in", "cannot refer to unexported field",
-            "Cannot override the final method", # Added for final method override attempts
-            "Illegal enclosing instance specification", # Added for inner class instantiation errors
-            "cannot subclass the final class" # Added for final class inheritance attempts,
-            "Cannot invoke .* on the array type", # For array type method invocation errors
-            "Error\\(\\) string" # For interface method implementation errors
+            "cannot override the final method", # Added for final method override attempts
+            "illegal enclosing instance specification", # Added for inner class instantiation errors
+            "cannot subclass the final class" # Added for final class inheritance attempts
+        ],
+        "patterns": [
+            r"cannot invoke .* on the array type", # For array type method invocation errors
+            r"error\(\) string" # For interface method implementation errors
         ],
         "description": "Attempting to access or use a field or method that does not exist on a given type/object, or is not accessible due to visibility rules (e.g., private/protected/unexported).",
         "example_context_needed": "The definition of the type/class, the line of code attempting the access, visibility modifiers (public, private, exported/unexported)."
@@ -98,27 +110,29 @@ error_categories = {
             "incompatible types", "must be a functional interface",
             "invalid composite literal type", "cannot cast from", "assignment mismatch",
             "too many arguments in call", "not enough arguments in call", "non-boolean condition in if statement",
-            "no value\\) used as value", # Escaped parenthesis for regex, or handle carefully
-            "\\(type\\) is not an expression", # Escaped parenthesis
             "anonymous class cannot subclass", "first argument to append must be a slice",
             "cannot inherit from final", "is an invalid type for the variable",
-            "no suitable method found", "argument mismatch", "cannot invoke .* on the array type", # e.g. cannot invoke size() on the array type String[]
+            "no suitable method found", "argument mismatch",
             "cannot be parameterized with arguments", # e.g. Incorrect number of arguments for type Converter<T,E>; it cannot be parameterized with arguments <Integer>
-            "return type .* is not compatible with", "cannot be converted to",
-            "invalid argument" # Added for Go's type mismatch in built-in function calls,
-            "Cannot infer type arguments", # Added for generic type inference errors
-            "Cannot invoke .* on the primitive type", # Added for primitive type method invocation errors
-            "Cannot invoke .* on the array type", # Added for array type method invocation errors
+            "cannot be converted to",
+            "invalid argument", # Added for Go's type mismatch in built-in function calls
+            "cannot infer type arguments", # Added for generic type inference errors
             "is not compatible with throws clause", # Added for exception compatibility
-            "Return type for the method is missing", # Added for missing return type
-            "does not define .* that is applicable here", # Added for method resolution errors
-            "an exception type must be a subclass of" # Added for exception type constraints,
-            "\\(no value\\) used as value", # For using void returns as values
-            "multiple-value .* in single-value context", # For multiple return values in single value context
-            "\\(value of type .* in single-value context", # Another form of multiple return values error
-            "\\(value of type .* for built-in", # For built-in function argument type mismatches
+            "return type for the method is missing", # Added for missing return type
+            "an exception type must be a subclass of", # Added for exception type constraints
             "missing ',' before newline in composite literal" # For composite literal syntax errors
         ],
+        "patterns": [
+            r"no value\) used as value", # Go: using void returns as values
+            r"\(type\) is not an expression",
+            r"cannot invoke .* on the array type", # e.g. cannot invoke size() on the array type String[]
+            r"return type .* is not compatible with",
+            r"cannot invoke .* on the primitive type", # Added for primitive type method invocation errors
+            r"does not define .* that is applicable here", # Added for method resolution errors
+            r"multiple-value .* in single-value context", # For multiple return values in single value context
+            r"\(value of type .* in single-value context", # Another form of multiple return values error
+            r"\(value of type .* for built-in" # For built-in function argument type mismatches
+        ],
         "description": "An operation is attempted with incompatible data types, or a value of one type is used where another is expected. Includes issues with function/method call arguments, return types, and assignments.",
         "example_context_needed": "The types involved in the operation, function signatures, variable declarations, the specific operation being performed."
     },
@@ -163,34 +177,8 @@ error_categories = {
 }
 
 def classify_error(message_obj, categories):
-    msg_text = message_obj["message"].lower()
-    freq = message_obj["frequency"]
+    return classifier_for(categories).classify(message_obj["message"])
 
-    for category_name, cat_details in categories.items():
-        if category_name == "Other Error": # Skip this for now, handle at end
-            continue
-        
-        # Prioritize Constructor Call Error if "constructor" and "is undefined" are present
-        if category_name == "Constructor Call Error":
-            if "constructor" in msg_text and "is undefined" in msg_text:
-                return category_name
-            elif "cannot instantiate the type" in msg_text:
-                 return category_name
-
-        for keyword in cat_details["keywords"]:
-            if keyword in msg_text:
-                # Specific check for "Import ... could not be resolved" vs generic "could not be resolved"
-                if keyword == "could not be resolved" and "import" not in msg_text and "module" not in msg_text:
-                    # This is likely a Resolution Error, not Import Error
-                    # Let it be caught by "Resolution Error (Type/Variable/Function Not Found)"
-                    continue 
-                return category_name
-        for pattern in cat_details.get("patterns", []):
-             if re.search(pattern, msg_text): # Use search for patterns within message
-                return category_name
-                
-    # If no specific category matched, it's "Other Error"
-    return "Other Error"
 # def classify_error(message_obj, categories):
 #     msg_text = message_obj["message"].lower()
 #     freq = message_obj["frequency"]
@@ -236,12 +224,105 @@ def classify_error(message_obj, categories):
 #     # If no specific category matched, it's "Other Error"
 #     return "Other Error"
 
+# Below this many files the pool costs more than it saves
+MIN_FILES_FOR_POOL = 64
+IGNORED_MESSAGES = ("The error messages are:", "```")
+
+
+@dataclass
+class FileMessageStats:
+    """What one diagnostic file contributes to the global statistics (the map step's result)."""
+    message_frequency: Counter = field(default_factory=Counter)
+    # Rounds of this file each message appears in
+    persistence: Dict[str, int] = field(default_factory=dict)
+    fixed_messages: Set[str] = field(default_factory=set)
+    unfixed_messages: Set[str] = field(default_factory=set)
+    # Concrete messages behind each template (only when messages are templated)
+    samples: Dict[str, List[str]] = field(default_factory=dict)
+
+
+def should_ignore_message(message: str, ignored_messages: Iterable[str] = IGNORED_MESSAGES) -> bool:
+    """Check if a message should be ignored (equal to or starting with an ignored message)."""
+    return any(message.startswith(ignored) for ignored in ignored_messages)
+
+
+def add_sample(samples: Dict[str, List[str]], template: str, message: str):
+    kept = samples.setdefault(template, [])
+    if len(kept) < SAMPLE_LIMIT and message not in kept:
+        kept.append(message)
+
+
+def file_message_stats(file_data: dict, ignored_messages: Iterable[str] = IGNORED_MESSAGES,
+                       templated: bool = False) -> FileMessageStats:
+    """
+    Analyze messages in a single file across rounds. With templated=True
+    every message is replaced by its template (identifiers, types, files
+    and positions as placeholders) before counting.
+    """
+    stats = FileMessageStats()
+    round_history = file_data.get('roundHistory', [])
+    if not round_history:
+        return stats
+
+    # Track messages for each round
+    messages_by_round = {}
+    all_messages = set()
+    for round_data in round_history:
+        round_num = round_data.get('round', 0)
+        # Filter out ignored messages
+        messages = [msg for msg in round_data.get('diagnosticMessages', [])
+                    if not should_ignore_message(msg, ignored_messages)]
+        if templated:
+            templates = [template_message(msg) for msg in messages]
+            for template, msg in zip(templates, messages):
+                add_sample(stats.samples, template, msg)
+            messages = templates
+        messages_by_round[round_num] = set(messages)
+        stats.message_frequency.update(messages)
+        all_messages.update(messages)
+
+    # Messages that appeared in any round but not in the last round were fixed
+    last_round_messages = messages_by_round[max(messages_by_round)]
+    stats.fixed_messages = all_messages - last_round_messages
+    # Messages that appeared in the last round were not fixed
+    stats.unfixed_messages = set(last_round_messages)
+
+    for message in all_messages:
+        stats.persistence[message] = sum(1 for round_messages in messages_by_round.values()
+                                         if message in round_messages)
+    return stats
+
+
+def load_file_stats(file_path: str, ignored_messages: Iterable[str] = IGNORED_MESSAGES,
+                    templated: bool = False) -> Tuple[Optional[FileMessageStats], str]:
+    """
+    Map step, run in a worker: parse one diagnostic file and reduce it to its
+    statistics, so only those (not the payload) travel back. Returns
+    (stats, "") or (None, the message to print).
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except json.JSONDecodeError as je:
+        return None, f"JSON parsing error in {file_path}: {je}"
+    except UnicodeDecodeError as ue:
+        return None, f"Unicode decode error in {file_path}: {ue}"
+    except Exception as e:
+        return None, f"Unexpected error reading {file_path}: {e}"
+    if not isinstance(data, dict):
+        return None, f"Warning: {file_path} does not contain valid diagnostic data"
+    try:
+        return file_message_stats(data, ignored_messages, templated), ""
+    except Exception as e:
+        return None, f"Unexpected error reading {file_path}: {e}"
+
+
 class DiagnosticAnalyzer:
-    def __init__(self, diagnostic_dir: str, verbose: bool):
+    def __init__(self, diagnostic_dir: str, verbose: bool, jobs: Optional[int] = None, templated: bool = False):
         self.diagnostic_dir = diagnostic_dir
-        self.diagnostic_files = []
-        # Track messages by round for each file
-        self.messages_by_round = defaultdict(lambda: defaultdict(set))
+        # Count message templates instead of raw messages, keeping a few samples of each
+        self.templated = templated
+        self.message_samples: Dict[str, List[str]] = {}
         # Track global frequency of messages
         self.global_message_frequency = defaultdict(int)
         # Track message persistence (how many rounds a message appears)
@@ -250,32 +331,29 @@ class DiagnosticAnalyzer:
         self.fixed_messages = set()
         self.unfixed_messages = set()
         self.verbose = verbose
+        self.jobs = max(1, jobs or multiprocessing.cpu_count())
         # Messages to ignore
-        self.ignored_messages = {"The error messages are:", "```"}
+        self.ignored_messages = set(IGNORED_MESSAGES)
         
     def should_ignore_message(self, message: str) -> bool:
         """Check if a message should be ignored."""
-        # Check for exact matches
-        if message in self.ignored_messages:
-            return True
-        # Check if message starts with any of the ignored messages
-        return any(message.startswith(ignored) for ignored in self.ignored_messages)
-        
-    # def load_diagnostic_files(self):
-    #     """Load all diagnostic JSON files from the directory."""
-    #     for filename in os.listdir(self.diagnostic_dir):
-    #         if filename.endswith('.json'):
-    #             file_path = os.path.join(self.diagnostic_dir, filename)
-    #             try:
-    #                 with open(file_path, 'r') as f:
-    #                     data = json.load(f)
-    #                     self.diagnostic_files.append(data)
-    #                     self.analyze_file_messages(data, filename)
-    #             except Exception as e:
-    #                 print(f"Error reading {filename}: {e}")
+        return should_ignore_message(message, self.ignored_messages)
+
+    def diagnostic_file_paths(self) -> List[str]:
+        """Every .json file under the directory, in os.walk order."""
+        paths = []
+        for root, _, files in os.walk(self.diagnostic_dir):
+            paths.extend(os.path.join(root, filename) for filename in files
+                         if filename.lower().endswith('.json'))
+        return paths
+
     def load_diagnostic_files(self):
         """
         Recursively load all diagnostic JSON files from the directory and its subdirectories.
+
+        Files are parsed in a process pool; each worker returns only that
+        file's statistics, which are merged here in walk order, so no payload
+        is kept and the result matches a sequential load.
         
         Returns:
             int: Number of successfully loaded files
@@ -285,33 +363,15 @@ class DiagnosticAnalyzer:
             return 0
             
         loaded_count = 0
-        
-        # Walk through directory and subdirectories
-        for root, _, files in os.walk(self.diagnostic_dir):
-            for filename in files:
-                if not filename.lower().endswith('.json'):
-                    continue
-                    
-                file_path = os.path.join(root, filename)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        if not isinstance(data, dict):
-                            print(f"Warning: {file_path} does not contain valid diagnostic data")
-                            continue
-                            
-                        self.diagnostic_files.append(data)
-                        # Pass relative path from diagnostic_dir for better identification
-                        rel_path = os.path.relpath(file_path, self.diagnostic_dir)
-                        self.analyze_file_messages(data, rel_path)
-                        loaded_count += 1
-                        
-                except json.JSONDecodeError as je:
-                    print(f"JSON parsing error in {file_path}: {je}")
-                except UnicodeDecodeError as ue:
-                    print(f"Unicode decode error in {file_path}: {ue}")
-                except Exception as e:
-                    print(f"Unexpected error reading {file_path}: {e}")
+        paths = self.diagnostic_file_paths()
+        load = partial(load_file_stats, ignored_messages=tuple(self.ignored_messages), templated=self.templated)
+
+        if self.jobs == 1 or len(paths) < MIN_FILES_FOR_POOL:
+            loaded_count = self._merge_results(map(load, paths))
+        else:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                chunksize = max(1, len(paths) // (self.jobs * 8))
+                loaded_count = self._merge_results(executor.map(load, paths, chunksize=chunksize))
                     
         if loaded_count == 0:
             print(f"No JSON files found in {self.diagnostic_dir} and its subdirectories")
@@ -320,43 +380,32 @@ class DiagnosticAnalyzer:
             
         return loaded_count
 
+    def _merge_results(self, results: Iterable[Tuple[Optional[FileMessageStats], str]]) -> int:
+        loaded_count = 0
+        for stats, error in results:
+            if stats is None:
+                print(error)
+                continue
+            self.merge_file_stats(stats)
+            loaded_count += 1
+        return loaded_count
+
+    def merge_file_stats(self, stats: FileMessageStats):
+        """Reduce step: fold one file's statistics into the global ones."""
+        for message, frequency in stats.message_frequency.items():
+            self.global_message_frequency[message] += frequency
+        for message, persistence in stats.persistence.items():
+            self.message_persistence[message] = max(self.message_persistence[message], persistence)
+        self.fixed_messages.update(stats.fixed_messages)
+        self.unfixed_messages.update(stats.unfixed_messages)
+        for template, samples in stats.samples.items():
+            for message in samples:
+                add_sample(self.message_samples, template, message)
+
     def analyze_file_messages(self, file_data: dict, filename: str):
         """Analyze messages in a single file across rounds."""
-        round_history = file_data.get('roundHistory', [])
-        if not round_history:
-            return
-
-        # Track messages for each round
-        all_messages = set()
-        for round_data in round_history:
-            round_num = round_data.get('round', 0)
-            # Filter out ignored messages
-            messages = [msg for msg in round_data.get('diagnosticMessages', []) 
-                       if not self.should_ignore_message(msg)]
-            
-            # Add messages to round tracking
-            self.messages_by_round[filename][round_num] = set(messages)
-            
-            # Update global frequency
-            for message in messages:
-                self.global_message_frequency[message] += 1
-                all_messages.add(message)
-        
-        # Determine which messages were fixed and which weren't
-        last_round = max(self.messages_by_round[filename].keys())
-        last_round_messages = self.messages_by_round[filename][last_round]
-        
-        # Messages that appeared in any round but not in the last round were fixed
-        self.fixed_messages.update(all_messages - last_round_messages)
-        # Messages that appeared in the last round were not fixed
-        self.unfixed_messages.update(last_round_messages)
-        
-        # Calculate persistence for each message
-        for message in all_messages:
-            persistence = sum(1 for round_num in self.messages_by_round[filename] 
-                            if message in self.messages_by_round[filename][round_num])
-            self.message_persistence[message] = max(self.message_persistence[message], persistence)
-    
+        self.merge_file_stats(file_message_stats(file_data, self.ignored_messages, self.templated))
+
     def analyze_difficulty(self) -> Dict[str, List[Tuple[str, int]]]:
         """Analyze the difficulty of fixing messages based on persistence."""
         # Sort messages by persistence (higher persistence = harder to fix)
@@ -404,6 +453,8 @@ class DiagnosticAnalyzer:
         else:
             for message, frequency in sorted_frequency:
                 report.append(f"Frequency: {frequency} - {message}")
+                for sample in self.message_samples.get(message, []):
+                    report.append(f"    e.g. {sample}")
         
         # Difficulty analysis
         report.append("\n=== Message Difficulty Analysis ===")
@@ -438,12 +489,10 @@ def print_category_statistics(message_frequency: Dict[str, int], categories: Dic
     # Initialize dictionaries to store both frequencies and messages
     category_stats = {category: {"frequency": 0, "messages": []} for category in categories.keys()}
     
-    # Classify each error and collect frequencies and messages
-    for data in parsed_data:
-        # Skip empty messages
-        if not data["message"].strip():
-            continue
-        category = classify_error(data, categories)
+    # Classify each error and collect frequencies and messages (skipping empty messages)
+    parsed_data = [data for data in parsed_data if data["message"].strip()]
+    categories_of = classifier_for(categories).classify_many(data["message"] for data in parsed_data)
+    for data, category in zip(parsed_data, categories_of):
         category_stats[category]["frequency"] += data["frequency"]
         category_stats[category]["messages"].append({
             "message": data["message"],
@@ -545,10 +594,15 @@ def prepare_diagnostic_data(message_frequency: Dict[str, int]) -> List[dict]:
 def main():
     # USE CASE 
     # python scripts/analyze_diagnostics.py diagnostic_data verbose 
-    # The raw data string from the prompt
-    diagnostic_dir = sys.argv[1]
-    verbose = sys.argv[2] == "verbose"
-    analyzer = DiagnosticAnalyzer(diagnostic_dir, verbose)
+    # python scripts/analyze_diagnostics.py diagnostic_data verbose 8 --templates
+    ap = argparse.ArgumentParser(description="Analyze diagnostic messages of the fixing rounds.")
+    ap.add_argument("diagnostic_dir")
+    ap.add_argument("mode", nargs="?", default="", help="'verbose' to list every message.")
+    ap.add_argument("jobs", nargs="?", type=int, default=None, help="Processes parsing the files.")
+    ap.add_argument("--templates", action="store_true",
+                    help="Count message templates (identifiers, types, files, positions collapsed).")
+    args = ap.parse_args()
+    analyzer = DiagnosticAnalyzer(args.diagnostic_dir, args.mode == "verbose", args.jobs, args.templates)
     analyzer.load_diagnostic_files()
     
     # Generate and print the report
@@ -85,7 +85,8 @@ error_categories = {
         "example_context_needed": "The class definition (especially constructors), the line of code attempting instantiation, arguments passed to the constructor."
     },
     "File/Structural Error (e.g., Java package)": {
-        "keywords": ["must be defined in its own file", "declared package .* does not match"],
+        "keywords": ["must be defined in its own file"],
+        "patterns": [r"declared package .* does not match"],
         "description": "Errors related to how code is organized in files or packages, common in languages like Java (e.g., public class name must match filename).",
         "example_context_needed": "Filename, package declaration in the file, directory structure, class/type definition."
     },
@@ -103,59 +104,159 @@ error_categories = {
     }
 }
 
-def classify_error(message_obj, categories):
-    msg_text = message_obj["message"].lower()
-    freq = message_obj["frequency"]
-
-    # Handle Empty or Unclear Error first using its patterns
-    cat_details = categories["Empty or Unclear Error"]
-    if not msg_text: # Truly empty
-        return "Empty or Unclear Error"
-    for pattern in cat_details.get("patterns", []):
-        if re.match(pattern, message_obj["message"]): # Use original message for regex if needed
-             # Add a check for very short messages that are just code snippets often with newlines
-            if "\n" in message_obj["message"] and len(message_obj["message"]) < 150 : # Arbitrary length for snippets
-                 return "Empty or Unclear Error" # Treat code snippets as unclear for now
-            if not any(kw in msg_text for kw in ["error", "failed", "unable", "warning", "exception"]): # if no error-like keyword
-                if len(msg_text.split()) < 5 : # and very few words
-                    return "Empty or Unclear Error"
-
-
-    for category_name, cat_details in categories.items():
-        if category_name == "Empty or Unclear Error" or category_name == "Other Error": # Skip these for now, handle at end
+UNCLEAR_CATEGORY = "Empty or Unclear Error"
+FALLBACK_CATEGORY = "Other Error"
+# A keyword that only counts when one of the guard words is in the message too:
+# "could not be resolved" is an import error only for imports/modules, otherwise
+# it is left to the resolution keywords of later categories.
+GUARDED_KEYWORDS = {"could not be resolved": ("import", "module")}
+_ERROR_WORDS = ("error", "failed", "unable", "warning", "exception")
+# Regex syntax in a keyword means it was meant as a pattern (keywords are substrings)
+_REGEX_IN_KEYWORD = re.compile(r"\.\*|\\")
+
+
+def validate_categories(categories):
+    """Raise ValueError listing every malformed entry of a category table."""
+    problems = []
+    if FALLBACK_CATEGORY not in categories:
+        problems.append(f"missing fallback category {FALLBACK_CATEGORY!r}")
+    for name, details in categories.items():
+        keywords = details.get("keywords")
+        if not isinstance(keywords, list):
+            problems.append(f"{name}: 'keywords' must be a list")
             continue
-        
-        # Prioritize Constructor Call Error if "constructor" and "is undefined" are present
-        if category_name == "Constructor Call Error":
-            if "constructor" in msg_text and "is undefined" in msg_text:
-                return category_name
-            elif "cannot instantiate the type" in msg_text:
-                 return category_name
-
-
-        for keyword in cat_details["keywords"]:
-            if keyword in msg_text:
-                # Specific check for "Import ... could not be resolved" vs generic "could not be resolved"
-                if keyword == "could not be resolved" and "import" not in msg_text and "module" not in msg_text:
-                    # This is likely a Resolution Error, not Import Error
-                    # Let it be caught by "Resolution Error (Type/Variable/Function Not Found)"
-                    continue 
-                return category_name
-        for pattern in cat_details.get("patterns", []):
-             if re.search(pattern, msg_text): # Use search for patterns within message
-                return category_name
-                
-    # If no specific category matched, it's "Other Error"
-    return "Other Error"
+        seen = set()
+        for keyword in keywords:
+            if not isinstance(keyword, str) or not keyword:
+                problems.append(f"{name}: empty or non-string keyword {keyword!r}")
+                continue
+            if keyword != keyword.lower():
+                problems.append(f"{name}: keyword {keyword!r} is not lower-case (messages are matched lower-cased)")
+            if _REGEX_IN_KEYWORD.search(keyword):
+                problems.append(f"{name}: keyword {keyword!r} looks like a regex (move it to 'patterns')")
+            if keyword in seen:
+                problems.append(f"{name}: duplicate keyword {keyword!r}")
+            seen.add(keyword)
+        for pattern in details.get("patterns", []):
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                problems.append(f"{name}: invalid pattern {pattern!r}: {e}")
+    if problems:
+        raise ValueError("Invalid error category table:\n  " + "\n  ".join(problems))
+
+
+def _trie_regex(words):
+    """
+    One regex for a set of literal words, factored by common prefixes, so the
+    engine follows a single branch per character instead of trying every word.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class DiagnosticClassifier:
+    """
+    classify_error compiled once per category table.
+
+    Each category's keywords (as a prefix trie) and patterns become one
+    regex, searched in table order, so the first matching category still
+    wins; results are memoized per lower-cased message.
+    """
+
+    def __init__(self, categories, validate=True):
+        if validate:
+            validate_categories(categories)
+        self.categories = categories
+        self.unclear_patterns = [re.compile(p) for p in categories.get(UNCLEAR_CATEGORY, {}).get("patterns", [])]
+        self.rules = []
+        for name, details in categories.items():
+            if name in (UNCLEAR_CATEGORY, FALLBACK_CATEGORY):
+                continue
+            plain = [k for k in details["keywords"] if k not in GUARDED_KEYWORDS]
+            alternatives = ([_trie_regex(plain)] if plain else []) + [f"(?:{p})" for p in details.get("patterns", [])]
+            regex = re.compile("|".join(alternatives)) if alternatives else None
+            guarded = [(k, GUARDED_KEYWORDS[k]) for k in details["keywords"] if k in GUARDED_KEYWORDS]
+            self.rules.append((name, regex, guarded))
+        self._cache = {}
+
+    def _is_unclear(self, text):
+        if not text:
+            return True
+        for pattern in self.unclear_patterns:
+            if pattern.match(text):
+                # Very short messages that are just code snippets, often with newlines
+                if "\n" in text and len(text) < 150:
+                    return True
+                if not any(word in text for word in _ERROR_WORDS) and len(text.split()) < 5:
+                    return True
+        return False
+
+    def is_unclear(self, message):
+        """Whether the table's Empty or Unclear check (which goes by length) flags the message."""
+        return bool(self.unclear_patterns) and self._is_unclear(message.lower())
+
+    def _classify(self, text):
+        if self.unclear_patterns and self._is_unclear(text):
+            return UNCLEAR_CATEGORY
+        for name, regex, guarded in self.rules:
+            if regex is not None and regex.search(text):
+                return name
+            for keyword, guards in guarded:
+                if keyword in text and any(g in text for g in guards):
+                    return name
+        return FALLBACK_CATEGORY
+
+    def classify(self, message):
+        text = message.lower()
+        category = self._cache.get(text)
+        if category is None:
+            category = self._cache[text] = self._classify(text)
+        return category
+
+    def classify_many(self, messages):
+        """Categories of many messages, in order."""
+        classify = self.classify
+        return [classify(message) for message in messages]
+
+    def category_frequencies(self, parsed_data):
+        """Summed frequency per category of [{"message", "frequency"}, ...] rows (every category present)."""
+        stats = {category: 0 for category in self.categories}
+        for data, category in zip(parsed_data, self.classify_many(d["message"] for d in parsed_data)):
+            stats[category] += data["frequency"]
+        return stats
+
+
+_classifiers = {}
+
+
+def classifier_for(categories):
+    """The compiled classifier of a category table (built and validated on first use)."""
+    entry = _classifiers.get(id(categories))
+    if entry is None or entry[0] is not categories:
+        entry = _classifiers[id(categories)] = (categories, DiagnosticClassifier(categories))
+    return entry[1]
+
+
+def classify_error(message_obj, categories):
+    return classifier_for(categories).classify(message_obj["message"])
 
 def print_breif_category_statistics(parsed_data, categories):
     # Initialize frequency counter for each category
-    category_stats = {category: 0 for category in categories.keys()}
-    
-    # Classify each error and count frequencies
-    for data in parsed_data:
-        category = classify_error(data, categories)
-        category_stats[category] += data["frequency"]
+    category_stats = classifier_for(categories).category_frequencies(parsed_data)
     
     # Print table header
     print("\n{:<40} | {:<10}".format("Category", "Frequency"))
@@ -177,8 +278,8 @@ def print_category_statistics(parsed_data, categories):
     category_stats = {category: {"frequency": 0, "messages": []} for category in categories.keys()}
     
     # Classify each error and collect frequencies and messages
-    for data in parsed_data:
-        category = classify_error(data, categories)
+    categories_of = classifier_for(categories).classify_many(d["message"] for d in parsed_data)
+    for data, category in zip(parsed_data, categories_of):
         category_stats[category]["frequency"] += data["frequency"]
         category_stats[category]["messages"].append({
             "message": data["message"],
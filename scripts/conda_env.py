@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Resolve conda environments once and launch commands in them directly.
+
+`conda run -n <env> ...` pays conda's startup and activation on every call,
+which dominates the per-folder cost of the Python coverage scripts. Here each
+environment is activated once (one `conda run` that dumps os.environ), the
+variables activation adds or changes are cached in-process and on disk, and
+callers get a ready-made environment dict to pass to subprocess.
+
+Usage from bash (the exit status is non-zero, with nothing on stdout, if the
+environment cannot be resolved, so check it before eval):
+    exports="$(python3 /LSPRAG/scripts/conda_env.py --shell black)" || exit 1
+    eval "$exports"
+"""
+
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+DEFAULT_CACHE_FILE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "lsprag", "conda_envs.json"
+)
+
+# Variables that describe the calling shell rather than the environment
+_VOLATILE = {"_", "PWD", "OLDPWD", "SHLVL", "CONDA_EXE", "CONDA_PYTHON_EXE", "CONDA_SHLVL"}
+
+
+@dataclass(frozen=True)
+class CondaEnv:
+    """An activated conda environment: interpreter plus the variables activation sets."""
+    name: str
+    prefix: str
+    python: str
+    path_prepend: List[str] = field(default_factory=list)
+    variables: Dict[str, str] = field(default_factory=dict)
+
+    def environ(self, base: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """A copy of base (default os.environ) as it looks after activating this environment."""
+        env = dict(os.environ if base is None else base)
+        env.update(self.variables)
+        current = env.get("PATH", "")
+        prepend = [p for p in self.path_prepend if p not in current.split(os.pathsep)]
+        env["PATH"] = os.pathsep.join(prepend + ([current] if current else []))
+        return env
+
+    def to_json(self) -> Dict:
+        return {
+            "name": self.name, "prefix": self.prefix, "python": self.python,
+            "path_prepend": self.path_prepend, "variables": self.variables,
+        }
+
+
+_cache: Dict[str, CondaEnv] = {}
+_lock = threading.Lock()
+
+
+def _load_disk_cache(cache_file: str) -> Dict[str, Dict]:
+    try:
+        with open(cache_file, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_disk_cache(cache_file: str, name: str, env: CondaEnv) -> None:
+    data = _load_disk_cache(cache_file)
+    data[name] = env.to_json()
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        print(f"Warning: could not write conda env cache {cache_file}: {e}", file=sys.stderr)
+
+
+def _activate(name: str) -> CondaEnv:
+    """Run `conda run` once and record what activation changes."""
+    probe = "import json, os, sys; print(json.dumps({'prefix': sys.prefix, 'python': sys.executable, 'environ': dict(os.environ)}))"
+    proc = subprocess.run(
+        ["conda", "run", "-n", name, "python", "-c", probe],
+        capture_output=True, text=True, check=True,
+    )
+    # conda run may print banners; the probe output is the last JSON line
+    payload = json.loads([ln for ln in proc.stdout.splitlines() if ln.startswith("{")][-1])
+    activated = payload["environ"]
+
+    current_path = os.environ.get("PATH", "").split(os.pathsep)
+    path_prepend = [p for p in activated.get("PATH", "").split(os.pathsep) if p and p not in current_path]
+    variables = {
+        k: v for k, v in activated.items()
+        if k != "PATH" and k not in _VOLATILE and os.environ.get(k) != v
+    }
+    return CondaEnv(name, payload["prefix"], payload["python"], path_prepend, variables)
+
+
+def resolve_conda_env(name: str, cache_file: Optional[str] = DEFAULT_CACHE_FILE, refresh: bool = False) -> CondaEnv:
+    """
+    Return the activated environment `name`, resolving it at most once per process
+    (and once per machine when cache_file is set). Raises CalledProcessError /
+    FileNotFoundError when conda cannot activate the environment.
+    """
+    with _lock:
+        if not refresh and name in _cache:
+            return _cache[name]
+
+        env = None
+        if cache_file and not refresh:
+            cached = _load_disk_cache(cache_file).get(name)
+            if cached and os.path.exists(cached.get("python", "")):
+                env = CondaEnv(**cached)
+        if env is None:
+            env = _activate(name)
+            if cache_file:
+                _save_disk_cache(cache_file, name, env)
+
+        _cache[name] = env
+        return env
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Resolve a conda environment once and print how to use it.")
+    ap.add_argument("name", help="Conda environment name.")
+    group = ap.add_mutually_exclusive_group()
+    group.add_argument("--shell", action="store_true", help="Print export statements for eval in bash.")
+    group.add_argument("--python", action="store_true", help="Print the interpreter path.")
+    ap.add_argument("--refresh", action="store_true", help="Ignore cached resolution and activate again.")
+    args = ap.parse_args()
+
+    env = resolve_conda_env(args.name, refresh=args.refresh)
+    if args.python:
+        print(env.python)
+    elif args.shell:
+        for key, value in env.variables.items():
+            print(f"export {key}={shlex.quote(value)}")
+        if env.path_prepend:
+            print(f"export PATH={shlex.quote(os.pathsep.join(env.path_prepend))}:\"$PATH\"")
+    else:
+        print(json.dumps(env.to_json(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Covered-line checks for mutants of a Python module.
+
+coverage.py records a statement that spans several lines only on its first
+line (and a decorated definition on its first decorator), but a mutated node
+keeps its own line: the `b` of
+
+    if (a and
+            b):
+
+is on line 2, which never appears in the coverage data even when the `if`
+ran. CoveredLines maps every line to the first line of the innermost
+statement containing it before looking it up.
+
+Used by mutationTesting/mutpy_pruned.py and native_mutation.py
+(--covered-lines).
+"""
+
+import ast
+import json
+import os
+from typing import Dict, Iterable, Optional, Set
+
+
+def load_covered_lines(path: str) -> Dict[str, Set[int]]:
+    """The {source path: [lines]} JSON of compute_mutation_score.py's coverage pre-pass, by real path."""
+    with open(path, "r") as f:
+        return {os.path.realpath(p): set(lines) for p, lines in json.load(f).items()}
+
+
+def statement_starts(tree: ast.AST) -> Dict[int, int]:
+    """Line -> first line of the innermost statement spanning it."""
+    starts: Dict[int, int] = {}
+    statements = [n for n in ast.walk(tree) if isinstance(n, ast.stmt)]
+    # Outer statements first, so the statements nested in them overwrite their lines
+    statements.sort(key=lambda n: (n.lineno, -(getattr(n, "end_lineno", None) or n.lineno)))
+    for node in statements:
+        first = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        for line in range(first, (getattr(node, "end_lineno", None) or node.lineno) + 1):
+            starts[line] = first
+    return starts
+
+
+class CoveredLines:
+    """`lineno in covered`: the line, or the first line of its statement, was executed."""
+
+    def __init__(self, lines: Iterable[int], tree: ast.AST):
+        self.lines = set(lines)
+        self.starts = statement_starts(tree)
+
+    def __contains__(self, lineno: Optional[int]) -> bool:
+        return lineno in self.lines or self.starts.get(lineno) in self.lines
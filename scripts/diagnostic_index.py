@@ -0,0 +1,383 @@
+"""
+Incremental SQLite index of diagnostic fix rounds.
+
+analyze_diagnostics.py re-reads every diagnostic_report JSON on each call.
+Here each report is read once into rows of (run, test file, round, message
+template), and later `index` calls only parse files whose size or mtime
+changed, so the index can cover every experiment ever run:
+
+    files      one row per report: run (the log folder holding
+               diagnostic_report), baseline, test file, round counts, fixSuccess
+    templates  message templates (diagnostic_templates.py) and their category
+    rounds     (file, template, round) -> how many diagnostics of that template
+    lifetimes  per (file, template): first and last round seen, rounds present,
+               and whether it survived into the file's last round; written
+               with the rounds so the convergence queries are plain GROUP BYs
+
+Usage:
+    python diagnostic_index.py INDEX.db index ROOT [ROOT ...] [--jobs N]
+    python diagnostic_index.py INDEX.db survivors [--limit 20] [--min-files 3]
+    python diagnostic_index.py INDEX.db categories
+    python diagnostic_index.py INDEX.db baselines
+    python diagnostic_index.py INDEX.db reclassify
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sqlite3
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from analyze_diagnostics import IGNORED_MESSAGES, MIN_FILES_FOR_POOL, error_categories, should_ignore_message
+from categorize_diagnostic import classifier_for
+from diagnostic_templates import template_message
+from result_store import BASELINE_ORDER
+
+REPORT_FOLDER = "diagnostic_report"
+# Files parsed per transaction
+BATCH_SIZE = 500
+# PRAGMA user_version; an index built by an older version is rebuilt from the reports
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    is_report INTEGER NOT NULL,         -- 0: a .json that is not a diagnostic report (kept so it is not re-read)
+    run TEXT,
+    baseline TEXT,
+    test_file TEXT,
+    total_rounds INTEGER,
+    last_round INTEGER,                 -- highest round number in roundHistory
+    initial_diagnostics INTEGER,
+    final_diagnostics INTEGER,
+    fix_success INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_baseline ON files (baseline, run);
+CREATE TABLE IF NOT EXISTS templates (
+    template_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    template TEXT NOT NULL UNIQUE,
+    category TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    file_id INTEGER NOT NULL,
+    template_id INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (file_id, template_id, round)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS lifetimes (
+    file_id INTEGER NOT NULL,
+    template_id INTEGER NOT NULL,
+    first_round INTEGER NOT NULL,
+    last_round INTEGER NOT NULL,
+    rounds_present INTEGER NOT NULL,
+    survived INTEGER NOT NULL,          -- still reported in the file's last round
+    PRIMARY KEY (file_id, template_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS lifetimes_template ON lifetimes (template_id, survived);
+"""
+
+
+def baseline_of(path: str) -> str:
+    """First path component naming a baseline (exactly, or as a NAME_... prefix), else "unknown"."""
+    for part in path.split(os.sep):
+        lowered = part.lower()
+        for baseline in sorted(BASELINE_ORDER, key=len, reverse=True):
+            if lowered == baseline or lowered.startswith(f"{baseline}_"):
+                return baseline
+    return "unknown"
+
+
+def run_and_test_file(path: str) -> Tuple[str, str]:
+    """(log folder holding diagnostic_report, report path below it without .json)."""
+    parts = path.split(os.sep)
+    if REPORT_FOLDER in parts:
+        i = len(parts) - 1 - parts[::-1].index(REPORT_FOLDER)
+        return os.sep.join(parts[:i]), os.sep.join(parts[i + 1:])[:-len(".json")]
+    return os.path.dirname(path), os.path.basename(path)[:-len(".json")]
+
+
+@dataclass
+class ParsedReport:
+    path: str
+    mtime_ns: int
+    size: int
+    is_report: bool = False
+    total_rounds: int = 0
+    last_round: Optional[int] = None    # highest round in roundHistory, even if it reported nothing
+    initial_diagnostics: Optional[int] = None
+    final_diagnostics: Optional[int] = None
+    fix_success: Optional[bool] = None
+    # template -> round -> count
+    counts: Dict[str, Dict[int, int]] = field(default_factory=dict)
+    error: str = ""
+
+
+def parse_report(entry: Tuple[str, int, int], ignored_messages: Iterable[str] = IGNORED_MESSAGES) -> ParsedReport:
+    """Map step, run in a worker: one report reduced to template counts per round."""
+    path, mtime_ns, size = entry
+    parsed = ParsedReport(path, mtime_ns, size)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        parsed.error = f"Error reading {path}: {e}"
+        return parsed
+    if not isinstance(data, dict) or not isinstance(data.get("roundHistory"), list):
+        return parsed
+    counts: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    rounds = set()
+    try:
+        for round_data in data["roundHistory"]:
+            round_num = round_data.get("round", 0)
+            rounds.add(round_num)
+            for message in round_data.get("diagnosticMessages", []):
+                if not should_ignore_message(message, ignored_messages):
+                    counts[template_message(message)][round_num] += 1
+        last_round = max(rounds) if rounds else None
+    except Exception as e:
+        parsed.error = f"Unexpected error reading {path}: {e}"
+        return parsed
+    parsed.is_report = True
+    parsed.counts = {template: dict(by_round) for template, by_round in counts.items()}
+    parsed.total_rounds = len(rounds)
+    parsed.last_round = last_round
+    parsed.initial_diagnostics = data.get("initialDiagnostics")
+    parsed.final_diagnostics = data.get("finalDiagnostics")
+    parsed.fix_success = data.get("fixSuccess")
+    return parsed
+
+
+@dataclass
+class Survivor:
+    template: str
+    category: str
+    files: int              # reports the template appeared in
+    survived: int           # of those, reports where it was still there in the last round
+    mean_rounds: float      # rounds present per report
+
+    @property
+    def survival_rate(self) -> float:
+        return self.survived / self.files if self.files else 0.0
+
+
+class DiagnosticIndex:
+    """SQLite index of (run, test file, round, template) rows, updated incrementally."""
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # Before version 2 survival was judged against the last round that reported a diagnostic
+            self.conn.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS rounds; "
+                                    "DROP TABLE IF EXISTS lifetimes;")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.executescript(_SCHEMA)
+        self.classifier = classifier_for(error_categories)
+        self._template_ids: Dict[str, int] = dict(self.conn.execute("SELECT template, template_id FROM templates"))
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # ---- indexing -------------------------------------------------------------------------
+
+    def changed_files(self, roots: Iterable[str]) -> Tuple[List[Tuple[str, int, int]], int, List[str]]:
+        """
+        (path, mtime_ns, size) of .json files not indexed at their current size and mtime;
+        the unchanged count; and the indexed paths under roots that no longer exist.
+        """
+        known = {path: (mtime, size) for path, mtime, size in self.conn.execute("SELECT path, mtime_ns, size FROM files")}
+        changed, unchanged = [], 0
+        roots = [os.path.abspath(root) for root in roots]
+        seen = set()
+        for root in roots:
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    if not filename.lower().endswith(".json"):
+                        continue
+                    path = os.path.abspath(os.path.join(dirpath, filename))
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    seen.add(path)
+                    if known.get(path) == (st.st_mtime_ns, st.st_size):
+                        unchanged += 1
+                    else:
+                        changed.append((path, st.st_mtime_ns, st.st_size))
+        prefixes = tuple(os.path.join(root, "") for root in roots)
+        removed = [path for path in known if path not in seen and path.startswith(prefixes)]
+        return changed, unchanged, removed
+
+    def _template_id(self, template: str) -> int:
+        template_id = self._template_ids.get(template)
+        if template_id is None:
+            cur = self.conn.execute("INSERT INTO templates (template, category) VALUES (?, ?)",
+                                    (template, self.classifier.classify(template)))
+            template_id = self._template_ids[template] = cur.lastrowid
+        return template_id
+
+    def _delete(self, path: str) -> None:
+        old = self.conn.execute("SELECT file_id FROM files WHERE path = ?", (path,)).fetchone()
+        if old:
+            self.conn.execute("DELETE FROM rounds WHERE file_id = ?", old)
+            self.conn.execute("DELETE FROM lifetimes WHERE file_id = ?", old)
+            self.conn.execute("DELETE FROM files WHERE file_id = ?", old)
+
+    def _store(self, parsed: ParsedReport) -> None:
+        self._delete(parsed.path)
+        run, test_file = run_and_test_file(parsed.path)
+        cur = self.conn.execute(
+            "INSERT INTO files (path, mtime_ns, size, is_report, run, baseline, test_file, total_rounds, last_round, "
+            "initial_diagnostics, final_diagnostics, fix_success) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+            (parsed.path, parsed.mtime_ns, parsed.size, int(parsed.is_report), run, baseline_of(parsed.path),
+             test_file, parsed.total_rounds, parsed.last_round, parsed.initial_diagnostics, parsed.final_diagnostics,
+             None if parsed.fix_success is None else int(parsed.fix_success)))
+        file_id = cur.lastrowid
+        if not parsed.counts:
+            return
+        # A template survives if the report's last round still has it; a last round
+        # with no diagnostics at all (the fix succeeded) leaves no survivors
+        last_round = parsed.last_round
+        round_rows, lifetime_rows = [], []
+        for template, by_round in parsed.counts.items():
+            template_id = self._template_id(template)
+            round_rows.extend((file_id, template_id, r, count) for r, count in by_round.items())
+            lifetime_rows.append((file_id, template_id, min(by_round), max(by_round), len(by_round),
+                                  int(last_round in by_round)))
+        self.conn.executemany("INSERT INTO rounds VALUES (?,?,?,?)", round_rows)
+        self.conn.executemany("INSERT INTO lifetimes VALUES (?,?,?,?,?,?)", lifetime_rows)
+
+    def index(self, roots: Iterable[str], jobs: Optional[int] = None) -> Tuple[int, int, int]:
+        """
+        Parse new or changed reports under roots (in a process pool) and drop the ones
+        deleted from them; returns (indexed, unchanged, removed).
+        """
+        changed, unchanged, removed = self.changed_files(roots)
+        with self.conn:
+            for path in removed:
+                self._delete(path)
+        jobs = max(1, jobs or multiprocessing.cpu_count())
+        executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 and len(changed) >= MIN_FILES_FOR_POOL else None
+        try:
+            for start in range(0, len(changed), BATCH_SIZE):
+                batch = changed[start:start + BATCH_SIZE]
+                results = executor.map(parse_report, batch, chunksize=max(1, len(batch) // (jobs * 4))) \
+                    if executor else map(parse_report, batch)
+                with self.conn:
+                    for parsed in results:
+                        if parsed.error:
+                            print(parsed.error)
+                            continue
+                        self._store(parsed)
+        finally:
+            if executor:
+                executor.shutdown()
+        return len(changed), unchanged, len(removed)
+
+    def reclassify(self) -> int:
+        """Recompute template categories (after the category table changed); returns how many changed."""
+        changed = [(self.classifier.classify(template), template_id)
+                   for template_id, template, category in self.conn.execute("SELECT template_id, template, category FROM templates")
+                   if self.classifier.classify(template) != category]
+        with self.conn:
+            self.conn.executemany("UPDATE templates SET category = ? WHERE template_id = ?", changed)
+        return len(changed)
+
+    # ---- convergence queries --------------------------------------------------------------
+
+    def survivors(self, limit: int = 20, min_files: int = 3, baseline: Optional[str] = None) -> List[Survivor]:
+        """Templates most often still present in the last fix round (by surviving reports)."""
+        query = (
+            "SELECT t.template, t.category, COUNT(*), SUM(l.survived), AVG(l.rounds_present) "
+            "FROM lifetimes l JOIN templates t USING (template_id) "
+            + ("JOIN files f USING (file_id) WHERE f.baseline = ? " if baseline else "")
+            + "GROUP BY l.template_id HAVING COUNT(*) >= ? "
+            "ORDER BY SUM(l.survived) DESC, COUNT(*) DESC LIMIT ?")
+        params = ((baseline,) if baseline else ()) + (min_files, limit)
+        return [Survivor(*row) for row in self.conn.execute(query, params)]
+
+    def category_convergence(self) -> List[Tuple[str, int, int, Optional[float]]]:
+        """Per category: (category, template occurrences, of those fixed, mean rounds until fixed)."""
+        return self.conn.execute(
+            "SELECT t.category, COUNT(*), SUM(1 - l.survived), "
+            "AVG(CASE WHEN l.survived = 0 THEN l.last_round - l.first_round + 1 END) "
+            "FROM lifetimes l JOIN templates t USING (template_id) "
+            "GROUP BY t.category ORDER BY COUNT(*) DESC").fetchall()
+
+    def baseline_efficiency(self) -> List[Tuple]:
+        """
+        Per baseline: (baseline, reports, fixSuccess rate, mean rounds, initial
+        diagnostics, final diagnostics, share of template occurrences fixed).
+        """
+        return self.conn.execute(
+            "SELECT f.baseline, COUNT(*), AVG(f.fix_success), AVG(f.total_rounds), "
+            "SUM(f.initial_diagnostics), SUM(f.final_diagnostics), "
+            "(SELECT AVG(1.0 - l.survived) FROM lifetimes l JOIN files g USING (file_id) "
+            " WHERE g.baseline = f.baseline AND g.is_report = 1) "
+            "FROM files f WHERE f.is_report = 1 GROUP BY f.baseline ORDER BY f.baseline").fetchall()
+
+
+def _pct(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 100:.1f}%"
+
+
+def _num(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Incremental index of diagnostic fix rounds.")
+    ap.add_argument("db")
+    sub = ap.add_subparsers(dest="command", required=True)
+    p_index = sub.add_parser("index", help="Add new or changed diagnostic reports under the given roots.")
+    p_index.add_argument("roots", nargs="+")
+    p_index.add_argument("--jobs", type=int, default=None)
+    p_surv = sub.add_parser("survivors", help="Templates that survive the fix rounds.")
+    p_surv.add_argument("--limit", type=int, default=20)
+    p_surv.add_argument("--min-files", type=int, default=3)
+    p_surv.add_argument("--baseline", default=None)
+    sub.add_parser("categories", help="Fix rate and mean rounds to fix per category.")
+    sub.add_parser("baselines", help="Fix efficiency per baseline.")
+    sub.add_parser("reclassify", help="Re-categorize templates with the current category table.")
+    args = ap.parse_args()
+
+    index = DiagnosticIndex(args.db)
+    try:
+        if args.command == "index":
+            indexed, unchanged, removed = index.index(args.roots, args.jobs)
+            print(f"Indexed {indexed} new or changed files ({unchanged} unchanged, {removed} removed)")
+        elif args.command == "survivors":
+            print("{:<8} | {:<8} | {:<9} | {:<22} | {}".format("Files", "Survived", "Rate", "Category", "Template"))
+            print("-" * 100)
+            for s in index.survivors(args.limit, args.min_files, args.baseline):
+                print("{:<8} | {:<8} | {:<9} | {:<22} | {}".format(
+                    s.files, s.survived, _pct(s.survival_rate), s.category[:22], s.template.replace("\n", "\\n")))
+        elif args.command == "categories":
+            print("{:<52} | {:<8} | {:<8} | {}".format("Category", "Seen", "Fixed", "Mean rounds to fix"))
+            print("-" * 90)
+            for category, seen, fixed, rounds in index.category_convergence():
+                print("{:<52} | {:<8} | {:<8} | {}".format(category, seen, fixed, _num(rounds)))
+        elif args.command == "baselines":
+            print("{:<14} | {:<8} | {:<8} | {:<11} | {:<9} | {:<9} | {}".format(
+                "Baseline", "Reports", "Success", "Mean rounds", "Initial", "Final", "Templates fixed"))
+            print("-" * 90)
+            for baseline, reports, success, rounds, initial, final, fixed in index.baseline_efficiency():
+                print("{:<14} | {:<8} | {:<8} | {:<11} | {:<9} | {:<9} | {}".format(
+                    baseline, reports, _pct(success), _num(rounds), initial or 0, final or 0, _pct(fixed)))
+        elif args.command == "reclassify":
+            print(f"Re-categorized {index.reclassify()} templates")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Collapse identifier-specific diagnostic messages into templates.
+
+The LSP messages collected in roundHistory.diagnosticMessages (pyright,
+jdtls, gopls) embed the names, types, files and positions of the test
+they came from, so `"x" is not defined` and `"y" is not defined` are two
+entries of global_message_frequency. template_message() rewrites them to
+`"<id>" is not defined`; MessageTemplates counts per template and keeps a
+few concrete messages of each as samples.
+
+Placeholders are chosen so the keywords of the category tables still
+match: short punctuation in quotes ("(", ',') is kept, and source files
+keep their ../ prefix and _test suffix (`from ../<file>_test.go`). The
+Empty or Unclear check of categorize_diagnostic.py goes by length instead,
+so a message whose template it would judge differently is kept as it is.
+
+Usage:
+    python diagnostic_templates.py MESSAGES.txt    (one message per line; prints templates by frequency)
+"""
+
+import re
+import sys
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from categorize_diagnostic import classifier_for, error_categories
+
+SAMPLE_LIMIT = 3
+
+
+def _quoted(match: "re.Match") -> str:
+    """A whole quoted segment becomes <id> if it has a word character ("(" and ',' stay as they are)."""
+    quote, text = match.group(0)[0], match.group(0)[1:-1]
+    return f"{quote}<id>{quote}" if re.search(r"\w", text) else match.group(0)
+
+
+# (pattern, replacement) applied in order: files and positions first (they
+# contain digits and dots), then quoted text, then message shapes whose
+# identifiers are not quoted, then any remaining number.
+TEMPLATE_RULES = [
+    # Source files, keeping a leading ../ and a _test suffix: /a/b/foo_test.go -> <file>_test.go
+    (r"((?:\.\.?/)*)(?:/?[\w\-@]+/)*[\w\-]+?(_test|Test)?\.(go|java|py|ts|js)\b", r"\1<file>\2.\3"),
+    (r"\.(go|java|py|ts|js):\d+(?::\d+)?", r".\1:<pos>"),
+    (r"\[Line \d+\]", "[Line <n>]"),
+    (r"\bline \d+(?::\d+)?", "line <n>"),
+    # Quoted text, one whole segment at a time, so the text between two quoted
+    # segments (`expected ';', found 'EOF'`) is never taken for one
+    (r'"[^"\n]*"', _quoted),
+    (r"'[^'\n]*'", _quoted),
+    (r"`[^`\n]*`", _quoted),
+    # Java (jdtls)
+    (r"\b(The (?:method|constructor)) [\w$.<>\[\]]+\([^)]*\)", r"\1 <id>(<args>)"),
+    (r"\b(arguments|applicable for the arguments) \([^)]*\)", r"\1 (<args>)"),
+    (r"\b((?:the|exception|array|primitive) type) [\w$.]+(?:<[^>\n]*>)?(?:\[\])*", r"\1 <type>"),
+    (r"^[\w$.<>\[\]]+ (cannot be resolved|is not a type|is already defined|redeclared in this block)", r"<id> \1"),
+    (r"\b(from|to) [\w$.]+(?:<[^>\n]*>)?(?:\[\])* to [\w$.]+(?:<[^>\n]*>)?(?:\[\])*", r"\1 <type> to <type>"),
+    (r"\bcannot find symbol\s+symbol:\s+\w+ [^\n]+", "cannot find symbol <id>"),
+    # Go (gopls)
+    (r"\b(undefined|declared and not used|imported and not used|other declaration of): [\w$.*/\"]+", r"\1: <id>"),
+    (r"\b(other declaration of|use of package) [\w$.]+", r"\1 <id>"),
+    (r"^[\w$.]+ (declared and not used|declared but not used)", r"<id> \1"),
+    (r"\bcould not import [\w.\-/]+", "could not import <path>"),
+    (r"^[\w$.*()\[\]]+ undefined \(", "<id> undefined ("),
+    (r"\b(have|want) \([^)\n]*\)", r"\1 (<types>)"),
+    (r"\bbut [\w$.]+ returns\b", "but <id> returns"),
+    (r"\b(type|variable of type|value of type|constant of type) \*?[\w$.\[\]]+(?:\[[^\]\n]*\])?", r"\1 <type>"),
+    (r"\b(has no field or method|unknown field|unexported field) \w+", r"\1 <id>"),
+    (r"\b(in call to|argument to|in return statement|in struct literal of type) [\w$.*]+", r"\1 <id>"),
+    (r"^cannot use .+? \((variable|value|constant|untyped)", r"cannot use <expr> (\1"),
+    (r"\bas [\w$.*\[\]]+ value in\b", "as <type> value in"),
+    # Any number left (counts, sizes, versions)
+    (r"\b\d+\b", "<n>"),
+]
+
+_COMPILED_RULES = [(re.compile(pattern, re.MULTILINE), replacement) for pattern, replacement in TEMPLATE_RULES]
+_unclear_check = classifier_for(error_categories)
+_cache: Dict[str, str] = {}
+
+
+def template_message(message: str) -> str:
+    """The template of a diagnostic message (memoized)."""
+    template = _cache.get(message)
+    if template is None:
+        text = template = message.strip()
+        for regex, replacement in _COMPILED_RULES:
+            template = regex.sub(replacement, template)
+        if _unclear_check.is_unclear(template) != _unclear_check.is_unclear(text):
+            template = text
+        _cache[message] = template
+    return template
+
+
+class MessageTemplates:
+    """Frequencies per template, with up to SAMPLE_LIMIT distinct concrete messages each."""
+
+    def __init__(self, sample_limit: int = SAMPLE_LIMIT):
+        self.sample_limit = sample_limit
+        self.frequency: Counter = Counter()
+        self.samples: Dict[str, List[str]] = {}
+
+    def add_sample(self, template: str, message: str) -> None:
+        samples = self.samples.setdefault(template, [])
+        if len(samples) < self.sample_limit and message not in samples:
+            samples.append(message)
+
+    def add(self, message: str, count: int = 1) -> str:
+        template = template_message(message)
+        self.frequency[template] += count
+        self.add_sample(template, message)
+        return template
+
+    def update(self, message_frequency: Dict[str, int]) -> None:
+        """Fold a raw {message: frequency} dict in."""
+        for message, count in message_frequency.items():
+            self.add(message, count)
+
+    def merge(self, other: "MessageTemplates") -> None:
+        self.frequency.update(other.frequency)
+        for template, samples in other.samples.items():
+            for message in samples:
+                self.add_sample(template, message)
+
+    def most_common(self, n=None):
+        return self.frequency.most_common(n)
+
+
+def collapse(messages: Iterable[str]) -> MessageTemplates:
+    templates = MessageTemplates()
+    for message in messages:
+        templates.add(message)
+    return templates
+
+
+def main() -> None:
+    if len(sys.argv) != 2:
+        print("Usage: python diagnostic_templates.py <messages.txt>")
+        sys.exit(1)
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        templates = collapse(line.rstrip("\n") for line in f if line.strip())
+    for template, frequency in templates.most_common():
+        print(f"Frequency: {frequency} - {template}")
+        for sample in templates.samples[template]:
+            print(f"    e.g. {sample}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,166 @@
 import os
 import sys
+import json
+import errno
 import shutil
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-def find_and_copy_diagnostic_items(start_path='.', dest_path=None):
+try:
+    import fcntl
+except ImportError:  # not on Windows
+    fcntl = None
+
+# Linux FICLONE ioctl: share the source's extents copy-on-write (btrfs, XFS, overlayfs on those)
+FICLONE = 0x40049409
+# Tried in order per file; the first that works is used
+SNAPSHOT_METHODS = ("reflink", "hardlink", "copy")
+MANIFEST_NAME = "snapshot_manifest.jsonl"  # not *.json, so analyze_diagnostics.py does not load it
+# Errors meaning "this method cannot work on this filesystem", not "this file failed"
+_UNSUPPORTED = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EPERM, errno.EMLINK}
+
+
+def reflink(source_path, dest_file):
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink is not supported on this platform")
+    try:
+        with open(source_path, "rb") as src, open(dest_file, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        if os.path.exists(dest_file):
+            os.remove(dest_file)
+        raise
+    shutil.copystat(source_path, dest_file)
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Snapshotter:
+    """
+    Places files into a snapshot by reflink, hardlink or copy (the first
+    method the filesystem supports) and records one manifest entry per file.
+
+    A hardlinked snapshot shares the inode with its source: a later in-place
+    rewrite of the source shows in the snapshot too, which the manifest's
+    sha256 makes detectable. Reflinks and copies are independent.
+    """
+
+    def __init__(self, methods=SNAPSHOT_METHODS, hash_files=True):
+        self.methods = list(methods)
+        self.hash_files = hash_files
+        self.entries = []
+        self._lock = threading.Lock()
+
+    def _disable(self, method):
+        with self._lock:
+            if method in self.methods and len(self.methods) > 1:
+                self.methods.remove(method)
+
+    def place(self, source_path, dest_file):
+        """Snapshot one file (usable as shutil.copytree's copy_function)."""
+        for method in list(self.methods):
+            try:
+                if method == "reflink":
+                    reflink(source_path, dest_file)
+                elif method == "hardlink":
+                    os.link(source_path, dest_file)
+                else:
+                    shutil.copy2(source_path, dest_file)
+                break
+            except OSError as e:
+                if method == "copy" or e.errno not in _UNSUPPORTED:
+                    raise
+                # Unsupported here (other device, filesystem without clones): stop trying it
+                self._disable(method)
+        entry = {"source": os.path.abspath(source_path), "snapshot": os.path.abspath(dest_file),
+                 "method": method, "size": os.path.getsize(dest_file)}
+        if self.hash_files:
+            entry["sha256"] = file_sha256(dest_file)
+        with self._lock:
+            self.entries.append(entry)
+        return dest_file
+
+    def write_manifest(self, dest_path):
+        manifest = os.path.join(dest_path, MANIFEST_NAME)
+        with open(manifest, "w", encoding="utf-8") as f:
+            for entry in sorted(self.entries, key=lambda e: e["snapshot"]):
+                f.write(json.dumps(entry) + "\n")
+        return manifest
+
+
+def _scan_subtree(top, skip):
+    """(kind, source_path) of the diagnostic items under top, in os.walk order."""
+    items = []
+    for root, dirs, files in os.walk(top):
+        dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) not in skip]
+        items.extend(("dir", os.path.join(root, d)) for d in dirs if d == "diagnostic_report")
+        items.extend(("file", os.path.join(root, f)) for f in files if 'diagnostic' in f.lower())
+    return items
+
+
+def scan_diagnostic_items(start_path, skip=(), jobs=None):
+    """
+    Folders named 'diagnostic_report' and files with 'diagnostic' in their
+    names, in the order a single os.walk visits them; the top-level subtrees
+    are walked in parallel.
+    """
+    skip = {os.path.abspath(p) for p in skip}
+    try:
+        root, dirs, files = next(os.walk(start_path))
+    except StopIteration:
+        return []
+    dirs = [d for d in dirs if os.path.abspath(os.path.join(root, d)) not in skip]
+    items = [("dir", os.path.join(root, d)) for d in dirs if d == "diagnostic_report"]
+    items += [("file", os.path.join(root, f)) for f in files if 'diagnostic' in f.lower()]
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) * 4)) as ex:
+        for subtree in ex.map(lambda d: _scan_subtree(os.path.join(root, d), skip), dirs):
+            items.extend(subtree)
+    return items
+
+
+def unique_destinations(items, dest_path):
+    """Destination of each item: its name, or name_N if taken (as the sequential copy chose them)."""
+    taken = set(os.listdir(dest_path))
+    destinations = []
+    for kind, source_path in items:
+        name = os.path.basename(source_path)
+        base_name, ext = (name, "") if kind == "dir" else os.path.splitext(name)
+        candidate, counter = name, 1
+        while candidate in taken:
+            candidate = f"{base_name}_{counter}{ext}"
+            counter += 1
+        taken.add(candidate)
+        destinations.append(os.path.join(dest_path, candidate))
+    return destinations
+
+
+def find_and_copy_diagnostic_items(start_path='.', dest_path=None, snapshot=False, methods=SNAPSHOT_METHODS,
+                                   jobs=None, hash_files=True):
     """
     Recursively find files containing 'diagnostic' in their names and folders named 'diagnostic_report',
     and copy them to destination folder.
-    
+
+    With snapshot=True files are reflinked or hardlinked instead of copied
+    (see Snapshotter), in parallel, and a manifest of original path,
+    snapshot path, method and sha256 is written to the destination.
+
     Args:
         start_path (str): The directory to start searching from. Defaults to current directory.
         dest_path (str): The directory where files will be copied to.
-    
+        snapshot (bool): Link instead of copy and write the manifest.
+        methods (tuple): Snapshot methods to try, in order.
+        jobs (int): Threads walking and linking.
+        hash_files (bool): Record sha256 of every snapshotted file.
+
     Returns:
         list: List of tuples containing (source_path, dest_path, status) for copied files
     """
@@ -19,75 +168,72 @@ def find_and_copy_diagnostic_items(start_path='.', dest_path=None):
         # Create a default destination folder with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         dest_path = f"diagnostic_files_{timestamp}"
-    
+
     # Create destination directory if it doesn't exist
     os.makedirs(dest_path, exist_ok=True)
-    
-    copied_items = []
-    
+
     try:
-        for root, dirs, files in os.walk(start_path):
-            # Check directories first
-            for dir_name in dirs[:]:  # Create a copy of dirs list to modify during iteration
-                if dir_name == "diagnostic_report":
-                    source_path = os.path.join(root, dir_name)
-                    dest_dir = os.path.join(dest_path, dir_name)
-                    print(f"Copying {source_path} to {dest_dir}")
-                    # If directory already exists, add a number to make it unique
-                    counter = 1
-                    while os.path.exists(dest_dir):
-                        dest_dir = os.path.join(dest_path, f"{dir_name}_{counter}")
-                        counter += 1
-                    
-                    try:
-                        shutil.copytree(source_path, dest_dir)
-                        copied_items.append((source_path, dest_dir, "success"))
-                    except Exception as e:
-                        copied_items.append((source_path, dest_dir, f"error: {str(e)}"))
-            
-            # Check files
-            for file_name in files:
-                if 'diagnostic' in file_name.lower():
-                    source_path = os.path.join(root, file_name)
-                    print(f"Copying {source_path} to {dest_path}")
-                    # Create a unique destination filename to avoid conflicts
-                    base_name, ext = os.path.splitext(file_name)
-                    dest_file = os.path.join(dest_path, file_name)
-                    
-                    # If file already exists, add a number to make it unique
-                    counter = 1
-                    while os.path.exists(dest_file):
-                        dest_file = os.path.join(dest_path, f"{base_name}_{counter}{ext}")
-                        counter += 1
-                    
-                    try:
-                        shutil.copy2(source_path, dest_file)
-                        copied_items.append((source_path, dest_file, "success"))
-                    except Exception as e:
-                        copied_items.append((source_path, dest_file, f"error: {str(e)}"))
-                    
+        # The destination may lie inside the searched tree; never collect from it
+        items = scan_diagnostic_items(start_path, skip=[dest_path], jobs=jobs)
     except Exception as e:
         print(f"Error occurred during search: {e}", file=sys.stderr)
         return []
-    
+
+    snapshotter = Snapshotter(methods if snapshot else ("copy",), hash_files=snapshot and hash_files)
+    verb = "Snapshotting" if snapshot else "Copying"
+
+    def place(item, dest):
+        kind, source_path = item
+        try:
+            if kind == "dir":
+                shutil.copytree(source_path, dest, copy_function=snapshotter.place)
+            else:
+                snapshotter.place(source_path, dest)
+            return (source_path, dest, "success")
+        except Exception as e:
+            return (source_path, dest, f"error: {str(e)}")
+
+    destinations = unique_destinations(items, dest_path)
+    for (kind, source_path), dest in zip(items, destinations):
+        print(f"{verb} {source_path} to {dest if kind == 'dir' else dest_path}")
+    workers = (jobs or min(32, (os.cpu_count() or 1) * 4)) if snapshot else 1
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        copied_items = list(ex.map(place, items, destinations))
+
+    if snapshot:
+        manifest = snapshotter.write_manifest(dest_path)
+        methods_used = {}
+        for entry in snapshotter.entries:
+            methods_used[entry["method"]] = methods_used.get(entry["method"], 0) + 1
+        print(f"Snapshot of {len(snapshotter.entries)} files ({methods_used}); manifest: {manifest}")
     return copied_items
 
 def main():
-    # Get the start path and destination path from command line arguments
-    if len(sys.argv) < 2:
-        print("Usage: python find_and_copy_diagnostic.py [source_path] [destination_path]")
-        print("If destination_path is not provided, a new folder will be created with timestamp")
-    
-    start_path = sys.argv[1]
-    dest_path = sys.argv[2] if len(sys.argv) > 2 else None
-    
+    ap = argparse.ArgumentParser(
+        description="Collect diagnostic files and diagnostic_report folders into one directory.",
+        epilog="If destination_path is not provided, a new folder will be created with timestamp")
+    ap.add_argument("source_path")
+    ap.add_argument("destination_path", nargs="?", default=None)
+    ap.add_argument("--snapshot", action="store_true",
+                    help="Reflink/hardlink instead of copying, in parallel, and write a sha256 manifest.")
+    ap.add_argument("--method", choices=SNAPSHOT_METHODS, action="append", default=None,
+                    help="Snapshot method to try (repeatable, in order; default: reflink, hardlink, copy).")
+    ap.add_argument("--no-hash", action="store_true", help="Do not hash snapshotted files.")
+    ap.add_argument("--jobs", type=int, default=None)
+    args = ap.parse_args()
+
+    start_path = args.source_path
+    dest_path = args.destination_path
+
     print(f"Searching for diagnostic files in: {os.path.abspath(start_path)}")
     if dest_path:
         print(f"Files will be copied to: {os.path.abspath(dest_path)}")
     print("-" * 80)
-    
-    results = find_and_copy_diagnostic_items(start_path, dest_path)
-    
+
+    results = find_and_copy_diagnostic_items(start_path, dest_path, snapshot=args.snapshot,
+                                             methods=tuple(args.method or SNAPSHOT_METHODS),
+                                             jobs=args.jobs, hash_files=not args.no_hash)
+
     if not results:
         print("No diagnostic files found.")
     else:
@@ -99,4 +245,4 @@ def main():
             print("-" * 40)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
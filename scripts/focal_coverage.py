@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Focal-method coverage attribution.
+
+The project-wide coverage number produced by python_coverage.bash / go_coverage.bash
+says nothing about whether a generated test actually exercises the method it was
+generated for. This script attributes coverage back to the focal method of every
+test using the test file maps in experiments/config:
+
+    <project>_test_file_map.json / <project>_test_file_baselines.json
+        test file name -> {file_name, symbol_name}
+    <project>-taskList.json
+        symbolName, relativeDocumentPath, sourceCode, lineNum
+
+Each focal method's line range is resolved once and stored as an integer bitmap
+(bit N set <=> line N belongs to the method). Covered and executable lines are
+bitmaps too, so per-test and per-baseline focal coverage reduce to AND/OR and a
+popcount over whole files at once.
+
+Usage:
+    python focal_coverage.py \
+        --project-root /LSPRAG/experiments/projects/black \
+        --task-list /LSPRAG/experiments/config/black-taskList.json \
+        --test-mapping /LSPRAG/experiments/config/black_test_file_map.json \
+        lsprag=/LSPRAG/experiments/data/main_result/black/lsprag/1/deepseek-chat/results/final-report \
+        naive=/LSPRAG/experiments/data/main_result/black/naive/1/deepseek-chat/results/final-report
+"""
+
+import argparse
+import ast
+import csv
+import json
+import os
+import re
+import sqlite3
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from test_file_map import TestFileMap, discover_test_files
+
+
+def popcount(bits: int) -> int:
+    """Number of set bits (lines) in a bitmap."""
+    try:
+        return bits.bit_count()
+    except AttributeError:  # Python < 3.10
+        return bin(bits).count("1")
+
+
+def range_mask(start: int, end: int) -> int:
+    """Bitmap with lines start..end (inclusive) set."""
+    if end < start:
+        return 0
+    return ((1 << (end + 1)) - 1) ^ ((1 << start) - 1)
+
+
+def lines_to_bits(lines: Iterable[int]) -> int:
+    bits = 0
+    for line in lines:
+        if line > 0:
+            bits |= 1 << line
+    return bits
+
+
+def bits_to_lines(bits: int) -> List[int]:
+    lines = []
+    line = 0
+    while bits:
+        if bits & 1:
+            lines.append(line)
+        bits >>= 1
+        line += 1
+    return lines
+
+
+@dataclass
+class FocalMethod:
+    """A focal method and the line bitmap it spans in its source file."""
+    file_name: str
+    symbol_name: str
+    mask: int
+
+    @property
+    def line_count(self) -> int:
+        return popcount(self.mask)
+
+
+class FocalIndex:
+    """
+    Resolves (file_name, symbol_name) pairs to line bitmaps.
+
+    Ranges come from the task list first: the task's sourceCode is located in the
+    source file and spans lineNum additional lines. For Python sources a function
+    AST index is used as fallback when the source text moved.
+    """
+
+    def __init__(self, project_root: str, task_list_path: str):
+        self.project_root = project_root
+        with open(task_list_path, "r", encoding="utf-8") as f:
+            self.tasks = json.load(f)
+        self._tasks_by_key: Dict[Tuple[str, str], List[dict]] = defaultdict(list)
+        for task in self.tasks:
+            key = (task["relativeDocumentPath"], task["symbolName"])
+            self._tasks_by_key[key].append(task)
+        self._sources: Dict[str, Optional[str]] = {}
+        self._ast_index: Dict[str, Dict[str, int]] = {}
+        self._executable: Dict[str, int] = {}
+        self._focal: Dict[Tuple[str, str], Optional[FocalMethod]] = {}
+
+    def source(self, file_name: str) -> Optional[str]:
+        if file_name not in self._sources:
+            path = os.path.join(self.project_root, file_name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._sources[file_name] = f.read()
+            except (OSError, UnicodeDecodeError):
+                self._sources[file_name] = None
+        return self._sources[file_name]
+
+    def _python_function_masks(self, file_name: str) -> Dict[str, int]:
+        """symbol name -> union of line bitmaps of every def with that name."""
+        if file_name in self._ast_index:
+            return self._ast_index[file_name]
+        index: Dict[str, int] = defaultdict(int)
+        text = self.source(file_name)
+        if text is not None and file_name.endswith(".py"):
+            try:
+                tree = ast.parse(text)
+            except SyntaxError:
+                tree = None
+            if tree is not None:
+                for node in ast.walk(tree):
+                    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+                        index[node.name] |= range_mask(start, node.end_lineno or node.lineno)
+        self._ast_index[file_name] = dict(index)
+        return self._ast_index[file_name]
+
+    def executable_lines(self, file_name: str) -> int:
+        """
+        Statement lines of a Python source file (docstrings excluded), i.e. the lines
+        coverage.py can report as executed. Non-Python files return 0; their
+        executable lines come from the coverage profile instead.
+        """
+        if file_name in self._executable:
+            return self._executable[file_name]
+        bits = 0
+        text = self.source(file_name)
+        if text is not None and file_name.endswith(".py"):
+            try:
+                tree = ast.parse(text)
+            except SyntaxError:
+                tree = None
+            if tree is not None:
+                for node in ast.walk(tree):
+                    if not isinstance(node, ast.stmt):
+                        continue
+                    if (isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)
+                            and isinstance(node.value.value, str)):
+                        continue
+                    bits |= 1 << node.lineno
+        self._executable[file_name] = bits
+        return bits
+
+    def resolve(self, file_name: str, symbol_name: str) -> Optional[FocalMethod]:
+        key = (file_name, symbol_name)
+        if key in self._focal:
+            return self._focal[key]
+
+        mask = 0
+        text = self.source(file_name)
+        if text is not None:
+            for task in self._tasks_by_key.get(key, []):
+                offset = text.find(task["sourceCode"])
+                if offset < 0:
+                    continue
+                start = text.count("\n", 0, offset) + 1
+                mask |= range_mask(start, start + int(task.get("lineNum", 0)))
+        if not mask:
+            mask = self._python_function_masks(file_name).get(symbol_name.split(".")[-1], 0)
+
+        self._focal[key] = FocalMethod(file_name, symbol_name, mask) if mask else None
+        return self._focal[key]
+
+
+@dataclass
+class FileCoverage:
+    """Executed and (optionally) executable line bitmaps of one source file."""
+    covered: int = 0
+    executable: int = 0
+
+
+def read_coverage_py_data(data_file: str, project_root: str) -> Dict[str, FileCoverage]:
+    """
+    Read a coverage.py SQLite data file. Line data is stored there as "numbits"
+    (byte i, bit j <=> line 8*i+j), which is exactly a little-endian bitmap.
+    """
+    result: Dict[str, FileCoverage] = {}
+    root = os.path.abspath(project_root) + os.sep
+    conn = sqlite3.connect(f"file:{data_file}?mode=ro", uri=True)
+    try:
+        files = dict(conn.execute("SELECT id, path FROM file"))
+        rows = conn.execute("SELECT file_id, numbits FROM line_bits").fetchall()
+        arcs: List[Tuple[int, int, int]] = []
+        if not rows:
+            try:
+                arcs = conn.execute("SELECT file_id, fromno, tono FROM arc").fetchall()
+            except sqlite3.OperationalError:
+                arcs = []
+    finally:
+        conn.close()
+
+    def rel(path: str) -> str:
+        return path[len(root):] if path.startswith(root) else path
+
+    for file_id, numbits in rows:
+        cov = result.setdefault(rel(files[file_id]), FileCoverage())
+        cov.covered |= int.from_bytes(numbits, "little")
+    for file_id, fromno, tono in arcs:
+        cov = result.setdefault(rel(files[file_id]), FileCoverage())
+        for line in (fromno, tono):
+            if line > 0:
+                cov.covered |= 1 << line
+    return result
+
+
+_GO_BLOCK = re.compile(r"^(.+):(\d+)\.\d+,(\d+)\.\d+ (\d+) (\d+)$")
+
+
+def read_go_profile(profile: str, known_files: Iterable[str]) -> Dict[str, FileCoverage]:
+    """
+    Read a Go coverage profile. Profile paths are import paths
+    (github.com/spf13/cobra/command.go); they are mapped back to project-relative
+    paths by suffix match against known_files.
+    """
+    known = sorted(set(known_files), key=len, reverse=True)
+    resolved: Dict[str, str] = {}
+    result: Dict[str, FileCoverage] = {}
+    with open(profile, "r", encoding="utf-8") as f:
+        for line in f:
+            m = _GO_BLOCK.match(line.strip())
+            if not m:
+                continue
+            path, start, end, _, count = m.groups()
+            if path not in resolved:
+                resolved[path] = next(
+                    (k for k in known if path == k or path.endswith("/" + k)), path
+                )
+            cov = result.setdefault(resolved[path], FileCoverage())
+            mask = range_mask(int(start), int(end))
+            cov.executable |= mask
+            if int(count) > 0:
+                cov.covered |= mask
+    return result
+
+
+def merge_coverage(parts: Iterable[Dict[str, FileCoverage]]) -> Dict[str, FileCoverage]:
+    merged: Dict[str, FileCoverage] = {}
+    for part in parts:
+        for file_name, cov in part.items():
+            dst = merged.setdefault(file_name, FileCoverage())
+            dst.covered |= cov.covered
+            dst.executable |= cov.executable
+    return merged
+
+
+@dataclass
+class FocalResult:
+    test_file: str
+    file_name: str
+    symbol_name: str
+    covered_lines: int
+    total_lines: int
+
+    @property
+    def ratio(self) -> float:
+        return self.covered_lines / self.total_lines if self.total_lines else 0.0
+
+
+class FocalCoverageEngine:
+    """Computes focal coverage for report directories produced by the coverage scripts."""
+
+    def __init__(self, project_root: str, task_list: str, test_mapping: str):
+        self.project_root = project_root
+        self.index = FocalIndex(project_root, task_list)
+        self.mapping = TestFileMap.load(test_mapping)
+
+    def focal_bits(self, focal: FocalMethod, cov: Optional[FileCoverage]) -> Tuple[int, int]:
+        """(covered, total) statement lines of a focal method under the given coverage."""
+        executable = self.index.executable_lines(focal.file_name)
+        if cov is not None:
+            executable |= cov.executable
+        stmts = focal.mask & executable if executable else focal.mask
+        covered = stmts & cov.covered if cov is not None else 0
+        return popcount(covered), popcount(stmts)
+
+    def per_test_coverage(self, report_dir: str) -> Dict[str, Dict[str, FileCoverage]]:
+        """
+        Load per-test coverage from a report directory:
+          per_test_coverage/<test>.coverage  (coverage.py data, python_coverage.bash)
+          per_test_coverage/<test>.out       (Go profile)
+        Falls back to the combined .coverage / coverage.out as one pseudo-test.
+        """
+        known_files = set(self.mapping.source_files())
+        per_test_dir = os.path.join(report_dir, "per_test_coverage")
+        data: Dict[str, Dict[str, FileCoverage]] = {}
+        if os.path.isdir(per_test_dir):
+            for name in sorted(os.listdir(per_test_dir)):
+                path = os.path.join(per_test_dir, name)
+                if name.endswith(".coverage"):
+                    data[name[:-len(".coverage")]] = read_coverage_py_data(path, self.project_root)
+                elif name.endswith(".out"):
+                    data[name[:-len(".out")]] = read_go_profile(path, known_files)
+            return data
+
+        combined_py = os.path.join(report_dir, ".coverage")
+        combined_go = os.path.join(report_dir, "coverage.out")
+        if os.path.exists(combined_py):
+            data["*"] = read_coverage_py_data(combined_py, self.project_root)
+        elif os.path.exists(combined_go):
+            data["*"] = read_go_profile(combined_go, known_files)
+        return data
+
+    def test_results(self, report_dir: str, test_dir: Optional[str] = None) -> List[FocalResult]:
+        """Focal coverage of every test file for which per-test coverage exists."""
+        coverage = self.per_test_coverage(report_dir)
+        if "*" in coverage:
+            # Only a combined profile: attribute it to every test in the test directory.
+            shared = coverage.pop("*")
+            for test_file in self._test_files(test_dir or self._guess_test_dir(report_dir)):
+                coverage[test_file] = shared
+
+        results = []
+        for test_file, cov in sorted(coverage.items()):
+            info = self.mapping.lookup(test_file)
+            if not info:
+                continue
+            focal = self.index.resolve(info["file_name"], info["symbol_name"])
+            if focal is None:
+                continue
+            covered, total = self.focal_bits(focal, cov.get(focal.file_name))
+            results.append(FocalResult(test_file, focal.file_name, focal.symbol_name, covered, total))
+        return results
+
+    def baseline_summary(self, report_dir: str, test_dir: Optional[str] = None) -> Dict[str, float]:
+        """
+        Focal coverage of a whole baseline folder: the union of all tests' coverage
+        restricted to the union of the focal methods the folder targets.
+        """
+        coverage = self.per_test_coverage(report_dir)
+        merged = merge_coverage(coverage.values())
+        test_files = list(coverage) if "*" not in coverage else self._test_files(
+            test_dir or self._guess_test_dir(report_dir))
+
+        focal_by_file: Dict[str, int] = defaultdict(int)
+        symbols = set()
+        for test_file in test_files:
+            info = self.mapping.lookup(test_file)
+            if not info:
+                continue
+            focal = self.index.resolve(info["file_name"], info["symbol_name"])
+            if focal is None:
+                continue
+            focal_by_file[focal.file_name] |= focal.mask
+            symbols.add((focal.file_name, focal.symbol_name))
+
+        covered_sum = total_sum = 0
+        for file_name, mask in focal_by_file.items():
+            covered, total = self.focal_bits(FocalMethod(file_name, "*", mask), merged.get(file_name))
+            covered_sum += covered
+            total_sum += total
+        return {
+            "symbols": len(symbols),
+            "covered_lines": covered_sum,
+            "total_lines": total_sum,
+            "focal_coverage": covered_sum / total_sum if total_sum else 0.0,
+        }
+
+    @staticmethod
+    def _guess_test_dir(report_dir: str) -> str:
+        return report_dir[:-len("-report")] if report_dir.endswith("-report") else report_dir
+
+    @staticmethod
+    def _test_files(test_dir: str) -> List[str]:
+        paths = discover_test_files(test_dir, suffixes=("_test.py", "_test.go", "Test.java"))
+        return sorted(os.path.basename(p) for p in paths)
+
+
+def write_test_csv(path: str, rows: List[Tuple[str, FocalResult]]) -> None:
+    with open(path, "w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["baseline", "test_file", "file_name", "symbol_name",
+                         "covered_lines", "total_lines", "focal_coverage"])
+        for label, r in rows:
+            writer.writerow([label, r.test_file, r.file_name, r.symbol_name,
+                             r.covered_lines, r.total_lines, f"{r.ratio:.9f}"])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Attribute coverage to the focal method of each generated test.")
+    ap.add_argument("--project-root", required=True, help="Path to the target project.")
+    ap.add_argument("--task-list", required=True, help="Path to <project>-taskList.json.")
+    ap.add_argument("--test-mapping", required=True,
+                    help="Path to <project>_test_file_map.json or <project>_test_file_baselines.json.")
+    ap.add_argument("--csv", default=None, help="Write per-test focal coverage to this CSV file.")
+    ap.add_argument("reports", nargs="+",
+                    help="Report directories, optionally labelled as <baseline>=<report_dir>.")
+    args = ap.parse_args()
+
+    engine = FocalCoverageEngine(args.project_root, args.task_list, args.test_mapping)
+    rows: List[Tuple[str, FocalResult]] = []
+
+    print("baseline\tsymbols\tcovered\ttotal\tfocal_coverage\tmean_per_test")
+    for spec in args.reports:
+        label, _, report_dir = spec.rpartition("=")
+        label = label or os.path.basename(os.path.normpath(report_dir))
+        if not os.path.isdir(report_dir):
+            print(f"Warning: report directory not found: {report_dir}", file=sys.stderr)
+            continue
+        results = engine.test_results(report_dir)
+        summary = engine.baseline_summary(report_dir)
+        mean = sum(r.ratio for r in results) / len(results) if results else 0.0
+        print(f"{label}\t{summary['symbols']}\t{summary['covered_lines']}\t{summary['total_lines']}"
+              f"\t{summary['focal_coverage']:.4f}\t{mean:.4f}")
+        rows.extend((label, r) for r in results)
+
+    if args.csv:
+        write_test_csv(args.csv, rows)
+        print(f"Per-test focal coverage written to: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
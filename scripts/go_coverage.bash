@@ -19,7 +19,7 @@ export TARGET_PROJECT_PATH
 TEST_DIR=$2
 REPORT_DIR=${3:-"${TEST_DIR}-report"}  # Default value if not provided
 CLEAN_DIR=${4:-"${TEST_DIR}-clean"}  # Default value if not provided
-SCRIPT_PATH="/LSPRAG/scripts/go_clean.py"
+SCRIPT_PATH="/LSPRAG/scripts/go_triage.py"
 # Copy go.mod and go.sum files into TEST_DIR
 if [ ! -f "$TARGET_PROJECT_PATH/go.mod" ]; then
     echo "Error: go.mod file not found in target project path."
@@ -170,47 +170,10 @@ fi
 find . -type f -name '*_test.go' -exec bash -c 'remove_cycle_import "$0"' {} \;
 ## Cycle Error Auto Fix ##
 
-# Run tests repeatedly until there are no errors
-max_attempts=100  # Add a maximum number of attempts to prevent infinite loops
-attempt=1
+# Type-check every generated test file in isolation (in parallel, against one
+# warm build cache) and quarantine all files that do not compile in one round
 go mod tidy
-
-
-while true; do
-    go test ./... -v
-    error_log=$(go test ./... -v 2>&1)
-    python3 "$SCRIPT_PATH" "$error_log"
-    if [ $? -eq 0 ]; then
-        echo "Files were removed"
-        deleted=true
-        # Do something when files were removed
-    else
-        echo "No files were removed"
-        deleted=false
-        # Do something when no files were removed
-    fi
-
-    echo "$error_log"
-    # Check if error_log is empty or contains no errors
-    # if [[ -z "$error_log" ]] || ! echo "$error_log" | grep -q "Error\|panic\|build failed\|setup failed"; then
-    if [[ -z "$error_log" ]] || ! echo "$error_log" | grep -q "build failed\|setup failed"; then
-        if ! $deleted; then
-            echo "Tests passed successfully on attempt $attempt"
-            echo "Error log: $error_log"
-            break
-        fi
-    fi
-    
-    # Check if maximum attempts reached
-    if [ $attempt -ge $max_attempts ]; then
-        echo "Maximum attempts ($max_attempts) reached. Some tests are still failing."
-        break
-    fi
-    
-    echo "Attempt $attempt : still have errored scripts, keep cleaning and retrying..."
-    ((attempt++))
-    sleep 1  # Add a small delay between attempts
-done
+python3 "$SCRIPT_PATH" . --quarantine "${REPORT_DIR}/quarantine" --report "${REPORT_DIR}/triage.json" || { echo "Error: triage failed"; exit 1; }
 
 go mod tidy
 
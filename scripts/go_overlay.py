@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Go test evaluation through `-overlay`, without copying the project per run.
+
+go_coverage.bash copies go.mod/go.sum and rsyncs every non-test source of
+the project into each test folder, copies that into a -clean folder and
+rewrites cyclic imports with sed there, for every folder the verifier
+evaluates. This driver leaves both trees untouched:
+
+  * an overlay JSON maps each generated test (TEST_DIR/<pkg>/x_test.go) to
+    its place in the real module (<project>/<pkg>/x_test.go) and hides the
+    project's own tests in those packages;
+  * the import-cycle rewrite of go_coverage.bash is applied in memory, and
+    only test files it changes are written (to a temporary workspace);
+  * go.mod/go.sum are used through -modfile, so `go mod tidy` for test-only
+    dependencies never touches the project.
+
+Every evaluation then shares the project's compiled packages in the build
+cache. go_triage.py quarantines test files that do not compile (one
+round), each package's test binary is built once with -cover and every
+Test function runs as `<pkg>.test -test.run ^Name$` with its own profile.
+Profiles are merged with go_profile.py into <report_dir>/coverage.out,
+and per test file into per_test_coverage/<file>.out (read by
+focal_coverage.py). The summary lines are go_coverage.bash's, so
+Parser.go_output_parser in result_verifier.py reads both.
+
+Usage:
+    python go_overlay.py <target_project_path> <test_save_dir> [report_dir] [--jobs N] [--go GO]
+    python go_overlay.py --smoke [--go GO]     (end-to-end check on a toy module)
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from go_profile import GoCoverage
+from go_triage import GoTriage, TriageError, triage_module
+from test_file_map import discover_test_files
+
+DEFAULT_TIMEOUT_SECONDS = 600
+
+_TEST_FUNC = re.compile(r"^func (Test[^ (]*)", re.MULTILINE)
+
+
+@dataclass
+class GoProject:
+    module: str            # import path whose imports create the cycle (covepackage1)
+    cover_packages: str    # -coverpkg
+
+
+# Same settings as go_coverage.bash
+GO_PROJECTS = {
+    "logrus": GoProject("github.com/sirupsen/logrus", "github.com/sirupsen/logrus"),
+    "cobra": GoProject("github.com/spf13/cobra", "github.com/spf13/cobra,github.com/spf13/cobra/doc"),
+}
+
+
+def project_settings(project_path: str) -> Optional[GoProject]:
+    for name, project in GO_PROJECTS.items():
+        if project_path.rstrip(os.sep).endswith(name):
+            return project
+    return None
+
+
+def remove_cycle_import(source: str, module: str) -> str:
+    """
+    go_coverage.bash's `sed '/^import[[:space:]]*(/,/)/{/<module>/d}'`: drop the
+    lines of an import block that mention the module under test.
+    """
+    out = []
+    in_block = False
+    for line in source.splitlines(keepends=True):
+        if not in_block and re.match(r"import\s*\(", line):
+            in_block = True
+            if ")" in line[line.index("(") + 1:]:
+                in_block = False
+        elif in_block and ")" in line:
+            in_block = False
+        elif in_block and module in line:
+            continue
+        out.append(line)
+    return "".join(out)
+
+
+class GoOverlayEvaluation:
+    """One evaluation of a folder of generated Go tests against the unmodified project."""
+
+    def __init__(self, project_path: str, test_dir: str, report_dir: Optional[str] = None, go: str = "go",
+                 jobs: Optional[int] = None, timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        self.project_path = os.path.abspath(project_path)
+        self.test_dir = os.path.abspath(test_dir)
+        self.report_dir = os.path.abspath(report_dir or f"{self.test_dir}-report")
+        self.go = go
+        self.jobs = jobs or os.cpu_count() or 4
+        self.timeout = timeout
+        self.settings = project_settings(self.project_path)
+        self.workspace = tempfile.mkdtemp(prefix="go-overlay-")
+        self.modfile = os.path.join(self.workspace, "go.mod")
+        self.overlay: Dict[str, str] = {}
+        self.packages: Dict[str, List[str]] = {}   # package dir -> test files, relative to the project
+
+    def _go(self, args: List[str], cwd: Optional[str] = None) -> Tuple[int, str]:
+        try:
+            proc = subprocess.run([self.go] + args, cwd=cwd or self.project_path, stdout=subprocess.PIPE,
+                                  stderr=subprocess.STDOUT, text=True, errors="replace", timeout=self.timeout)
+            return proc.returncode, proc.stdout
+        except subprocess.TimeoutExpired:
+            return 124, f"go {args[0]} timed out after {self.timeout}s"
+
+    def build_flags(self) -> List[str]:
+        return [f"-modfile={self.modfile}"]
+
+    def overlay_flag(self) -> str:
+        path = os.path.join(self.workspace, "overlay.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"Replace": self.overlay}, f)
+        return f"-overlay={path}"
+
+    def prepare(self) -> int:
+        """Write the modfile copy and the overlay; returns the number of generated test files."""
+        for name in ("go.mod", "go.sum"):
+            src = os.path.join(self.project_path, name)
+            if os.path.exists(src):
+                shutil.copyfile(src, os.path.join(self.workspace, name))
+        rewritten_dir = os.path.join(self.workspace, "src")
+        tests = discover_test_files(self.test_dir, suffixes=("_test.go",), prefixes=())
+        for path in tests:
+            rel = os.path.relpath(path, self.test_dir)
+            target = os.path.join(self.project_path, rel)
+            replacement = path
+            if self.settings is not None:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    source = f.read()
+                rewritten = remove_cycle_import(source, self.settings.module)
+                if rewritten != source:
+                    replacement = os.path.join(rewritten_dir, rel)
+                    os.makedirs(os.path.dirname(replacement), exist_ok=True)
+                    with open(replacement, "w", encoding="utf-8") as f:
+                        f.write(rewritten)
+            self.overlay[target] = replacement
+            self.packages.setdefault(os.path.dirname(rel) or ".", []).append(rel)
+        # Like the copied tree, the packages under test contain none of the project's own tests
+        for package_dir in self.packages:
+            directory = os.path.join(self.project_path, package_dir)
+            if os.path.isdir(directory):
+                for name in os.listdir(directory):
+                    path = os.path.join(directory, name)
+                    if name.endswith("_test.go") and path not in self.overlay:
+                        self.overlay[path] = ""
+        return len(tests)
+
+    def tidy(self) -> None:
+        """Add the generated tests' dependencies to the modfile copy (best effort, like the bash script)."""
+        code, output = self._go(["mod", "tidy", "-e"] + self.build_flags() + [self.overlay_flag()])
+        if code != 0:
+            print(f"Warning: go mod tidy failed, continuing with the project's go.mod:\n{output.strip()}")
+
+    def triage(self) -> None:
+        triage = GoTriage(self.project_path, go=self.go, jobs=self.jobs, packages=self.packages,
+                          overlay=self.overlay, build_flags=self.build_flags(), vet=False)
+        try:
+            results = triage_module(triage, os.path.join(self.report_dir, "quarantine"),
+                                    os.path.join(self.report_dir, "triage.json"))
+        finally:
+            triage.close()
+        self.overlay = triage.overlay
+        quarantined = {r.test_file for r in results if not r.ok}
+        self.packages = {p: [t for t in tests if t not in quarantined] for p, tests in self.packages.items()}
+
+    def build_test_binary(self, package_dir: str, index: int, overlay_flag: str) -> Optional[str]:
+        binary = os.path.join(self.workspace, "bin", f"{index}.test")
+        os.makedirs(os.path.dirname(binary), exist_ok=True)
+        # vet opens the source files from disk, where the generated tests do not exist
+        args = ["test", "-c", "-o", binary, "-vet=off", "-covermode=atomic"] + self.build_flags() + [overlay_flag]
+        if self.settings is not None:
+            args.append(f"-coverpkg={self.settings.cover_packages}")
+        args.append("." if package_dir == "." else "./" + package_dir)
+        code, output = self._go(args)
+        if code != 0 or not os.path.exists(binary):
+            print(f"Error: building the tests of {package_dir} failed:\n{output.strip()}")
+            return None
+        return binary
+
+    def scratch_dir(self, package_dir: str, index: int) -> str:
+        """
+        Working directory of one test function: empty apart from a link to the
+        package's testdata, so files a test writes never land in the project.
+        """
+        scratch = os.path.join(self.workspace, "run", str(index))
+        os.makedirs(scratch, exist_ok=True)
+        testdata = os.path.join(self.project_path, package_dir, "testdata")
+        if os.path.isdir(testdata):
+            os.symlink(testdata, os.path.join(scratch, "testdata"))
+        return scratch
+
+    def run_function(self, binary: Optional[str], package_dir: str, funcname: str, profile: str,
+                     index: int = 0) -> bool:
+        if binary is None:
+            return False
+        print(f"Running test function: {funcname}")
+        cmd = [binary, f"-test.run=^{funcname}$", f"-test.coverprofile={profile}", f"-test.timeout={int(self.timeout)}s"]
+        try:
+            proc = subprocess.run(cmd, cwd=self.scratch_dir(package_dir, index), stdout=subprocess.PIPE,
+                                  stderr=subprocess.STDOUT, text=True, errors="replace", timeout=self.timeout + 10)
+        except subprocess.TimeoutExpired:
+            return False
+        return proc.returncode == 0
+
+    def run(self) -> str:
+        os.makedirs(self.report_dir, exist_ok=True)
+        total_files = self.prepare()
+        self.tidy()
+        self.triage()
+        overlay_flag = self.overlay_flag()
+
+        profiles_dir = os.path.join(self.workspace, "profiles")
+        os.makedirs(profiles_dir, exist_ok=True)
+        jobs = []   # (test file, function, binary, package dir, profile)
+        for index, (package_dir, tests) in enumerate(sorted(self.packages.items())):
+            if not tests:
+                continue
+            binary = self.build_test_binary(package_dir, index, overlay_flag)
+            for test_file in tests:
+                with open(self.overlay[os.path.join(self.project_path, test_file)], "r",
+                          encoding="utf-8", errors="replace") as f:
+                    funcs = _TEST_FUNC.findall(f.read())
+                for funcname in funcs:
+                    profile = os.path.join(profiles_dir, f"{len(jobs)}.out")
+                    jobs.append((test_file, funcname, binary, package_dir, profile))
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as ex:
+            passed = list(ex.map(lambda i: self.run_function(jobs[i][2], jobs[i][3], jobs[i][1], jobs[i][4], i),
+                                 range(len(jobs))))
+
+        per_file: Dict[str, List[int]] = {}
+        for i, (test_file, _, _, _, _) in enumerate(jobs):
+            per_file.setdefault(test_file, []).append(i)
+        passed_files = sum(1 for idx in per_file.values() if all(passed[i] for i in idx))
+
+        per_test_dir = os.path.join(self.report_dir, "per_test_coverage")
+        os.makedirs(per_test_dir, exist_ok=True)
+        merged = GoCoverage()
+        merged.mode = "atomic"
+        for test_file, idx in per_file.items():
+            file_cov = GoCoverage.from_profiles(jobs[i][4] for i in idx if os.path.exists(jobs[i][4]))
+            if len(file_cov):
+                file_cov.write(os.path.join(per_test_dir, os.path.basename(test_file)[:-3] + ".out"))
+            for i in idx:
+                if os.path.exists(jobs[i][4]):
+                    merged.add_profile(jobs[i][4])
+        coverage_out = os.path.join(self.report_dir, "coverage.out")
+        merged.write(coverage_out)
+        totals = merged.totals()
+
+        total_funcs = len(jobs)
+        passed_funcs = sum(passed)
+        file_rate = 100.0 * passed_files / total_files if total_files else 0.0
+        func_rate = 100.0 * passed_funcs / total_funcs if total_funcs else 0.0
+        return "\n".join([
+            "Test Results Summary:",
+            "-------------------",
+            f"Files: {passed_files}/{total_files} passed ({file_rate:.2f}%)",
+            f"Functions: {passed_funcs}/{total_funcs} passed ({func_rate:.2f}%)",
+            "-------------------",
+            "-------------------",
+            f"Coverage Report: {coverage_out}",
+            f"Total Statements: {totals.total}",
+            f"Covered Statements: {totals.covered}",
+            f"Coverage Percentage: {totals.percent:.2f}%",
+            "-------------------",
+        ])
+
+    def close(self) -> None:
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+
+def evaluate_go_folder(project_path: str, test_dir: str, report_dir: Optional[str] = None, go: str = "go",
+                       jobs: Optional[int] = None) -> str:
+    """Evaluate a folder of generated Go tests and return go_coverage.bash's summary output."""
+    evaluation = GoOverlayEvaluation(project_path, test_dir, report_dir, go=go, jobs=jobs)
+    try:
+        return evaluation.run()
+    finally:
+        evaluation.close()
+
+
+# Toy module for smoke_test(): one passing generated test, one that does not compile,
+# and a project test that the overlay must hide
+_SMOKE_FILES = {
+    "project/go.mod": "module example.com/toy\n\ngo 1.16\n",
+    "project/calc.go": "package toy\n\nfunc Add(a, b int) int {\n\treturn a + b\n}\n",
+    "project/calc_test.go": "package toy\n\nimport \"testing\"\n\nfunc TestProjectOwn(t *testing.T) { t.Fatal(\"not hidden\") }\n",
+    "tests/add_test.go": ("package toy\n\nimport \"testing\"\n\nfunc TestAdd(t *testing.T) {\n"
+                          "\tif Add(1, 2) != 3 {\n\t\tt.Fatal(\"Add\")\n\t}\n}\n"),
+    "tests/broken_test.go": "package toy\n\nimport \"testing\"\n\nfunc TestBroken(t *testing.T) { Sub(1, 2) }\n",
+}
+_SMOKE_EXPECTED = ["Files: 1/2 passed", "Functions: 1/1 passed", "Total Statements: 1", "Covered Statements: 1"]
+
+
+def smoke_test(go: str = "go") -> bool:
+    """
+    Evaluate a toy module end to end (overlay-only tests through triage, test
+    binary and coverage) and check the summary and that the project is untouched.
+    """
+    root = tempfile.mkdtemp(prefix="go-overlay-smoke-")
+    try:
+        for rel, content in _SMOKE_FILES.items():
+            path = os.path.join(root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+        project = os.path.join(root, "project")
+        before = sorted(os.listdir(project))
+        try:
+            output = evaluate_go_folder(project, os.path.join(root, "tests"), os.path.join(root, "report"),
+                                        go=go, jobs=2)
+        except (OSError, subprocess.SubprocessError, TriageError) as e:
+            print(f"Go overlay smoke test failed: {e}")
+            return False
+        missing = [line for line in _SMOKE_EXPECTED if line not in output]
+        if missing or sorted(os.listdir(project)) != before:
+            print(f"Go overlay smoke test failed (expected {missing or 'an untouched project'}):\n{output}")
+            return False
+        return True
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+_smoke_results: Dict[str, bool] = {}
+_smoke_lock = threading.Lock()
+
+
+def overlay_available(go: str = "go") -> bool:
+    """Whether this Go toolchain passes smoke_test() (run once per process, thread-safe)."""
+    with _smoke_lock:
+        if go not in _smoke_results:
+            _smoke_results[go] = shutil.which(go) is not None and smoke_test(go)
+        return _smoke_results[go]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Evaluate generated Go tests through -overlay (coverage + pass rate).")
+    ap.add_argument("project_path", nargs="?")
+    ap.add_argument("test_dir", nargs="?")
+    ap.add_argument("report_dir", nargs="?", default=None)
+    ap.add_argument("--jobs", type=int, default=None)
+    ap.add_argument("--go", default="go", help="Go binary.")
+    ap.add_argument("--smoke", action="store_true", help="Only run the toy-module smoke test.")
+    args = ap.parse_args()
+    if args.smoke:
+        ok = smoke_test(args.go)
+        print("Go overlay smoke test " + ("passed" if ok else "failed"))
+        sys.exit(0 if ok else 1)
+    if not args.project_path or not args.test_dir:
+        ap.error("project_path and test_dir are required unless --smoke is given")
+    if not os.path.isfile(os.path.join(args.project_path, "go.mod")):
+        print("Error: go.mod file not found in target project path.")
+        sys.exit(1)
+    try:
+        print(evaluate_go_folder(args.project_path, args.test_dir, args.report_dir, go=args.go, jobs=args.jobs))
+    except TriageError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
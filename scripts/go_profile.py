@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Streaming reader and merger for Go coverage profiles (go test -coverprofile).
+
+    mode: atomic
+    github.com/sirupsen/logrus/entry.go:42.35,44.2 1 3
+    <file>:<startLine>.<startCol>,<endLine>.<endCol> <numStmt> <count>
+
+go_coverage.bash runs every test function with its own -coverprofile, so a
+report is hundreds of profiles (or their concatenation) describing the same
+blocks. GoCoverage reads them line by line and interns each block once: its
+location text maps to a slot in flat arrays of file ids, positions,
+statement counts and hit counts, and a block seen again only needs one
+dict lookup. Merging is linear in the input and memory grows with the
+number of distinct blocks only.
+
+Merging follows `go tool cover`: a block seen again adds its count (set mode
+ORs it), and statements are weighted by the numStmt column, so the totals
+and per-function numbers equal `go tool cover -func` on the merged profile.
+
+Usage:
+    python go_profile.py merge -o merged.out PROFILE|DIR ...
+    python go_profile.py report [--by package|file|func] [--source-root DIR] PROFILE|DIR ...
+"""
+
+import argparse
+import os
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MODES = ("set", "count", "atomic")
+
+
+@dataclass
+class CoverageTotals:
+    covered: int = 0
+    total: int = 0
+
+    @property
+    def percent(self) -> float:
+        return 100.0 * self.covered / self.total if self.total else 0.0
+
+
+@dataclass
+class FunctionCoverage:
+    file_name: str      # profile path (import path + file)
+    line: int
+    name: str
+    covered: int
+    total: int
+
+    @property
+    def percent(self) -> float:
+        return 100.0 * self.covered / self.total if self.total else 0.0
+
+
+def parse_location(location: str) -> Tuple[str, int, int, int, int]:
+    """(file, startLine, startCol, endLine, endCol) of "file:l.c,l.c"; ValueError if malformed."""
+    file_name, _, span = location.rpartition(":")
+    start, _, end = span.partition(",")
+    start_line, _, start_col = start.partition(".")
+    end_line, _, end_col = end.partition(".")
+    if not file_name:
+        raise ValueError(f"no file name in {location!r}")
+    return file_name, int(start_line), int(start_col), int(end_line), int(end_col)
+
+
+def profile_paths(inputs: Iterable[str]) -> List[str]:
+    """Profiles named on the command line; a directory stands for its *.out files."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(os.path.join(item, n) for n in os.listdir(item) if n.endswith(".out")))
+        else:
+            paths.append(item)
+    return paths
+
+
+class GoCoverage:
+    """Merged coverage of any number of profiles, one array slot per distinct block."""
+
+    def __init__(self):
+        self.mode: Optional[str] = None
+        self.files: List[str] = []
+        self.malformed = 0
+        self._file_ids: Dict[str, int] = {}
+        self._blocks: Dict[str, int] = {}   # location text -> array slot
+        self.block_file = array("I")
+        self.start_line = array("I")
+        self.start_col = array("I")
+        self.end_line = array("I")
+        self.end_col = array("I")
+        self.num_stmt = array("I")
+        self.count = array("Q")
+
+    def __len__(self) -> int:
+        return len(self.num_stmt)
+
+    def add_profile(self, path: str) -> None:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            self.add_lines(f)
+
+    def add_lines(self, lines: Iterable[str]) -> None:
+        """Merge profile lines; "mode:" lines may repeat (concatenated profiles) but must agree."""
+        for line in lines:
+            if line.startswith("mode:"):
+                self._set_mode(line[5:].strip())
+                continue
+            try:
+                location, num_stmt, count = line.split()
+                self.add_block(location, int(num_stmt), int(count))
+            except ValueError:
+                if line.strip():
+                    self.malformed += 1
+
+    def _set_mode(self, mode: str) -> None:
+        if mode not in MODES:
+            raise ValueError(f"unknown coverage mode {mode!r}")
+        if self.mode is None:
+            self.mode = mode
+        elif mode != self.mode:
+            raise ValueError(f"cannot merge profiles with modes {self.mode!r} and {mode!r}")
+
+    def add_block(self, location: str, num_stmt: int, count: int) -> None:
+        idx = self._blocks.get(location)
+        if idx is None:
+            file_name, start_line, start_col, end_line, end_col = parse_location(location)
+            file_id = self._file_ids.get(file_name)
+            if file_id is None:
+                file_id = self._file_ids[file_name] = len(self.files)
+                self.files.append(file_name)
+            self._blocks[location] = len(self.num_stmt)
+            self.block_file.append(file_id)
+            self.start_line.append(start_line)
+            self.start_col.append(start_col)
+            self.end_line.append(end_line)
+            self.end_col.append(end_col)
+            self.num_stmt.append(num_stmt)
+            self.count.append(count)
+        elif self.mode == "set":
+            self.count[idx] = 1 if (self.count[idx] or count) else 0
+        else:
+            self.count[idx] += count
+
+    @classmethod
+    def from_profiles(cls, paths: Iterable[str]) -> "GoCoverage":
+        merged = cls()
+        for path in paths:
+            merged.add_profile(path)
+        return merged
+
+    # aggregates
+    def totals(self) -> CoverageTotals:
+        result = CoverageTotals()
+        for stmts, count in zip(self.num_stmt, self.count):
+            result.total += stmts
+            if count:
+                result.covered += stmts
+        return result
+
+    def by_file(self) -> Dict[str, CoverageTotals]:
+        per_id = [CoverageTotals() for _ in self.files]
+        for file_id, stmts, count in zip(self.block_file, self.num_stmt, self.count):
+            totals = per_id[file_id]
+            totals.total += stmts
+            if count:
+                totals.covered += stmts
+        return dict(zip(self.files, per_id))
+
+    def by_package(self) -> Dict[str, CoverageTotals]:
+        result: Dict[str, CoverageTotals] = {}
+        for file_name, totals in self.by_file().items():
+            package = result.setdefault(os.path.dirname(file_name), CoverageTotals())
+            package.covered += totals.covered
+            package.total += totals.total
+        return result
+
+    def by_function(self, resolve) -> List[FunctionCoverage]:
+        """
+        Per-function coverage like `go tool cover -func`. resolve(profile file
+        name) returns the Go source path or None (the file is then skipped).
+        """
+        blocks_by_file: Dict[int, List[int]] = {}
+        for i, file_id in enumerate(self.block_file):
+            blocks_by_file.setdefault(file_id, []).append(i)
+        results = []
+        for file_id, blocks in blocks_by_file.items():
+            file_name = self.files[file_id]
+            source = resolve(file_name)
+            if source is None:
+                continue
+            blocks.sort(key=lambda i: (self.start_line[i], self.start_col[i]))
+            for fn in go_functions(source):
+                covered = total = 0
+                for i in blocks:
+                    if (self.start_line[i], self.start_col[i]) >= (fn.end_line, fn.end_col):
+                        break
+                    if (self.end_line[i], self.end_col[i]) <= (fn.start_line, fn.start_col):
+                        continue
+                    total += self.num_stmt[i]
+                    if self.count[i]:
+                        covered += self.num_stmt[i]
+                results.append(FunctionCoverage(file_name, fn.start_line, fn.name, covered, total))
+        return results
+
+    def write(self, path: str) -> None:
+        """Write the merged profile (readable by `go tool cover`)."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(f"mode: {self.mode or 'set'}\n")
+            for i in range(len(self.num_stmt)):
+                f.write(f"{self.files[self.block_file[i]]}:{self.start_line[i]}.{self.start_col[i]},"
+                        f"{self.end_line[i]}.{self.end_col[i]} {self.num_stmt[i]} {self.count[i]}\n")
+        os.replace(tmp, path)
+
+
+@dataclass
+class FuncExtent:
+    name: str
+    start_line: int
+    start_col: int
+    end_line: int
+    end_col: int
+
+
+def go_functions(source_path: str) -> List[FuncExtent]:
+    """
+    Top-level func declarations with a body, from `func` to just past the closing
+    brace, with 1-based byte columns as in profiles. A small scanner (comments,
+    strings, runes, brace depth) instead of go/ast: good enough for gofmt'ed code.
+    """
+    with open(source_path, "rb") as f:
+        text = f.read().decode("latin-1")  # one char per byte, so columns are byte columns
+    functions: List[FuncExtent] = []
+    n = len(text)
+    i = 0
+    line, line_start = 1, 0
+    depth = 0                          # brace depth
+    header: Optional[List] = None      # [name, line, col] of the func being scanned
+    parens = 0                         # ( and [ depth inside the header
+    in_body = False
+    prev = ""                          # previous token, to tell interface{} / struct{} from the body
+    while i < n:
+        c = text[i]
+        if c == "\n":
+            if header is not None and not in_body and depth == 0 and parens == 0:
+                header = None          # declaration without a body
+            line, line_start = line + 1, i + 1
+            i += 1
+            continue
+        if c in " \t\r":
+            i += 1
+            continue
+        if text.startswith("//", i):
+            nl = text.find("\n", i)
+            i = n if nl < 0 else nl
+            continue
+        if text.startswith("/*", i):
+            close = text.find("*/", i + 2)
+            close = n if close < 0 else close + 2
+            newlines = text.count("\n", i, close)
+            if newlines:
+                line, line_start = line + newlines, text.rfind("\n", i, close) + 1
+            i = close
+            continue
+        if c in "\"'`":
+            j = i + 1
+            while j < n and text[j] != c:
+                if c == "`" and text[j] == "\n":
+                    line, line_start = line + 1, j + 1
+                elif c != "`" and text[j] == "\\":
+                    j += 1
+                j += 1
+            i, prev = j + 1, c
+            continue
+        if c.isalnum() or c == "_":
+            j = i + 1
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            token = text[i:j]
+            if token == "func" and depth == 0 and header is None and i == line_start:
+                header, parens, in_body = [None, line, 1], 0, False
+            elif header is not None and header[0] is None and parens == 0 and not in_body:
+                header[0] = token
+            i, prev = j, token
+            continue
+        if header is not None and not in_body and depth == 0:
+            if c in "([":
+                parens += 1
+            elif c in ")]":
+                parens -= 1
+            elif c == "{" and parens == 0 and prev not in ("interface", "struct"):
+                in_body = True
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0 and in_body:
+                functions.append(FuncExtent(header[0] or "", header[1], header[2], line, i - line_start + 2))
+                header, in_body = None, False
+        i, prev = i + 1, c
+    return functions
+
+
+class GoSourceResolver:
+    """Maps profile file names (import paths) to files under a module root, via go.mod."""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.module = ""
+        try:
+            with open(os.path.join(self.root, "go.mod"), "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("module "):
+                        self.module = line.split()[1].strip('"')
+                        break
+        except OSError:
+            pass
+
+    def __call__(self, file_name: str) -> Optional[str]:
+        candidates = []
+        if self.module and file_name.startswith(self.module + "/"):
+            candidates.append(file_name[len(self.module) + 1:])
+        candidates.append(file_name)
+        # Without a matching module line, try ever shorter suffixes of the import path
+        parts = file_name.split("/")
+        candidates.extend("/".join(parts[k:]) for k in range(1, len(parts)))
+        for rel in candidates:
+            path = os.path.join(self.root, rel)
+            if os.path.isfile(path):
+                return path
+        return None
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Merge Go coverage profiles and report statement coverage.")
+    sub = ap.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("merge", help="Merge profiles into one.")
+    p.add_argument("-o", "--output", required=True)
+    p.add_argument("profiles", nargs="+")
+    p = sub.add_parser("report", help="Statement coverage per package, file or function.")
+    p.add_argument("--by", choices=("package", "file", "func"), default="package")
+    p.add_argument("--source-root", default=".", help="Module root (with go.mod), for --by func.")
+    p.add_argument("profiles", nargs="+")
+    args = ap.parse_args()
+
+    coverage = GoCoverage.from_profiles(profile_paths(args.profiles))
+    if coverage.malformed:
+        print(f"Skipped {coverage.malformed} malformed lines", file=sys.stderr)
+    if args.command == "merge":
+        coverage.write(args.output)
+        print(f"Merged {len(coverage)} blocks from {len(coverage.files)} files into {args.output}")
+        return
+
+    if args.by == "func":
+        for fn in coverage.by_function(GoSourceResolver(args.source_root)):
+            print(f"{fn.file_name}:{fn.line}:\t{fn.name}\t{fn.percent:.1f}%")
+    else:
+        rows = coverage.by_package() if args.by == "package" else coverage.by_file()
+        for name, totals in sorted(rows.items()):
+            print(f"{name}\t{totals.covered}/{totals.total}\t{totals.percent:.1f}%")
+    totals = coverage.totals()
+    print(f"total:\t(statements)\t{totals.percent:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
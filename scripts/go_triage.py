@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+One-round compile triage of generated Go tests (replaces go_clean.py's retry loop).
+
+go_coverage.bash used to run `go test ./...`, scrape the log with
+go_clean.py's regexes, delete whatever files they matched and build again,
+up to 100 times. Here every generated _test.go file is type-checked on its
+own, in parallel, by building its package's test binary (`go test -c -o
+/dev/null`): an overlay hides the package's other generated tests, so a
+failure always belongs to the file being checked and needs no log scraping.
+`go build ./...` runs first so all checks share the compiled packages in the
+build cache.
+
+Failures are classified from the compiler diagnostics (undefined, type_error,
+unused, syntax, import_cycle, missing_package, redeclared, vet, timeout,
+other), and
+files that only break together (the same top-level name declared in two
+generated files of one package) are caught by a declaration scan. All bad
+files are moved to the quarantine folder in one round, after the survivors
+of each package are built together (again, while that build names further
+surviving files). If the packages under test do not build on their own,
+triage stops with the build output instead of blaming every test file.
+
+`go test -c` runs the same vet analyzers `go test` runs before testing, so a
+file that passes triage also gets through go test's build and vet step. With
+vet=False (go_overlay.py, whose tests exist only in the overlay: vet opens
+the files from disk) the check is `-vet=off`, matching how those tests are
+built and run.
+
+Usage:
+    python go_triage.py <module_dir> [--quarantine DIR] [--report triage.json] [--jobs N]
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_TIMEOUT_SECONDS = 300
+
+_DIAGNOSTIC = re.compile(r"^(?:vet: )?(?P<file>[^\s:]+\.go):(?P<line>\d+)(?::(?P<col>\d+))?: (?P<message>.*)$")
+# First match wins, so the more specific patterns come first
+_CATEGORIES: List[Tuple[str, re.Pattern]] = [
+    ("import_cycle", re.compile(r"import cycle not allowed")),
+    ("missing_package", re.compile(r"no required module provides package|cannot find package|is not in std"
+                                   r"|could not import|package .* is not in GOROOT")),
+    ("syntax", re.compile(r"syntax error|expected '|expected declaration|non-declaration statement")),
+    ("redeclared", re.compile(r"redeclared in this block|other declaration of|already declared")),
+    ("unused", re.compile(r"imported and not used|declared and not used|declared but not used")),
+    ("undefined", re.compile(r"undefined: |undeclared name|has no field or method|unexported field or method"
+                             r"|cannot refer to unexported")),
+    ("type_error", re.compile(r"cannot use |mismatched types|invalid operation|cannot convert"
+                              r"|(?:too many|not enough) (?:arguments|return values)|is not a type"
+                              r"|assignment mismatch|cannot assign|cannot call|invalid argument")),
+]
+_TOP_LEVEL_NAME = re.compile(r"^(?:func|type|var|const)\s+([A-Za-z_]\w*)", re.MULTILINE)
+
+
+class TriageError(RuntimeError):
+    """The packages under test do not build, so no test file can be judged."""
+
+
+@dataclass
+class Diagnostic:
+    file: str
+    line: int
+    message: str
+
+
+@dataclass
+class TriageResult:
+    test_file: str                       # relative to the module dir
+    ok: bool
+    category: Optional[str] = None
+    diagnostics: List[Diagnostic] = field(default_factory=list)
+    output: str = ""
+
+
+def classify(text: str) -> str:
+    for category, pattern in _CATEGORIES:
+        if pattern.search(text):
+            return category
+    return "other"
+
+
+def parse_diagnostics(output: str) -> List[Diagnostic]:
+    diagnostics = []
+    for line in output.splitlines():
+        m = _DIAGNOSTIC.match(line.strip())
+        if m:
+            diagnostics.append(Diagnostic(m["file"], int(m["line"]), m["message"]))
+    return diagnostics
+
+
+def failure_category(output: str, diagnostics: List[Diagnostic], vet: bool = True) -> str:
+    """Category of a failed check: the first classifiable diagnostic, else the whole output."""
+    for diagnostic in diagnostics:
+        category = classify(diagnostic.message)
+        if category != "other":
+            return category
+    category = classify(output)
+    # Compiler errors come under a "# pkg [pkg.test]" header, vet findings under a plain "# pkg"
+    if category == "other" and vet and diagnostics and not re.search(r"^# \S+ \[", output, re.MULTILINE):
+        return "vet"
+    return category
+
+
+def generated_tests(module_dir: str) -> Dict[str, List[str]]:
+    """Package directory (relative) -> its _test.go files (relative), sorted."""
+    packages: Dict[str, List[str]] = {}
+    for root, dirnames, files in os.walk(module_dir):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in ("vendor", "testdata"))
+        tests = sorted(f for f in files if f.endswith("_test.go"))
+        if tests:
+            rel = os.path.relpath(root, module_dir)
+            packages[rel] = [os.path.normpath(os.path.join(rel, f)) for f in tests]
+    return packages
+
+
+class GoTriage:
+    """Type-checks generated test files one at a time against a warm build cache."""
+
+    def __init__(self, module_dir: str, go: str = "go", jobs: Optional[int] = None,
+                 timeout: float = DEFAULT_TIMEOUT_SECONDS, packages: Optional[Dict[str, List[str]]] = None,
+                 overlay: Optional[Dict[str, str]] = None, build_flags: Sequence[str] = (),
+                 vet: bool = True):
+        """
+        packages / overlay let go_overlay.py triage tests that exist only in an
+        overlay (module path -> generated file) instead of on disk under module_dir;
+        vet=False builds with -vet=off, as go vet cannot read overlay-only files.
+        """
+        self.module_dir = os.path.abspath(module_dir)
+        self.go = go
+        self.jobs = jobs or os.cpu_count() or 4
+        self.timeout = timeout
+        self.packages = packages if packages is not None else generated_tests(self.module_dir)
+        self.overlay = dict(overlay or {})
+        self.build_flags = list(build_flags)
+        self.vet = vet
+        self._overlay_dir = tempfile.mkdtemp(prefix="go-triage-")
+
+    def _run(self, args: List[str]) -> Tuple[int, str]:
+        try:
+            proc = subprocess.run([self.go] + args, cwd=self.module_dir, stdout=subprocess.PIPE,
+                                  stderr=subprocess.STDOUT, text=True, errors="replace", timeout=self.timeout)
+            return proc.returncode, proc.stdout
+        except subprocess.TimeoutExpired:
+            return 124, f"go {args[0]} timed out after {self.timeout}s"
+
+    def warm_cache(self) -> Tuple[int, str]:
+        """Build the packages under test once so every per-file check reuses them."""
+        return self._run(["build"] + self.build_flags + [_package_arg(p) for p in sorted(self.packages)])
+
+    def compile_tests(self, package_dir: str, hidden: List[str], tag: str) -> Tuple[int, str]:
+        """`go test -c` of one package, binary discarded, with the hidden files removed by overlay."""
+        args = ["test", "-c", "-o", os.devnull] + ([] if self.vet else ["-vet=off"]) + self.build_flags
+        replace = dict(self.overlay)
+        replace.update((os.path.join(self.module_dir, path), "") for path in hidden)
+        if replace:
+            overlay = os.path.join(self._overlay_dir, f"{tag}.json")
+            with open(overlay, "w", encoding="utf-8") as f:
+                json.dump({"Replace": replace}, f)
+            args.append(f"-overlay={overlay}")
+        return self._run(args + [_package_arg(package_dir)])
+
+    def source_path(self, test_file: str) -> str:
+        """File holding the content of a test file (the overlay replacement, if any)."""
+        path = os.path.join(self.module_dir, test_file)
+        return self.overlay.get(path) or path
+
+    def check_file(self, index: int, package_dir: str, test_file: str) -> TriageResult:
+        others = [t for t in self.packages[package_dir] if t != test_file]
+        code, output = self.compile_tests(package_dir, others, str(index))
+        if code == 0:
+            return TriageResult(test_file, True)
+        diagnostics = parse_diagnostics(output)
+        category = "timeout" if code == 124 else failure_category(output, diagnostics, self.vet)
+        return TriageResult(test_file, False, category, diagnostics, output[-4000:])
+
+    def conflicts(self, survivors: List[str]) -> Dict[str, str]:
+        """Files redeclaring a top-level name an earlier surviving file of the same package declares."""
+        seen: Dict[Tuple[str, str], str] = {}
+        conflicting: Dict[str, str] = {}
+        for test_file in survivors:
+            with open(self.source_path(test_file), "r", encoding="utf-8", errors="replace") as f:
+                source = f.read()
+            package = _package_key(os.path.dirname(test_file), source)
+            names = set(_TOP_LEVEL_NAME.findall(source)) - {"_", "init"}
+            clash = next((name for name in sorted(names) if (package, name) in seen), None)
+            if clash is not None:
+                conflicting[test_file] = f"{clash} redeclared (also in {seen[(package, clash)]})"
+                continue
+            for name in names:
+                seen[(package, name)] = test_file
+        return conflicting
+
+    def run(self) -> List[TriageResult]:
+        code, output = self.warm_cache()
+        if code != 0:
+            raise TriageError(f"go build of the packages under test failed:\n{output.strip()}")
+        tasks = [(package_dir, test_file) for package_dir, tests in sorted(self.packages.items())
+                 for test_file in tests]
+        with ThreadPoolExecutor(max_workers=self.jobs) as ex:
+            results = list(ex.map(lambda job: self.check_file(job[0], *job[1]), enumerate(tasks)))
+
+        survivors = [r.test_file for r in results if r.ok]
+        by_file = {r.test_file: r for r in results}
+        for test_file, reason in self.conflicts(survivors).items():
+            by_file[test_file] = TriageResult(test_file, False, "redeclared",
+                                              [Diagnostic(test_file, 0, reason)], reason)
+        return [by_file[t] for _, t in tasks]
+
+    def confirm(self, results: List[TriageResult]) -> List[TriageResult]:
+        """
+        Build the survivors of every package together; files named in any remaining
+        error fail too. The compiler stops early, so a package is built again until
+        its survivors compile or an error no longer names a surviving file.
+        """
+        by_file = {r.test_file: r for r in results}
+        failed = []
+        pending = sorted(self.packages)
+        round_number = 0
+        while pending:
+            retry = []
+            for i, package_dir in enumerate(pending):
+                bad = [t for t in self.packages[package_dir] if not by_file[t].ok]
+                code, output = self.compile_tests(package_dir, bad, f"confirm-{round_number}-{i}")
+                if code == 0:
+                    continue
+                named = False
+                for diagnostic in parse_diagnostics(output):
+                    path = os.path.relpath(os.path.join(self.module_dir, diagnostic.file), self.module_dir)
+                    r = by_file.get(path)
+                    if r is not None and r.ok:
+                        r.ok, r.category, r.output = False, classify(diagnostic.message), output[-4000:]
+                        r.diagnostics.append(diagnostic)
+                        failed.append(r)
+                        named = True
+                if named:
+                    retry.append(package_dir)
+            pending = retry
+            round_number += 1
+        return failed
+
+    def quarantine(self, results: List[TriageResult], quarantine_dir: str) -> int:
+        """Move failing files to quarantine_dir; overlay-only files are copied and dropped from the overlay."""
+        moved = 0
+        for r in results:
+            if r.ok:
+                continue
+            path = os.path.join(self.module_dir, r.test_file)
+            src = self.source_path(r.test_file)
+            if not os.path.exists(src):
+                continue
+            dst = os.path.join(quarantine_dir, r.test_file)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if src != path:
+                shutil.copyfile(src, dst)
+                self.overlay[path] = ""
+            else:
+                shutil.move(src, dst)
+            moved += 1
+        return moved
+
+    def close(self) -> None:
+        shutil.rmtree(self._overlay_dir, ignore_errors=True)
+
+
+def _package_arg(package_dir: str) -> str:
+    return "." if package_dir == "." else "./" + package_dir
+
+
+def _package_key(package_dir: str, source: str) -> str:
+    # Internal (package foo) and external (package foo_test) tests of a directory are separate packages
+    m = re.search(r"^package\s+(\w+)", source, re.MULTILINE)
+    return f"{package_dir}:{m.group(1) if m else ''}"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Type-check generated Go tests in isolation and quarantine bad files.")
+    ap.add_argument("module_dir", help="Module root (with go.mod) holding the sources and generated tests.")
+    ap.add_argument("--quarantine", default=None, help="Where failing files are moved (default: <module_dir>-quarantine).")
+    ap.add_argument("--report", default=None, help="Write the per-file results as JSON.")
+    ap.add_argument("--jobs", type=int, default=None)
+    ap.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS, help="Seconds per go command.")
+    ap.add_argument("--go", default="go", help="Go binary.")
+    args = ap.parse_args()
+
+    if not os.path.isfile(os.path.join(args.module_dir, "go.mod")):
+        print(f"Error: no go.mod in {args.module_dir}")
+        sys.exit(1)
+    triage = GoTriage(args.module_dir, go=args.go, jobs=args.jobs, timeout=args.timeout)
+    quarantine_dir = args.quarantine or triage.module_dir.rstrip(os.sep) + "-quarantine"
+    try:
+        triage_module(triage, quarantine_dir, args.report)
+    except TriageError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        triage.close()
+
+
+def triage_module(triage: GoTriage, quarantine_dir: str, report: Optional[str] = None) -> List[TriageResult]:
+    """Run, confirm and quarantine in one round, printing the summary; returns the per-file results."""
+    total = sum(len(tests) for tests in triage.packages.values())
+    print(f"Triage: type-checking {total} test files in {len(triage.packages)} packages "
+          f"with {triage.jobs} jobs...")
+    results = triage.run()
+    late = triage.confirm(results)
+    moved = triage.quarantine(results, quarantine_dir)
+
+    for r in results:
+        if not r.ok:
+            first = r.diagnostics[0].message if r.diagnostics else (r.output.strip().splitlines() or [""])[-1]
+            print(f"[quarantined] {r.test_file} ({r.category}): {first}")
+    counts = Counter(r.category for r in results if not r.ok)
+    print(f"Triage: {total - moved} of {total} test files compile, {moved} quarantined to {quarantine_dir}"
+          + (f" ({len(late)} found by the final build)" if late else ""))
+    if counts:
+        print("Failure categories: " + ", ".join(f"{c}={n}" for c, n in counts.most_common()))
+    if report:
+        with open(report, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -2,60 +2,31 @@
 
 import sys
 
+from go_profile import GoCoverage
+
 def analyze_coverage(file_path):
-    # Dictionary to store coverage info: {line_info: was_covered}
-    coverage_map = {}
+    # Merge every block of the (concatenated) profile, weighted by its statement count
+    coverage = GoCoverage()
 
     try:
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
+        coverage.add_profile(file_path)
 
-        if not lines:
+        if coverage.mode is None and not len(coverage):
             print(f"The file {file_path} is empty.")
             return
 
-        # Skip the mode line
-        for line in lines[1:]:
-            line = line.strip()
-            if not line:
-                continue
-
-            parts = line.split()
-            if len(parts) != 3:
-                print(f"Skipping malformed line: {line}")
-                continue
-
-            line_info, num_statements_str, count_str = parts
-
-            try:
-                count = int(count_str)
-                # If this line was ever covered (count > 0), mark it as covered
-                if line_info in coverage_map:
-                    coverage_map[line_info] = coverage_map[line_info] or (count > 0)
-                else:
-                    coverage_map[line_info] = (count > 0)
-            except ValueError:
-                print(f"Skipping line with invalid numbers: {line}")
-                continue
+        if coverage.malformed:
+            print(f"Skipped {coverage.malformed} malformed lines")
 
         # Calculate final coverage
-        total_statements = len(coverage_map)
-        covered_statements = sum(1 for covered in coverage_map.values() if covered)
-
-        if total_statements == 0:
-            coverage_percentage = 0.0
-        else:
-            coverage_percentage = (covered_statements / total_statements) * 100
+        totals = coverage.totals()
 
-        print(f"Total Statements: {total_statements}")
-        print(f"Covered Statements: {covered_statements}")
-        print(f"Coverage Percentage: {coverage_percentage:.2f}%")
+        print(f"Total Statements: {totals.total}")
+        print(f"Covered Statements: {totals.covered}")
+        print(f"Coverage Percentage: {totals.percent:.2f}%")
 
-        # Optionally write deduplicated coverage file
-        with open(file_path + '.dedup', 'w') as f:
-            f.write("mode: atomic\n")
-            for line_info, covered in coverage_map.items():
-                f.write(f"{line_info} 1 {1 if covered else 0}\n")
+        # Optionally write deduplicated (merged) coverage file
+        coverage.write(file_path + '.dedup')
 
     except FileNotFoundError:
         print(f"Error: The file {file_path} does not exist.")
@@ -71,4 +42,4 @@ def main():
     analyze_coverage(coverage_file)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,7 +1,14 @@
 import re
 
+from jacoco_report import merged_line_counter, print_line_summary, read_totals
+
 def extract_lines(report_path: str) -> None:
-    """Print “Total lines …” and “Missed Lines …” from a JaCoCo HTML report."""
+    """Print “Total lines …” and “Missed Lines …” from a JaCoCo XML, CSV or HTML report."""
+    # XML / CSV: read the report totals with the streaming reader
+    if report_path.endswith((".xml", ".csv")):
+        print_line_summary(read_totals(report_path).counter("LINE"))
+        return
+
     with open(report_path, encoding="utf‑8") as f:
         html = f.read()
 
@@ -41,4 +48,8 @@ def extract_lines(report_path: str) -> None:
 # put the path to your report here, e.g. "index.html"
 if __name__ == "__main__" : 
     import sys  
-    extract_lines(sys.argv[1])
\ No newline at end of file
+    if len(sys.argv) > 2:
+        # several XML reports (one per .exec): union of their covered lines
+        print_line_summary(merged_line_counter(sys.argv[1:]))
+    else:
+        extract_lines(sys.argv[1])
\ No newline at end of file
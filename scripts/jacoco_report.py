@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for JaCoCo reports (jacococli report --xml / --csv).
+
+interpret_jacoco.py used to load the whole HTML report and regex the
+<tfoot> row. The XML report has the same counters for every package,
+class and method:
+
+    <package name="org/apache/commons/cli">
+      <class name="org/apache/commons/cli/Option" sourcefilename="Option.java">
+        <method name="hasArg" desc="()Z" line="412">
+          <counter type="LINE" missed="0" covered="1"/> ...
+      <sourcefile name="Option.java"><line nr="412" mi="0" ci="3" mb="0" cb="0"/> ...
+
+iter_records() walks it with iterparse and clears every element once its
+counters are read, so memory stays flat however large the project is; the
+CSV export (one row per class) gives the same class/package/total records.
+merge_line_coverage() combines reports of different .exec files on the
+<line> elements (a line is covered if any run covered it), which is what
+"Total lines / Missed Lines" mean for a merged run; merge_exec() merges the
+.exec files themselves with jacococli.
+
+Usage:
+    python jacoco_report.py REPORT.xml|REPORT.csv [--level total|package|class|method]
+    python jacoco_report.py --merge REPORT.xml REPORT.xml ...
+"""
+
+import argparse
+import csv
+import subprocess
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from focal_coverage import popcount
+
+COUNTER_TYPES = ("INSTRUCTION", "BRANCH", "LINE", "COMPLEXITY", "METHOD", "CLASS")
+LEVELS = ("total", "package", "class", "method")
+
+
+@dataclass
+class Counter:
+    missed: int = 0
+    covered: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.missed + self.covered
+
+    @property
+    def ratio(self) -> float:
+        return self.covered / self.total if self.total else 0.0
+
+    def add(self, other: "Counter") -> None:
+        self.missed += other.missed
+        self.covered += other.covered
+
+
+@dataclass
+class CoverageRecord:
+    level: str                          # total | package | class | method
+    package: str = ""
+    class_name: str = ""
+    method: str = ""                    # name + descriptor
+    source_file: str = ""
+    line: Optional[int] = None          # first line of a method
+    counters: Dict[str, Counter] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        if self.level == "method":
+            return f"{self.class_name}.{self.method}"
+        return self.class_name or self.package or "total"
+
+    def counter(self, kind: str) -> Counter:
+        return self.counters.get(kind, Counter())
+
+
+def _counters(elem: ET.Element) -> Dict[str, Counter]:
+    """The <counter> children of one element (not those of nested elements)."""
+    return {c.get("type"): Counter(int(c.get("missed", 0)), int(c.get("covered", 0)))
+            for c in elem if c.tag == "counter"}
+
+
+def iter_xml(path: str, levels: Iterable[str] = LEVELS) -> Iterator[CoverageRecord]:
+    """Records of a jacoco.xml, innermost first (methods, then their class, ...), in one pass."""
+    wanted = set(levels)
+    package = class_name = source_file = ""
+    stack: List[ET.Element] = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            stack.append(elem)
+            if tag == "package":
+                package = elem.get("name", "")
+            elif tag == "class":
+                class_name = elem.get("name", "")
+                source_file = elem.get("sourcefilename", "")
+            continue
+        stack.pop()
+        if tag == "method":
+            if "method" in wanted:
+                line = elem.get("line")
+                yield CoverageRecord("method", package, class_name, elem.get("name", "") + elem.get("desc", ""),
+                                     source_file, int(line) if line else None, _counters(elem))
+        elif tag == "class":
+            if "class" in wanted:
+                yield CoverageRecord("class", package, class_name, source_file=source_file,
+                                     counters=_counters(elem))
+        elif tag == "package":
+            if "package" in wanted:
+                yield CoverageRecord("package", package, counters=_counters(elem))
+        elif tag == "report":
+            if "total" in wanted:
+                yield CoverageRecord("total", counters=_counters(elem))
+        else:
+            continue
+        # Everything below a finished method/class/package/report has been read
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+
+def iter_csv(path: str, levels: Iterable[str] = LEVELS) -> Iterator[CoverageRecord]:
+    """Records of a jacoco.csv: one per class, then per package and the total (no methods in CSV)."""
+    wanted = set(levels)
+    packages: Dict[str, Dict[str, Counter]] = {}
+    total = {kind: Counter() for kind in COUNTER_TYPES if kind != "CLASS"}
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            counters = {kind: Counter(int(row[f"{kind}_MISSED"]), int(row[f"{kind}_COVERED"]))
+                        for kind in COUNTER_TYPES if f"{kind}_MISSED" in row}
+            counters["CLASS"] = Counter(0, 1) if counters.get("METHOD", Counter()).covered else Counter(1, 0)
+            package = row["PACKAGE"].replace(".", "/")
+            class_name = f"{package}/{row['CLASS']}" if package else row["CLASS"]
+            if "class" in wanted:
+                yield CoverageRecord("class", package, class_name, counters=counters)
+            package_totals = packages.setdefault(package, {kind: Counter() for kind in counters})
+            for kind, counter in counters.items():
+                package_totals[kind].add(counter)
+                total.setdefault(kind, Counter()).add(counter)
+    if "package" in wanted:
+        for package, counters in packages.items():
+            yield CoverageRecord("package", package, counters=counters)
+    if "total" in wanted:
+        yield CoverageRecord("total", counters=total)
+
+
+def iter_records(path: str, levels: Iterable[str] = LEVELS) -> Iterator[CoverageRecord]:
+    return iter_csv(path, levels) if path.endswith(".csv") else iter_xml(path, levels)
+
+
+def read_totals(path: str) -> CoverageRecord:
+    """The report-wide counters of an XML or CSV report."""
+    for record in iter_records(path, levels=("total",)):
+        return record
+    raise ValueError(f"no report totals in {path}")
+
+
+@dataclass
+class LineCoverage:
+    """Line bitmaps of one source file (bit N <=> line N)."""
+    lines: int = 0
+    covered: int = 0
+
+
+def merge_line_coverage(paths: Iterable[str]) -> Dict[Tuple[str, str], LineCoverage]:
+    """
+    Union of the <sourcefile>/<line> data of several XML reports, keyed by
+    (package, source file). A line counts if it has instructions in any report
+    and is covered if any report covered one of its instructions.
+    """
+    merged: Dict[Tuple[str, str], LineCoverage] = {}
+    for path in paths:
+        package = ""
+        current: Optional[LineCoverage] = None
+        for event, elem in ET.iterparse(path, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "package":
+                    package = elem.get("name", "")
+                elif elem.tag == "sourcefile":
+                    current = merged.setdefault((package, elem.get("name", "")), LineCoverage())
+                continue
+            if elem.tag == "line" and current is not None:
+                bit = 1 << int(elem.get("nr", 0))
+                if int(elem.get("mi", 0)) + int(elem.get("ci", 0)):
+                    current.lines |= bit
+                if int(elem.get("ci", 0)):
+                    current.covered |= bit
+            elif elem.tag == "sourcefile":
+                current = None
+                elem.clear()
+            elif elem.tag == "package":
+                elem.clear()
+    return merged
+
+
+def merged_line_counter(paths: Iterable[str]) -> Counter:
+    total = covered = 0
+    for cov in merge_line_coverage(paths).values():
+        total += popcount(cov.lines)
+        covered += popcount(cov.covered)
+    return Counter(total - covered, covered)
+
+
+def merge_exec(exec_files: List[str], destfile: str, jacococli: str, java: str = "java") -> None:
+    """Merge .exec files with `jacococli merge` (raises CalledProcessError on failure)."""
+    subprocess.run([java, "-jar", jacococli, "merge"] + list(exec_files) + ["--destfile", destfile],
+                   check=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+
+def print_line_summary(counter: Counter) -> None:
+    """The lines interpret_jacoco.py has always printed (read by Parser.java_output_parser)."""
+    print("============================")
+    print(f"Total lines {counter.total}")
+    print(f"Missed Lines {counter.missed}")
+    print(f"Line Coverages are {round(counter.ratio * 100, 2)}%")
+    print("============================")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Read JaCoCo XML/CSV reports (streaming).")
+    ap.add_argument("reports", nargs="+")
+    ap.add_argument("--level", choices=LEVELS, default="total")
+    ap.add_argument("--merge", action="store_true", help="Union the line coverage of several XML reports.")
+    args = ap.parse_args()
+
+    if args.merge or len(args.reports) > 1:
+        print_line_summary(merged_line_counter(args.reports))
+        return
+    for record in iter_records(args.reports[0], levels=(args.level,)):
+        line, branch = record.counter("LINE"), record.counter("BRANCH")
+        print(f"{record.name}\tlines {line.covered}/{line.total} ({line.ratio * 100:.2f}%)"
+              f"\tbranches {branch.covered}/{branch.total} ({branch.ratio * 100:.2f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Batched javac compilation of generated Java tests with per-file diagnostics.
+
+java_coverage.bash used to start one javac JVM per test file (`parallel -j
+64 javac ...`), each resolving the whole classpath again, and validity was
+"a .class file appeared". Here all files go to javac in a few batches
+(an @argfile per batch) and every diagnostic is attributed to its source
+file:
+
+  1. files declaring the same class (same package and file name, e.g. the
+     same test in two folders) go to different batches, so each still
+     compiles on its own as it did with one javac per file;
+  2. a batch that fails is compiled again without the files that had
+     errors (javac stops at the first phase with errors, so a later round
+     can surface errors of files that looked clean), until it succeeds;
+  3. if a failing round names no file of the batch (classpath trouble, an
+     error in an implicitly compiled source), the rest of the batch falls
+     back to one javac per file, in parallel.
+
+Class files land in the output directory as before, so java_passrate.bash
+and the JaCoCo run are unchanged; per-file results and diagnostics are
+written as JSON.
+
+Usage:
+    python java_compile_service.py --classpath CP --output-dir DIR [--report compile_report.json]
+        [--jobs N] (--test-dir DIR | FILE ...)
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+MAX_ROUNDS = 4
+DEFAULT_TIMEOUT_SECONDS = 600
+
+_DIAGNOSTIC = re.compile(r"^(?P<file>.+\.java):(?P<line>\d+): (?P<kind>error|warning): (?P<message>.*)$")
+_PACKAGE = re.compile(r"^\s*package\s+([\w.]+)\s*;", re.MULTILINE)
+
+
+@dataclass
+class JavaDiagnostic:
+    file: str
+    line: int
+    kind: str                 # error | warning
+    message: str
+    detail: str = ""          # source line, caret and symbol/location lines javac prints below
+
+
+@dataclass
+class CompileResult:
+    source: str
+    ok: bool
+    diagnostics: List[JavaDiagnostic] = field(default_factory=list)
+    batch: int = 0            # javac invocation that decided the outcome
+
+
+def parse_diagnostics(output: str) -> List[JavaDiagnostic]:
+    diagnostics: List[JavaDiagnostic] = []
+    for line in output.splitlines():
+        m = _DIAGNOSTIC.match(line)
+        if m:
+            diagnostics.append(JavaDiagnostic(os.path.realpath(m["file"]), int(m["line"]), m["kind"], m["message"]))
+        elif diagnostics and not re.match(r"^\d+ (errors?|warnings?)$", line):
+            diagnostics[-1].detail += line + "\n"
+    return diagnostics
+
+
+def class_key(source: str) -> str:
+    """Fully qualified name of the public class a test file declares (package + file name)."""
+    try:
+        with open(source, "r", encoding="utf-8", errors="replace") as f:
+            m = _PACKAGE.search(f.read())
+    except OSError:
+        m = None
+    name = os.path.basename(source)[:-len(".java")]
+    return f"{m.group(1)}.{name}" if m else name
+
+
+def split_duplicates(sources: Sequence[str]) -> List[List[str]]:
+    """Batches in which every class is declared at most once (the k-th copy goes to batch k)."""
+    batches: List[List[str]] = []
+    seen: Dict[str, int] = {}
+    for source in sources:
+        key = class_key(source)
+        index = seen.get(key, 0)
+        seen[key] = index + 1
+        while len(batches) <= index:
+            batches.append([])
+        batches[index].append(source)
+    return batches
+
+
+class JavacService:
+    """Compiles many source files with as few javac runs as diagnostics allow."""
+
+    def __init__(self, classpath: str, output_dir: str, javac: str = "javac", jobs: Optional[int] = None,
+                 extra_args: Sequence[str] = (), timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        self.classpath = classpath
+        self.output_dir = output_dir
+        self.javac = javac
+        self.jobs = jobs or os.cpu_count() or 4
+        self.extra_args = list(extra_args)
+        self.timeout = timeout
+        self.invocations = 0
+
+    def _run(self, sources: Sequence[str]) -> Tuple[int, str]:
+        self.invocations += 1
+        fd, argfile = tempfile.mkstemp(prefix="javac-", suffix=".args")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                # Quoted: @argfile entries are whitespace-separated
+                f.write("\n".join('"' + s.replace("\\", "\\\\").replace('"', '\\"') + '"' for s in sources))
+            cmd = [self.javac, "-d", self.output_dir, "-cp", self.classpath, "-encoding", "UTF-8",
+                   "-Xmaxerrs", "100000"] + self.extra_args + [f"@{argfile}"]
+            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                  errors="replace", timeout=self.timeout)
+            return proc.returncode, proc.stdout
+        except subprocess.TimeoutExpired:
+            return 124, f"javac timed out after {self.timeout}s"
+        finally:
+            os.remove(argfile)
+
+    def compile(self, sources: Sequence[str]) -> Dict[str, CompileResult]:
+        os.makedirs(self.output_dir, exist_ok=True)
+        results: Dict[str, CompileResult] = {}
+        for batch in split_duplicates([os.path.realpath(s) for s in sources]):
+            self._compile_batch(batch, results)
+        return results
+
+    def _compile_batch(self, batch: List[str], results: Dict[str, CompileResult]) -> None:
+        pending = list(batch)
+        for _ in range(MAX_ROUNDS):
+            code, output = self._run(pending)
+            by_file: Dict[str, List[JavaDiagnostic]] = {}
+            for diagnostic in parse_diagnostics(output):
+                by_file.setdefault(diagnostic.file, []).append(diagnostic)
+            if code == 0:
+                for source in pending:
+                    results[source] = CompileResult(source, True, by_file.get(source, []), self.invocations)
+                return
+            failed = {s for s in pending if any(d.kind == "error" for d in by_file.get(s, []))}
+            if not failed:
+                break
+            for source in failed:
+                results[source] = CompileResult(source, False, by_file[source], self.invocations)
+            pending = [s for s in pending if s not in failed]
+            if not pending:
+                return
+
+        # The failure cannot be attributed from the batch output: one javac per file
+        with ThreadPoolExecutor(max_workers=self.jobs) as ex:
+            outcomes = list(ex.map(lambda s: self._run([s]), pending))
+        for source, (code, output) in zip(pending, outcomes):
+            diagnostics = [d for d in parse_diagnostics(output) if d.file == source] or (
+                [JavaDiagnostic(source, 0, "error", output.strip().splitlines()[-1])]
+                if code != 0 and output.strip() else [])
+            results[source] = CompileResult(source, code == 0, diagnostics, self.invocations)
+
+
+def find_sources(test_dir: str) -> List[str]:
+    found = []
+    for root, _, files in os.walk(test_dir):
+        found.extend(os.path.join(root, f) for f in files if f.endswith(".java"))
+    return sorted(found)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Compile generated Java tests in batches with per-file diagnostics.")
+    ap.add_argument("--classpath", required=True)
+    ap.add_argument("--output-dir", required=True)
+    ap.add_argument("--report", default=None, help="Write per-file results as JSON.")
+    ap.add_argument("--jobs", type=int, default=None, help="Parallel javac runs in the per-file fallback.")
+    ap.add_argument("--javac", default="javac")
+    ap.add_argument("--test-dir", default=None, help="Compile every .java file under this directory.")
+    ap.add_argument("sources", nargs="*")
+    args = ap.parse_args()
+
+    sources = list(args.sources) + (find_sources(args.test_dir) if args.test_dir else [])
+    service = JavacService(args.classpath, args.output_dir, javac=args.javac, jobs=args.jobs)
+    results = service.compile(sources)
+    ordered = [results[os.path.realpath(s)] for s in sources]
+    for r in ordered:
+        if not r.ok:
+            first = next((d for d in r.diagnostics if d.kind == "error"), None)
+            print(f"✗ {os.path.basename(r.source)}: "
+                  + (f"line {first.line}: {first.message}" if first else "compilation failed"))
+    passed = sum(1 for r in ordered if r.ok)
+    print(f"Compiled {passed}/{len(ordered)} test files with {service.invocations} javac runs")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in ordered], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -42,7 +42,7 @@ COVERAGE_FILE="${REPORT_DIR}/coverage.exec"  # Name of the coverage file to stor
 
 # Step 1: Compile the test files in parallel
 echo "Running Command : javac -cp $CLASSPATH $TEST_FILES"
-echo "Compiling test files in parallel with GNU parallel..."
+echo "Compiling test files in batches with java_compile_service.py..."
 
 # Create the output directory if it doesn't exist, or clear it if it does
 rm -rf "$OUTPUT_DIR"
@@ -50,8 +50,9 @@ rm -rf "$REPORT_DIR"
 mkdir -p "$OUTPUT_DIR"
 mkdir -p "$REPORT_DIR"
 
-# Use GNU parallel to compile the files in parallel
-echo "$TEST_FILES" | tr ' ' '\n' | parallel -j 64 javac -cp "$CLASSPATH:$DEPENDENCY_LIBS" -d "$OUTPUT_DIR" {}
+# Compile all test files in a few javac runs; per-file diagnostics go to compile_report.json
+python3 /LSPRAG/scripts/java_compile_service.py --classpath "$CLASSPATH:$DEPENDENCY_LIBS" --output-dir "$OUTPUT_DIR" \
+    --report "${REPORT_DIR}/compile_report.json" --jobs 64 --test-dir "$TEST_DIR"
 
 # echo "Compilation completed for all files."
 
@@ -80,12 +81,16 @@ echo "Number of valid class files in target: $(find "$COMPILED_SOURCE" -name "*.
 # echo "Number of test files: $(find "$OUTPUT_DIR" -name "*.class" | wc -l)"
 
 # Use the JaCoCo CLI tool to generate the report
-java -jar $JACOCO_CLI_PATH report $COVERAGE_FILE --classfiles $COMPILED_SOURCE --html $REPORT_DIR
+java -jar $JACOCO_CLI_PATH report $COVERAGE_FILE --classfiles $COMPILED_SOURCE --html $REPORT_DIR --xml "${REPORT_DIR}/jacoco.xml"
 
 JacocoInterpretScript="/LSPRAG/scripts/interpret_jacoco.py"
 PassRateScript="/LSPRAG/scripts/java_passrate.bash "
 echo "Printing final result" 
-python3 $JacocoInterpretScript "${REPORT_DIR}/index.html"
+if [ -f "${REPORT_DIR}/jacoco.xml" ]; then
+    python3 $JacocoInterpretScript "${REPORT_DIR}/jacoco.xml"
+else
+    python3 $JacocoInterpretScript "${REPORT_DIR}/index.html"
+fi
 
 echo "Printing valid rate"
 bash $PassRateScript $TARGET_PROJECT_PATH $TEST_DIR
\ No newline at end of file
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Line coverage with sys.monitoring (PEP 669), a drop-in for `coverage run`.
+
+coverage.py's default tracer calls back on every executed line for the whole
+run, which is what pushes slow generated tests over the evaluator's timeout.
+Here a PY_START callback sees each code object once and turns on LINE
+events only for code in the --include roots; the LINE callback records a
+line and returns DISABLE. Every location costs at most one callback and then
+runs at full speed, and code outside the project is never line-instrumented.
+Lines are written as a regular coverage.py data file (CoverageData), so
+`coverage combine` / `coverage report` and focal_coverage.py read it as
+before; the line sets match coverage.py's for the included files.
+
+On interpreters without sys.monitoring (< 3.12) this execs
+`python -m coverage run` with the same arguments instead.
+
+Usage (with the interpreter the tests run under):
+    python monitoring_coverage.py --data-file FILE [--include DIR ...] -m pytest [pytest args]
+"""
+
+import argparse
+import os
+import runpy
+import sys
+from typing import Dict, List, Optional, Set
+
+
+class LineCollector:
+    """Records the first execution of every line in the included files."""
+
+    TOOL_NAME = "lsprag-line-coverage"
+
+    def __init__(self, include: List[str]):
+        self.include = [os.path.join(os.path.realpath(root), "") for root in include]
+        self.lines: Dict[str, Set[int]] = {}
+        # co_filename -> the set lines go to, or None for files that are not measured
+        self._targets: Dict[str, Optional[Set[int]]] = {}
+        self.tool_id = sys.monitoring.COVERAGE_ID
+
+    def _target(self, co_filename: str) -> Optional[Set[int]]:
+        path = os.path.realpath(co_filename)
+        measured = co_filename[:1] != "<" and (
+            not self.include or any(path.startswith(root) for root in self.include))
+        target = self.lines.setdefault(path, set()) if measured else None
+        self._targets[co_filename] = target
+        return target
+
+    def _on_start(self, code, offset: int):
+        target = self._targets.get(code.co_filename, False)
+        if target is False:
+            target = self._target(code.co_filename)
+        if target is not None:
+            # Only code of measured files gets LINE instrumentation
+            sys.monitoring.set_local_events(self.tool_id, code, sys.monitoring.events.LINE)
+        return sys.monitoring.DISABLE
+
+    def _on_line(self, code, line: int):
+        self._targets[code.co_filename].add(line)
+        return sys.monitoring.DISABLE
+
+    def start(self) -> None:
+        mon = sys.monitoring
+        mon.use_tool_id(self.tool_id, self.TOOL_NAME)
+        mon.register_callback(self.tool_id, mon.events.PY_START, self._on_start)
+        mon.register_callback(self.tool_id, mon.events.LINE, self._on_line)
+        mon.set_events(self.tool_id, mon.events.PY_START)
+
+    def stop(self) -> None:
+        mon = sys.monitoring
+        mon.set_events(self.tool_id, mon.events.NO_EVENTS)
+        mon.register_callback(self.tool_id, mon.events.PY_START, None)
+        mon.register_callback(self.tool_id, mon.events.LINE, None)
+        mon.free_tool_id(self.tool_id)
+
+    def write(self, data_file: str) -> None:
+        from coverage import CoverageData
+
+        data = CoverageData(basename=data_file)
+        data.add_lines({path: sorted(lines) for path, lines in self.lines.items() if lines})
+        data.write()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Line coverage via sys.monitoring (falls back to coverage run).")
+    ap.add_argument("--data-file", required=True)
+    ap.add_argument("--include", action="append", default=[],
+                    help="Only measure files under this directory (repeatable; default: everything).")
+    ap.add_argument("-m", dest="module", required=True, help="Module to run, e.g. pytest.")
+    # Everything after `-m MODULE` belongs to the module (pytest's own -m, --data-file, ...)
+    argv = sys.argv[1:]
+    split = argv.index("-m") + 2 if "-m" in argv else len(argv)
+    args = ap.parse_args(argv[:split])
+    rest = argv[split:]
+
+    if not hasattr(sys, "monitoring"):
+        cmd = [sys.executable, "-m", "coverage", "run", f"--data-file={args.data_file}"]
+        if args.include:
+            cmd.append("--include=" + ",".join(os.path.join(os.path.realpath(r), "*") for r in args.include))
+        os.execv(sys.executable, cmd + ["-m", args.module] + rest)
+
+    if os.path.exists(args.data_file):
+        os.remove(args.data_file)
+    collector = LineCollector(args.include)
+    sys.argv = [args.module] + rest
+    # Like `python -m`: the working directory comes first on the import path
+    sys.path[0] = os.getcwd()
+    exit_code = 0
+    collector.start()
+    try:
+        runpy.run_module(args.module, run_name="__main__", alter_sys=True)
+    except SystemExit as e:
+        exit_code = e.code
+    finally:
+        collector.stop()
+        collector.write(args.data_file)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
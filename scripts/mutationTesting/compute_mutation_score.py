@@ -1,14 +1,29 @@
 #!/usr/bin/env python3
 import argparse
+import ast
+import hashlib
 import json
 import os
 import re
+import shlex
 import shutil
 import subprocess
 import sys
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+MUTPY_PRUNED_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mutpy_pruned.py")
+NATIVE_ENGINE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "native_mutation.py")
+
+# Shared readers live in scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from focal_coverage import bits_to_lines, read_coverage_py_data  # noqa: E402
+from kill_matrix import KillMatrix  # noqa: E402
+from test_file_map import TestFileMap, discover_test_files, normalize_test_name  # noqa: E402
+from resource_limits import (DEFAULT_TIMEOUT_FACTOR, DEFAULT_TIMEOUT_MARGIN, adaptive_timeout,  # noqa: E402
+                             limited_command)
+
 
 def detect_module_root(project_root: str) -> str:
     """Return module root for imports. Prefer <project_root>/src if it exists."""
@@ -111,6 +126,18 @@ def run_mutpy_for_test(
     if extra_args:
         cmd += extra_args
 
+    return _execute_mutpy(cmd, tests_dir, log_dir, test_module, report_path, timeout_sec)
+
+
+def _execute_mutpy(
+    cmd: List[str],
+    tests_dir: str,
+    log_dir: str,
+    log_name: str,
+    report_path: str,
+    timeout_sec: Optional[int],
+) -> Dict[str, Any]:
+    """Run a prepared MutPy command, write <log_name>.stdout.log and parse stdout + report."""
     env = os.environ.copy()
     try:
         proc = subprocess.run(
@@ -137,7 +164,7 @@ def run_mutpy_for_test(
         success = stats["score"] is not None
 
         # Always write raw stdout alongside the report for debugging
-        with open(os.path.join(log_dir, f"{test_module}.stdout.log"), "w") as f:
+        with open(os.path.join(log_dir, f"{log_name}.stdout.log"), "w") as f:
             f.write(out)
 
         return {
@@ -147,6 +174,7 @@ def run_mutpy_for_test(
             "report_path": report_path,
             "report": report,
             "exit_code": proc.returncode,
+            "cmd": cmd,
         }
     except subprocess.TimeoutExpired as e:
         out = getattr(e, "stdout", None)
@@ -158,7 +186,7 @@ def run_mutpy_for_test(
                 out = out.decode("utf-8", errors="replace")
             except Exception:
                 out = str(out)
-        with open(os.path.join(log_dir, f"{test_module}.stdout.log"), "w") as f:
+        with open(os.path.join(log_dir, f"{log_name}.stdout.log"), "w") as f:
             f.write(out)
             f.write("\n[timeout]\n")
         return {
@@ -168,17 +196,372 @@ def run_mutpy_for_test(
             "report_path": report_path,
             "report": None,
             "exit_code": 124,
+            "cmd": cmd,
         }
 
+def run_mutpy_for_module(
+    mutpy_cmd: List[str],
+    runner: str,
+    module_root: str,
+    project_root: str,
+    tests_dir: str,
+    target_module: str,
+    test_modules: List[str],
+    test_file_rel_paths: List[str],
+    log_dir: str,
+    extra_paths: Optional[List[str]] = None,
+    extra_args: Optional[List[str]] = None,
+    timeout_sec: Optional[int] = None,
+    group_timeout_sec: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Execute MutPy once for a target module against all of its mapped test modules.
+    The mutant set is generated and imported once instead of once per test; kills are
+    attributed to tests through the report's 'killer' field (see attribute_kills).
+    Returns the same dict as run_mutpy_for_test.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    log_name = f"{target_module}.group"
+    report_path = os.path.join(log_dir, f"{log_name}.report.txt")
+
+    module_root_src = os.path.join(module_root, "src")
+    cmd = list(mutpy_cmd) + ["--runner", runner]
+    if os.path.isdir(module_root_src):
+        cmd += ["--path", module_root_src]
+    cmd += ["--path", module_root]
+    cmd += ["--path", tests_dir]
+    # --unit-test takes a list (nargs='+'); repeating the flag would keep only the last test
+    cmd += ["--target", target_module, "--unit-test"] + list(test_modules)
+    cmd += ["--report", report_path]
+
+    seen_parents = set()
+    for rel in test_file_rel_paths:
+        test_parent_dir = os.path.dirname(rel)
+        if test_parent_dir and test_parent_dir != "." and test_parent_dir not in seen_parents:
+            seen_parents.add(test_parent_dir)
+            parent_path = os.path.join(tests_dir, test_parent_dir)
+            if os.path.isdir(parent_path):
+                cmd += ["--path", parent_path]
+
+    print(cmd)
+    if project_root != module_root:
+        cmd += ["--path", project_root]
+    if extra_paths:
+        for p in extra_paths:
+            cmd += ["--path", p]
+
+    if extra_args:
+        cmd += extra_args
+
+    # The per-test budget applies to each test in the group unless a budget for the whole run is given
+    group_timeout = group_timeout_sec or (timeout_sec * max(1, len(test_modules)) if timeout_sec else None)
+    return _execute_mutpy(cmd, tests_dir, log_dir, log_name, report_path, group_timeout)
+
+
+def attribute_kills(mutants: List[Dict[str, Any]], test_modules: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Map each killed mutant of a grouped run to the test module named in its 'killer'
+    (pytest node ids like 'pkg/foo_123_test.py::test_x', unittest ids like
+    'test_x (foo_123_test.TestFoo)'). MutPy stops at the first failing test, so a
+    mutant is attributed to exactly one test even if others would kill it as well.
+    """
+    by_test: Dict[str, List[Dict[str, Any]]] = {tm: [] for tm in test_modules}
+    # Longest names first so 'foo_1_test' does not claim kills of 'foo_1_test_extra'
+    ordered = sorted(test_modules, key=len, reverse=True)
+    patterns = [
+        (tm, re.compile(r"(?:^|[\\/.(\s])" + re.escape(tm) + r"(?:\.py)?(?:$|[:.)\s])"))
+        for tm in ordered
+    ]
+    for m in mutants:
+        if (m.get("status") or "").lower() != "killed" or not m.get("killer"):
+            continue
+        for tm, pat in patterns:
+            if pat.search(m["killer"]):
+                by_test[tm].append(m)
+                break
+    return by_test
+
+
+def mutpy_python(mutpy_cmd: List[str]) -> str:
+    """Interpreter MutPy runs under: the command itself for 'python -m mutpy', else the mut.py shebang."""
+    if len(mutpy_cmd) >= 3 and mutpy_cmd[1:3] == ["-m", "mutpy"]:
+        return mutpy_cmd[0]
+    try:
+        with open(mutpy_cmd[0], "r") as f:
+            first = f.readline()
+    except (OSError, UnicodeDecodeError):
+        return sys.executable
+    if first.startswith("#!"):
+        parts = shlex.split(first[2:])
+        if parts and os.path.basename(parts[0]) == "env" and len(parts) > 1:
+            return shutil.which(parts[1]) or sys.executable
+        if parts:
+            return parts[0]
+    return sys.executable
+
+
+def import_roots(module_root: str, project_root: str, tests_dir: str, test_file_rel_paths: List[str]) -> List[str]:
+    """The import roots the MutPy commands add with --path, in the same order."""
+    roots = []
+    module_root_src = os.path.join(module_root, "src")
+    if os.path.isdir(module_root_src):
+        roots.append(module_root_src)
+    roots += [module_root, tests_dir]
+    for rel in test_file_rel_paths:
+        parent = os.path.dirname(rel)
+        if parent and parent != "." and os.path.isdir(os.path.join(tests_dir, parent)):
+            roots.append(os.path.join(tests_dir, parent))
+    if project_root != module_root:
+        roots.append(project_root)
+    seen = set()
+    return [r for r in roots if not (r in seen or seen.add(r))]
+
+
+def coverage_prepass(
+    python: str,
+    roots: List[str],
+    tests_dir: str,
+    test_file_rel_paths: List[str],
+    source_file: str,
+    data_file: str,
+    timeout_sec: Optional[int] = None,
+) -> Optional[List[int]]:
+    """
+    Run the tests once under coverage.py and return the executed lines of source_file
+    (None if the run produced no data or no record of source_file, [] if it was measured
+    and nothing ran). Failing tests still count: MutPy would refuse to mutate against
+    them anyway, and their coverage is what they execute.
+    """
+    # coverage.py records real paths, so a project reached through a symlink must be looked up by one
+    source_file = os.path.realpath(source_file)
+    if os.path.exists(data_file):
+        os.remove(data_file)
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(roots + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    cmd = [python, "-m", "coverage", "run", f"--data-file={data_file}", f"--include={source_file}",
+           "-m", "pytest", "-q", "-p", "no:cacheprovider"]
+    cmd += [os.path.join(tests_dir, rel) for rel in test_file_rel_paths]
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env,
+                       cwd=tests_dir, timeout=timeout_sec, check=False)
+    except subprocess.TimeoutExpired:
+        return None
+    if not os.path.exists(data_file):
+        return None
+    coverage = read_coverage_py_data(data_file, os.path.dirname(source_file))
+    file_cov = coverage.get(os.path.basename(source_file))
+    return bits_to_lines(file_cov.covered) if file_cov is not None else None
+
+
+# "5 passed in 0.42s" / "==== 5 passed in 61.20s (0:01:01) ====" (pytest's final summary line)
+PYTEST_DURATION = re.compile(r"\bin (\d+(?:\.\d+)?)s\b")
+
+
+def measure_baseline(
+    python: str,
+    roots: List[str],
+    tests_dir: str,
+    test_file_rel_paths: List[str],
+    timeout_sec: Optional[int] = None,
+) -> Optional[float]:
+    """
+    Seconds the unmutated tests take inside the pytest session (its "passed in X.XXs"
+    summary), which is what a mutant run repeats; interpreter startup and imports are
+    left out. Falls back to the wall-clock time if there is no summary line. None if
+    the tests fail or time out.
+    """
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(roots + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    cmd = [python, "-m", "pytest", "-q", "-p", "no:cacheprovider"]
+    cmd += [os.path.join(tests_dir, rel) for rel in test_file_rel_paths]
+    start = time.monotonic()
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, text=True,
+                              errors="replace", cwd=tests_dir, timeout=timeout_sec, check=False)
+    except subprocess.TimeoutExpired:
+        return None
+    if proc.returncode != 0:
+        return None
+    summary = PYTEST_DURATION.findall(proc.stdout)
+    return float(summary[-1]) if summary else time.monotonic() - start
+
+
+# pytest -rfE short summary: "FAILED dir/foo_test.py::test_x - AssertionError", "ERROR dir/foo_test.py"
+_PYTEST_FAILURE = re.compile(r"^(?:FAILED|ERROR) ([^\s:]+)")
+
+
+def failing_test_files(
+    python: str,
+    roots: List[str],
+    tests_dir: str,
+    test_file_rel_paths: List[str],
+    timeout_sec: Optional[int] = None,
+) -> Optional[List[str]]:
+    """
+    The test files (of test_file_rel_paths) with a failing test or a collection error on
+    the unmutated code, from one pytest run over all of them. MutPy and the native engine
+    refuse a --unit-test list in which any test fails, so these are left out of a grouped
+    run. None if the run timed out or failed without naming any of the files.
+    """
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(roots + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    cmd = [python, "-m", "pytest", "-q", "-rfE", "--continue-on-collection-errors", "-p", "no:cacheprovider"]
+    cmd += [os.path.join(tests_dir, rel) for rel in test_file_rel_paths]
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env, text=True,
+                              errors="replace", cwd=tests_dir, timeout=timeout_sec, check=False)
+    except subprocess.TimeoutExpired:
+        return None
+    if proc.returncode == 0:
+        return []
+    by_name = {os.path.basename(rel): rel for rel in test_file_rel_paths}
+    failing = set()
+    for line in proc.stdout.splitlines():
+        m = _PYTEST_FAILURE.match(line)
+        if m and os.path.basename(m.group(1)) in by_name:
+            failing.add(by_name[os.path.basename(m.group(1))])
+    return [rel for rel in test_file_rel_paths if rel in failing] or None
+
+
+def count_mutants(source_file: str) -> int:
+    """Number of standard-operator mutants of a module (native engine rules, close to MutPy's count)."""
+    from native_mutation import STANDARD_OPERATORS, generate_mutations
+    try:
+        with open(source_file, "r") as f:
+            tree = ast.parse(f.read(), source_file)
+    except (OSError, SyntaxError, ValueError):
+        return 0
+    return len(generate_mutations(tree, STANDARD_OPERATORS))
+
+
+def adaptive_run_settings(
+    native: bool,
+    baseline: float,
+    n_mutants: int,
+    timeout_sec: Optional[int],
+    factor: float = DEFAULT_TIMEOUT_FACTOR,
+    margin: float = DEFAULT_TIMEOUT_MARGIN,
+) -> Tuple[List[str], float]:
+    """
+    Engine arguments giving every mutant factor x baseline + margin seconds, and the
+    budget for the whole run: startup plus the worst case of every mutant timing out.
+    MutPy only takes a factor of max(its own baseline, 1s), so the factor is rescaled.
+    """
+    per_mutant = adaptive_timeout(baseline, factor, margin)
+    if native:
+        args = ["--timeout-factor", str(factor), "--timeout-margin", str(margin)]
+    else:
+        args = ["--timeout-factor", f"{per_mutant / max(baseline, 1.0):.3f}"]
+    return args, (timeout_sec or 0) + baseline + n_mutants * per_mutant
+
+
+def prepare_pruned_run(
+    mutpy_cmd: List[str],
+    module_root: str,
+    project_root: str,
+    tests_dir: str,
+    test_file_rel_paths: List[str],
+    source_file: str,
+    log_dir: str,
+    log_name: str,
+    timeout_sec: Optional[int] = None,
+) -> Tuple[List[str], Optional[str]]:
+    """
+    Coverage pre-pass for one MutPy run. Returns the command to run instead of mutpy_cmd
+    (mutpy_pruned.py, which skips mutants on lines the tests never execute) and the file it
+    writes the skipped mutants to. Falls back to (mutpy_cmd, None) if coverage is unavailable.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    native = NATIVE_ENGINE_SCRIPT in mutpy_cmd
+    python = mutpy_cmd[0] if native else mutpy_python(mutpy_cmd)
+    roots = import_roots(module_root, project_root, tests_dir, test_file_rel_paths)
+    covered = coverage_prepass(python, roots, tests_dir, test_file_rel_paths, source_file,
+                               os.path.join(log_dir, f"{log_name}.coverage"), timeout_sec)
+    if covered is None:
+        print(f"[warn] coverage pre-pass recorded nothing for {source_file} ({log_name}); running all mutants")
+        return mutpy_cmd, None
+    covered_path = os.path.join(log_dir, f"{log_name}.covered.json")
+    with open(covered_path, "w") as f:
+        json.dump({os.path.realpath(source_file): covered}, f)
+    not_covered_path = os.path.join(log_dir, f"{log_name}.not_covered.json")
+    if os.path.exists(not_covered_path):
+        os.remove(not_covered_path)
+    # The native engine filters mutants itself; MutPy goes through the mutpy_pruned.py wrapper
+    prefix = list(mutpy_cmd) if native else [python, MUTPY_PRUNED_SCRIPT]
+    cmd = prefix + ["--covered-lines", covered_path, "--not-covered-out", not_covered_path]
+    return cmd, not_covered_path
+
+
+def read_not_covered(path: Optional[str]) -> Optional[List[tuple]]:
+    """Signatures (module, operator, lineno) mutpy_pruned.py skipped; None if unavailable."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return [tuple(sid) for sid in json.load(f)]
+
+
+MANIFEST_NAME = "manifest.json"
+
+
+def run_key(files: List[str], config: List[Any]) -> str:
+    """Content hash of one MutPy run: its test files, the target source and the MutPy configuration."""
+    h = hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8"))
+    for path in files:
+        h.update(b"\0" + os.path.basename(path).encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def load_manifest(log_dir: str) -> Dict[str, Dict[str, Any]]:
+    path = os.path.join(log_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        print(f"[warn] unreadable manifest {path}; running everything")
+        return {}
+
+
+def save_manifest(log_dir: str, manifest: Dict[str, Dict[str, Any]]) -> None:
+    # Written after every finished run, so an interrupted evaluation keeps its progress
+    path = os.path.join(log_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def reuse_result(entry: Optional[Dict[str, Any]], key: str, report_path: str) -> Optional[Dict[str, Any]]:
+    """Rebuild a run result from its manifest entry and stored report; None if it must be re-run."""
+    if not entry or entry.get("key") != key or not os.path.exists(report_path):
+        return None
+    report = parse_mutpy_report(report_path)
+    if not report["mutants"] and entry["stats"].get("total"):
+        return None
+    not_covered = entry.get("not_covered")
+    return {
+        "success": True,
+        "stdout": "",
+        "stats": entry["stats"],
+        "report_path": report_path,
+        "report": report,
+        "exit_code": entry.get("exit_code", 0),
+        "not_covered": [tuple(sid) for sid in not_covered] if not_covered is not None else None,
+        "reused": True,
+    }
+
+
 def to_abs(path: str) -> str:
     return os.path.abspath(path)
 
 
-def load_test_file_mapping(mapping_file: str) -> Dict[str, Dict[str, Any]]:
-    """Load the test file mapping from JSON file."""
+def load_test_file_mapping(mapping_file: str) -> TestFileMap:
+    """Load the test file mapping from JSON file (indexed by normalized test name)."""
     try:
-        with open(mapping_file, 'r') as f:
-            return json.load(f)
+        return TestFileMap.load(mapping_file)
     except FileNotFoundError:
         raise SystemExit(f"Mapping file not found: {mapping_file}")
     except json.JSONDecodeError as e:
@@ -187,36 +570,20 @@ def load_test_file_mapping(mapping_file: str) -> Dict[str, Dict[str, Any]]:
 
 def remove_random_numbers(filename: str) -> str:
     """Remove random numbers from test filename for matching."""
-    # Remove .py extension first
-    name = filename
-    if name.endswith('.py'):
-        name = name[:-3]
-    
-    # Remove random numbers (sequences of digits)
-    # Pattern matches digits that are likely random numbers
-    cleaned = re.sub(r'_\d+', '', name)
-    return cleaned
+    return normalize_test_name(filename)
 
 
-def find_matching_test_in_mapping(test_filename: str, mapping: Dict[str, Dict[str, Any]]) -> Optional[str]:
+def find_matching_test_in_mapping(test_filename: str, mapping: TestFileMap) -> Optional[str]:
     """Find matching test entry in mapping by removing random numbers."""
-    cleaned_name = remove_random_numbers(test_filename)
-    
-    # Find all potential matches
-    matches = []
-    for key in mapping.keys():
-        cleaned_key = remove_random_numbers(key)
-        if cleaned_key == cleaned_name:
-            matches.append(key)
-    
-    # Return first match if any exist
-    return matches[0] if matches else None
+    if not isinstance(mapping, TestFileMap):
+        mapping = TestFileMap(mapping)
+    return mapping.key_for(test_filename)
 
 
 def get_source_files_from_test_directory(
     project_root: str, 
     test_dir: str, 
-    mapping: Dict[str, Dict[str, Any]]
+    mapping: TestFileMap
 ) -> List[str]:
     """Get source files corresponding to test files in the given directory."""
     source_files = []
@@ -224,13 +591,11 @@ def get_source_files_from_test_directory(
     
     if not os.path.isdir(test_dir_abs):
         raise SystemExit(f"Test directory not found: {test_dir_abs}")
-    
+    if not isinstance(mapping, TestFileMap):
+        mapping = TestFileMap(mapping)
+
     # Recursively find Python test files
-    test_files = []
-    for dirpath, _, filenames in os.walk(test_dir_abs):
-        for filename in filenames:
-            if filename.endswith('.py') and (filename.startswith('test_') or filename.endswith('_test.py')):
-                test_files.append(os.path.join(dirpath, filename))
+    test_files = discover_test_files(test_dir_abs)
     
     if not test_files:
         raise SystemExit(f"No test files found in directory: {test_dir_abs}")
@@ -240,10 +605,9 @@ def get_source_files_from_test_directory(
     # Match each test file with mapping entries
     matched_count = 0
     for test_file in test_files:
-        matching_key = find_matching_test_in_mapping(os.path.basename(test_file), mapping)
+        file_info = mapping.lookup(test_file)
         
-        if matching_key:
-            file_info = mapping[matching_key]
+        if file_info:
             source_file = file_info['file_name']
             
             # Convert to absolute path
@@ -395,7 +759,7 @@ def parse_mutpy_report(report_path: str) -> Dict[str, Any]:
     """
     Parse MutPy report text to extract:
       - score: float or None
-      - mutants: list of {module, operator, lineno (int|None), status}
+      - mutants: list of {module, operator, lineno (int|None), status, killer (str|None)}
       - killed: int (count of 'killed')
       - total: int (eligible mutants, excludes 'incompetent')
     """
@@ -429,6 +793,7 @@ def parse_mutpy_report(report_path: str) -> Dict[str, Any]:
             "operator": cur.get("operator"),
             "lineno": cur.get("lineno"),
             "status": cur.get("status"),
+            "killer": cur.get("killer"),
         })
 
     cur: Dict[str, Any] = {}
@@ -449,7 +814,7 @@ def parse_mutpy_report(report_path: str) -> Dict[str, Any]:
         # new mutation block starts
         if re.match(r"^\s*-\s+exception_traceback:", line):
             finalize(cur)
-            cur = {"module": last_explicit_module, "operator": None, "lineno": None, "status": None}
+            cur = {"module": last_explicit_module, "operator": None, "lineno": None, "status": None, "killer": None}
             in_mutations_block = False
             continue
 
@@ -481,6 +846,14 @@ def parse_mutpy_report(report_path: str) -> Dict[str, Any]:
             cur["status"] = m.group(1)
             continue
 
+        # name of the first test that killed the mutant ('null' when none did)
+        m = re.search(r"^\s*killer:\s*(.*?)\s*$", line)
+        if m:
+            killer = m.group(1).strip("'\"")
+            cur["killer"] = killer if killer and killer not in ("null", "~") else None
+            in_mutations_block = False
+            continue
+
     finalize(cur)
 
     # compute counts
@@ -495,6 +868,10 @@ def parse_mutpy_report(report_path: str) -> Dict[str, Any]:
         "total": len(eligible),
     }
 
+def _ratio(killed: int, total: int) -> float:
+    return killed / total * 100.0 if total > 0 else 0.0
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(
         description="Compute mutation score(s) using MutPy per-test with mapping and merge."
@@ -522,7 +899,23 @@ def main() -> None:
         "--timeout-sec",
         type=int,
         default=60,
-        help="Timeout (seconds) for each MutPy per-test run.",
+        help="Timeout (seconds) for each MutPy per-test run (with --adaptive-timeouts: startup allowance).",
+    )
+    ap.add_argument(
+        "--adaptive-timeouts",
+        action="store_true",
+        help="Measure each test's unmutated runtime once; every mutant gets timeout-factor x runtime + "
+             "timeout-margin and the whole run a budget for all mutants instead of a fixed --timeout-sec.",
+    )
+    ap.add_argument("--timeout-factor", type=float, default=DEFAULT_TIMEOUT_FACTOR,
+                    help="Per-mutant timeout factor (with --adaptive-timeouts).")
+    ap.add_argument("--timeout-margin", type=float, default=DEFAULT_TIMEOUT_MARGIN,
+                    help="Seconds added to each per-mutant timeout (with --adaptive-timeouts).")
+    ap.add_argument(
+        "--memory-limit-mb",
+        type=int,
+        default=None,
+        help="Address-space limit (rlimit) for the MutPy process, or for each mutant with --engine native.",
     )
     ap.add_argument(
         "--test-mapping",
@@ -544,6 +937,41 @@ def main() -> None:
         default=None,
         help="Directory to write per-test reports/logs (default: <project-root>/mutation_logs).",
     )
+    ap.add_argument(
+        "--group-by-module",
+        action="store_true",
+        help="Run MutPy once per target module with all of its mapped tests instead of once per test. "
+             "Tests failing on the unmutated module are reported as failed and left out; per-test "
+             "killed counts are lower bounds.",
+    )
+    ap.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse reports in --log-dir whose test file(s), target source and MutPy arguments are "
+             f"unchanged (tracked in {MANIFEST_NAME}); only changed or missing runs are executed.",
+    )
+    ap.add_argument(
+        "--store",
+        default=None,
+        help="SQLite kill matrix (see kill_matrix.py); every mutant x test outcome of this run is appended.",
+    )
+    ap.add_argument(
+        "--label",
+        default=None,
+        help="Label of this run in --store, e.g. the baseline name (default: the test directory).",
+    )
+    ap.add_argument(
+        "--engine",
+        default="mutpy",
+        choices=["mutpy", "native"],
+        help="'native' runs mutants with native_mutation.py (fork server, same report schema) instead of MutPy.",
+    )
+    ap.add_argument(
+        "--prune-uncovered",
+        action="store_true",
+        help="Run each test once under coverage.py first; mutants on lines it never executes are "
+             "skipped and reported separately as 'not covered' instead of counting in the score.",
+    )
     ap.add_argument(
         "sources",
         nargs="*",
@@ -567,23 +995,20 @@ def main() -> None:
     os.makedirs(log_dir, exist_ok=True)
     mapping = load_test_file_mapping(args.test_mapping)
 
-    # Discover candidate test files in tests_dir
     # Discover candidate test files in tests_dir (recursive)
-    test_files: List[str] = []
-    for dirpath, _, filenames in os.walk(tests_dir):
-        for fn in filenames:
-            if fn.endswith(".py") and (fn.startswith("test_") or fn.endswith("_test.py")):
-                rel = os.path.relpath(os.path.join(dirpath, fn), tests_dir)
-                test_files.append(rel)
-    test_files.sort()
+    test_files: List[str] = [os.path.relpath(p, tests_dir) for p in discover_test_files(tests_dir, skip_reports=False)]
     if not test_files:
         raise SystemExit(f"No test files found in directory: {tests_dir}")
 
-    mutpy_cmd = detect_mutpy_command(args.mutpy_bin)
+    if args.engine == "native":
+        mutpy_cmd = [sys.executable, NATIVE_ENGINE_SCRIPT]
+    else:
+        mutpy_cmd = detect_mutpy_command(args.mutpy_bin)
 
     per_test_results: List[Dict[str, Any]] = []
     eligible_union: Dict[str, set] = {}  # module -> set of ids
     killed_union: Dict[str, set] = {}    # module -> set of ids
+    not_covered_union: Dict[str, set] = {}  # module -> ids skipped by --coverage
 
     def sig(m: Dict[str, Any]) -> tuple:
         # stable-ish signature across runs
@@ -599,7 +1024,7 @@ def main() -> None:
     tasks: List[Dict[str, str]] = []
     for test_file in test_files:
         # Mapping is keyed by filename; use basename for lookup
-        key = find_matching_test_in_mapping(os.path.basename(test_file), mapping)
+        key = mapping.key_for(test_file)
         if not key:
             print(f"[skip] No mapping found for test file: {test_file}")
             continue
@@ -619,79 +1044,291 @@ def main() -> None:
             continue
         # Use bare module name (file basename without .py); import roots are provided via --path
         test_module = os.path.splitext(os.path.basename(test_file))[0]
-        tasks.append({"test_module": test_module, "target_module": target_module, "test_file": test_file})
+        tasks.append({"test_module": test_module, "target_module": target_module, "test_file": test_file,
+                      "source_file": abs_source})
 
     if not tasks:
         print("No runnable tasks after mapping. Exiting.")
         return
 
-    # Launch in parallel
-    futures = {}
-    with ThreadPoolExecutor(max_workers=args.jobs) as ex:
-        for t in tasks:
-            fut = ex.submit(
-                run_mutpy_for_test,
-                mutpy_cmd,
-                args.runner,
-                module_root,
-                project_root,
-                tests_dir,
-                t["target_module"],
-                t["test_module"],
-                t["test_file"],
-                log_dir,
-                None,
-                args.extra_args,
-                args.timeout_sec,
-            )
-            futures[fut] = t
-
-        for fut in as_completed(futures):
-            t = futures[fut]
-            result = fut.result()
-            tm, tgt = t["test_module"], t["target_module"]
-            if not result["success"]:
-                print(f"[fail] {tm} -> {tgt} (exit={result['exit_code']})")
-                per_test_results.append({"test_module": tm, "target_module": tgt, "success": False, "stats": result["stats"]})
+    # Everything besides the files that changes what a run reports
+    run_config = [mutpy_cmd, args.runner, args.extra_args or [], args.prune_uncovered, module_root,
+                  args.memory_limit_mb, args.adaptive_timeouts and [args.timeout_factor, args.timeout_margin]]
+    manifest = load_manifest(log_dir) if args.incremental else {}
+    reused_runs = 0
+    recorded_runs = 0
+
+    def incremental(log_name: str, files: List[str], run):
+        if not args.incremental:
+            return run()
+        key = run_key(files, run_config)
+        result = reuse_result(manifest.get(log_name), key,
+                              os.path.join(log_dir, f"{log_name}.report.txt"))
+        if result is None:
+            result = run()
+        result["manifest_key"] = key
+        return result
+
+    def remember(log_name: str, result: Dict[str, Any]) -> None:
+        """Main thread only: record a fresh successful run in the manifest."""
+        nonlocal reused_runs, recorded_runs
+        recorded_runs += 1
+        if not args.incremental:
+            return
+        if result.get("reused"):
+            reused_runs += 1
+        elif result["success"]:
+            manifest[log_name] = {"key": result["manifest_key"], "stats": result["stats"],
+                                  "exit_code": result["exit_code"], "not_covered": result.get("not_covered")}
+            save_manifest(log_dir, manifest)
+        else:
+            # A failed run is retried next time
+            manifest.pop(log_name, None)
+            save_manifest(log_dir, manifest)
+
+    def run_test_task(t: Dict[str, str]) -> Dict[str, Any]:
+        return incremental(t["test_module"], [os.path.join(tests_dir, t["test_file"]), t["source_file"]],
+                           lambda: _run_test_task(t))
+
+    def run_group_task(tgt: str, group: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        One grouped run per target module, without the tests that fail on the unmutated
+        module (each reported as a failed run of its own). If the group still fails,
+        its tests are run one by one instead.
+        """
+        test_files = [t["test_file"] for t in group]
+        python = mutpy_cmd[0] if args.engine == "native" else mutpy_python(mutpy_cmd)
+        failing = failing_test_files(python, import_roots(module_root, project_root, tests_dir, test_files),
+                                     tests_dir, test_files, args.timeout_sec * max(1, len(test_files))) or []
+        passing = [t for t in group if t["test_file"] not in failing]
+        outcome = {"failing": [t for t in group if t["test_file"] in failing], "group": passing,
+                   "result": None, "fallback": []}
+        if not passing:
+            return outcome
+        files = [os.path.join(tests_dir, t["test_file"]) for t in passing] + [group[0]["source_file"]]
+        result = incremental(f"{tgt}.group", files, lambda: _run_group_task(tgt, passing))
+        if result["success"] or len(passing) == 1:
+            outcome["result"] = result
+        else:
+            outcome["failed_group"] = result
+            outcome["fallback"] = [(t, run_test_task(t)) for t in passing]
+        return outcome
+
+    def limits(cmd: List[str], test_files: List[str], source_file: str) -> Tuple[List[str], List[str], Optional[float]]:
+        """Resource limits and (with --adaptive-timeouts) per-mutant timeouts for one run."""
+        native = args.engine == "native"
+        extra = list(args.extra_args or [])
+        if args.memory_limit_mb:
+            if native:
+                extra += ["--memory-limit-mb", str(args.memory_limit_mb)]
+            else:
+                cmd = limited_command(cmd, None, args.memory_limit_mb)
+        if not args.adaptive_timeouts:
+            return cmd, extra, None
+        python = mutpy_cmd[0] if native else mutpy_python(mutpy_cmd)
+        roots = import_roots(module_root, project_root, tests_dir, test_files)
+        baseline = measure_baseline(python, roots, tests_dir, test_files, args.timeout_sec * max(1, len(test_files)))
+        if baseline is None:
+            # Failing or hanging tests: MutPy refuses to run anyway, keep the fixed budget
+            return cmd, extra, None
+        engine_args, budget = adaptive_run_settings(native, baseline, count_mutants(source_file), args.timeout_sec,
+                                                    args.timeout_factor, args.timeout_margin)
+        return cmd, extra + engine_args, budget
+
+    def _run_test_task(t: Dict[str, str]) -> Dict[str, Any]:
+        cmd, not_covered_path = mutpy_cmd, None
+        if args.prune_uncovered:
+            cmd, not_covered_path = prepare_pruned_run(
+                mutpy_cmd, module_root, project_root, tests_dir, [t["test_file"]], t["source_file"],
+                log_dir, t["test_module"], args.timeout_sec)
+        cmd, extra_args, budget = limits(cmd, [t["test_file"]], t["source_file"])
+        result = run_mutpy_for_test(cmd, args.runner, module_root, project_root, tests_dir, t["target_module"],
+                                    t["test_module"], t["test_file"], log_dir, None, extra_args,
+                                    budget or args.timeout_sec)
+        result["not_covered"] = read_not_covered(not_covered_path)
+        return result
+
+    def _run_group_task(tgt: str, group: List[Dict[str, str]]) -> Dict[str, Any]:
+        cmd, not_covered_path = mutpy_cmd, None
+        test_files = [t["test_file"] for t in group]
+        if args.prune_uncovered:
+            cmd, not_covered_path = prepare_pruned_run(
+                mutpy_cmd, module_root, project_root, tests_dir, test_files, group[0]["source_file"],
+                log_dir, f"{tgt}.group", args.timeout_sec)
+        cmd, extra_args, budget = limits(cmd, test_files, group[0]["source_file"])
+        result = run_mutpy_for_module(cmd, args.runner, module_root, project_root, tests_dir, tgt,
+                                      [t["test_module"] for t in group], test_files, log_dir, None,
+                                      extra_args, args.timeout_sec, budget)
+        result["not_covered"] = read_not_covered(not_covered_path)
+        return result
+
+    def record_not_covered(result: Dict[str, Any], tgt: str) -> Optional[int]:
+        skipped = result.get("not_covered")
+        if skipped is None:
+            return None
+        for sid in skipped:
+            not_covered_union.setdefault(sid[0] or tgt, set()).add(sid)
+        return len(skipped)
+
+    matrix = KillMatrix(args.store) if args.store else None
+    run_id = matrix.start_run(args.label or tests_dir, tests_dir, args.engine) if matrix else None
+
+    def store_outcomes(result: Dict[str, Any], tgt: str, test_modules: List[str],
+                       kills: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> None:
+        """
+        Rows for the kill matrix. A grouped run only tells which test killed a mutant first,
+        so killed mutants get one row (the credited test); mutants that survived the group
+        survived every test in it.
+        """
+        if matrix is None:
+            return
+        rows = []
+        credited = {id(m): tm for tm, ms in (kills or {}).items() for m in ms}
+        for m in (result.get("report") or {}).get("mutants", []):
+            status = (m.get("status") or "").lower()
+            if status == "killed" and len(test_modules) > 1:
+                rows.append((credited.get(id(m), f"{tgt}.group"), m, status, m.get("killer")))
+            else:
+                rows += [(tm, m, status, m.get("killer")) for tm in test_modules]
+        for module, operator, lineno in result.get("not_covered") or []:
+            m = {"module": module, "operator": operator, "lineno": lineno}
+            rows += [(tm, m, "not_covered", None) for tm in test_modules]
+        matrix.add_outcomes(run_id, tgt, rows)
+
+    def add_to_union(rep: Optional[Dict[str, Any]], tgt: str) -> None:
+        if not rep or not rep.get("mutants"):
+            return
+        # Union by module reported in the file (more reliable than tgt)
+        for m in rep["mutants"]:
+            mod = m.get("module") or tgt
+            if not mod:
                 continue
+            elig = eligible_union.setdefault(mod, set())
+            kill = killed_union.setdefault(mod, set())
+            sid = sig(m)
+            status = (m.get("status") or "").lower()
+            if status != "incompetent":
+                elig.add(sid)
+                if status == "killed":
+                    kill.add(sid)
+
+    def record_test_result(t: Dict[str, str], result: Dict[str, Any]) -> None:
+        remember(t["test_module"], result)
+        tm, tgt = t["test_module"], t["target_module"]
+        if not result["success"]:
+            print(f"[fail] {tm} -> {tgt} (exit={result['exit_code']})")
+            per_test_results.append({"test_module": tm, "target_module": tgt, "success": False, "stats": result["stats"]})
+            return
 
-            stats = result["stats"]
-            print(f"[ok] {tm} -> {tgt} | score={stats['score']}% total={stats['total']} killed={stats['killed']}")
-            per_test_results.append({"test_module": tm, "target_module": tgt, "success": True, "stats": stats})
+        stats = result["stats"]
+        not_covered = record_not_covered(result, tgt)
+        if not_covered is not None:
+            stats = dict(stats, not_covered=not_covered)
+        print(f"[{'reused' if result.get('reused') else 'ok'}] {tm} -> {tgt} | score={stats['score']}% total={stats['total']} killed={stats['killed']}"
+              + (f" not_covered={not_covered}" if not_covered is not None else ""))
+        per_test_results.append({"test_module": tm, "target_module": tgt, "success": True, "stats": stats})
+        add_to_union(result.get("report"), tgt)
+        store_outcomes(result, tgt, [tm])
+
+    def record_group_result(tgt: str, group: List[Dict[str, str]], result: Dict[str, Any]) -> None:
+        remember(f"{tgt}.group", result)
+        test_modules = [t["test_module"] for t in group]
+        if not result["success"]:
+            print(f"[fail] {tgt} <- {len(group)} tests (exit={result['exit_code']})")
+            for tm in test_modules:
+                per_test_results.append({"test_module": tm, "target_module": tgt, "success": False,
+                                         "stats": {"score": None, "total": None, "killed": None}})
+            return
 
-            rep = result.get("report")
-            if rep and rep.get("mutants"):
-                # Union by module reported in the file (more reliable than tgt)
-                for m in rep["mutants"]:
-                    mod = m.get("module") or tgt
-                    if not mod:
-                        continue
-                    elig = eligible_union.setdefault(mod, set())
-                    kill = killed_union.setdefault(mod, set())
-                    sid = sig(m)
-                    status = (m.get("status") or "").lower()
-                    if status != "incompetent":
-                        elig.add(sid)
-                        if status == "killed":
-                            kill.add(sid)
+        stats = result["stats"]
+        not_covered = record_not_covered(result, tgt)
+        print(f"[{'reused' if result.get('reused') else 'ok'}] {tgt} <- {len(group)} tests | score={stats['score']}% total={stats['total']} killed={stats['killed']}"
+              + (f" not_covered={not_covered}" if not_covered is not None else ""))
+        rep = result.get("report") or {"mutants": [], "total": stats["total"]}
+        kills = attribute_kills(rep["mutants"], test_modules)
+        total = rep.get("total") or stats["total"] or 0
+        for tm in test_modules:
+            killed = len(kills[tm])
+            score = round(killed / total * 100.0, 1) if total else None
+            per_test_results.append({"test_module": tm, "target_module": tgt, "success": True,
+                                     "stats": {"score": score, "total": total, "killed": killed},
+                                     "lower_bound": len(test_modules) > 1})
+        add_to_union(rep, tgt)
+        store_outcomes(result, tgt, test_modules, kills)
+
+    if args.group_by_module:
+        groups: Dict[str, List[Dict[str, str]]] = {}
+        for t in tasks:
+            groups.setdefault(t["target_module"], []).append(t)
+        print(f"Grouped {len(tasks)} tests into {len(groups)} target modules "
+              "(per-test killed counts are lower bounds: a kill is credited to the first killing test only)")
+
+        futures = {}
+        with ThreadPoolExecutor(max_workers=args.jobs) as ex:
+            for tgt, group in groups.items():
+                fut = ex.submit(run_group_task, tgt, group)
+                futures[fut] = tgt
+
+            for fut in as_completed(futures):
+                tgt = futures[fut]
+                outcome = fut.result()
+                for t in outcome["failing"]:
+                    print(f"[fail] {t['test_module']} -> {tgt} (fails on the unmutated module; left out of the group)")
+                    per_test_results.append({"test_module": t["test_module"], "target_module": tgt, "success": False,
+                                             "stats": {"score": None, "total": None, "killed": None}})
+                if outcome["fallback"]:
+                    remember(f"{tgt}.group", outcome["failed_group"])
+                    print(f"[fallback] {tgt}: grouped run failed (exit={outcome['failed_group']['exit_code']}), "
+                          f"ran its {len(outcome['fallback'])} tests one by one")
+                for t, result in outcome["fallback"]:
+                    record_test_result(t, result)
+                if outcome["result"] is not None:
+                    record_group_result(tgt, outcome["group"], outcome["result"])
+    else:
+        # Launch in parallel
+        futures = {}
+        with ThreadPoolExecutor(max_workers=args.jobs) as ex:
+            for t in tasks:
+                fut = ex.submit(run_test_task, t)
+                futures[fut] = t
+
+            for fut in as_completed(futures):
+                record_test_result(futures[fut], fut.result())
 
     total_sum = sum(len(s) for s in eligible_union.values())
     killed_sum = sum(len(s) for s in killed_union.values())
     overall = (killed_sum / total_sum * 100.0) if total_sum > 0 else 0.0
+    # A mutant skipped for one test may have been executed by another; those count as eligible
+    not_covered_sum = sum(len(ids - eligible_union.get(mod, set())) for mod, ids in not_covered_union.items())
 
     summary_path = os.path.join(log_dir, "summary.txt")
     with open(summary_path, "w") as f:
         f.write(f"Per-test results ({len(per_test_results)} runs):\n")
+        if args.group_by_module:
+            f.write("(grouped by module: each killed mutant is credited to the first test that killed it, so\n"
+                    " killed/score marked 'lower bound' undercount what a test kills on its own)\n")
         for r in per_test_results:
             s = r["stats"]
             f.write(
                 f"{'[ok]' if r['success'] else '[fail]'} {r['test_module']} -> {r['target_module']} "
-                f"score={s['score']} total={s['total']} killed={s['killed']}\n"
+                f"score={s['score']} total={s['total']} killed={s['killed']}"
+                + (" (lower bound)" if r.get("lower_bound") else "")
+                + (f" not_covered={s['not_covered']}" if s.get("not_covered") is not None else "") + "\n"
             )
         f.write(f"\nOverall score: {overall:.2f}% (killed={killed_sum} / total={total_sum})\n")
+        if args.prune_uncovered:
+            f.write(f"Not covered (skipped, excluded from score): {not_covered_sum}\n")
+            f.write(f"Score counting not-covered mutants as survivors: {_ratio(killed_sum, total_sum + not_covered_sum):.2f}%\n")
 
     print(f"Overall score: {overall:.2f}% (killed={killed_sum} / total={total_sum})")
+    if args.incremental:
+        print(f"Incremental: reused {reused_runs} stored runs, executed {recorded_runs - reused_runs}")
+    if args.prune_uncovered:
+        print(f"Not covered (skipped, excluded from score): {not_covered_sum}")
     print(f"Summary written to: {summary_path}")
+    if matrix is not None:
+        matrix.close()
+        print(f"Kill matrix updated: {args.store} (query with kill_matrix.py)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Persistent mutant x test kill matrix for compute_mutation_score.py runs.
+
+Every mutant a test was run against becomes one row (run, test, mutant,
+status) in a SQLite file, so results from many runs and baselines accumulate
+and union scores, baseline comparisons, per-operator breakdowns and "which
+test kills what" are answered with SQL instead of re-running MutPy.
+
+Mutants are identified like the union in compute_mutation_score.main:
+(module, operator, lineno).
+
+Usage:
+    python kill_matrix.py STORE summary [--label L]
+    python kill_matrix.py STORE compare
+    python kill_matrix.py STORE operators [--label L]
+    python kill_matrix.py STORE killers --module M --lineno N [--operator OP]
+    python kill_matrix.py STORE kills --test TEST [--label L]
+"""
+
+import argparse
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at TEXT NOT NULL,
+    label TEXT NOT NULL,
+    test_dir TEXT NOT NULL,
+    engine TEXT
+);
+CREATE TABLE IF NOT EXISTS mutants (
+    mutant_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    module TEXT NOT NULL,
+    operator TEXT,
+    lineno INTEGER,
+    UNIQUE (module, operator, lineno)
+);
+CREATE TABLE IF NOT EXISTS outcomes (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    test_module TEXT NOT NULL,
+    target_module TEXT NOT NULL,
+    mutant_id INTEGER NOT NULL REFERENCES mutants(mutant_id),
+    status TEXT NOT NULL,           -- killed | survived | timeout | incompetent | not_covered
+    killer TEXT
+);
+CREATE INDEX IF NOT EXISTS outcomes_mutant ON outcomes (mutant_id, status);
+CREATE INDEX IF NOT EXISTS outcomes_test ON outcomes (test_module, status);
+CREATE INDEX IF NOT EXISTS outcomes_run ON outcomes (run_id);
+-- Per label, the strongest status any test reached for each mutant
+CREATE VIEW IF NOT EXISTS mutant_status AS
+    SELECT r.label, o.mutant_id,
+           MAX(o.status = 'killed') AS killed,
+           MAX(o.status IN ('killed', 'survived', 'timeout')) AS executed,
+           MAX(o.status = 'not_covered') AS not_covered
+    FROM outcomes o JOIN runs r ON r.run_id = o.run_id
+    WHERE o.status != 'incompetent'
+    GROUP BY r.label, o.mutant_id;
+"""
+
+
+class KillMatrix:
+    """SQLite-backed sparse mutant x test matrix."""
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+        self._mutant_ids: Dict[Tuple, int] = {}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def start_run(self, label: str, test_dir: str, engine: Optional[str] = None) -> int:
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (recorded_at, label, test_dir, engine) VALUES (?,?,?,?)",
+                (datetime.now().isoformat(timespec="seconds"), label, test_dir, engine),
+            )
+        return cur.lastrowid
+
+    def _mutant_id(self, module: str, operator: Optional[str], lineno: Optional[int]) -> int:
+        key = (module, operator, lineno)
+        mid = self._mutant_ids.get(key)
+        if mid is None:
+            self.conn.execute("INSERT OR IGNORE INTO mutants (module, operator, lineno) VALUES (?,?,?)", key)
+            mid = self.conn.execute(
+                "SELECT mutant_id FROM mutants WHERE module = ? AND operator IS ? AND lineno IS ?", key
+            ).fetchone()[0]
+            self._mutant_ids[key] = mid
+        return mid
+
+    def add_outcomes(self, run_id: int, target_module: str,
+                     rows: Iterable[Tuple[str, Dict, str, Optional[str]]]) -> int:
+        """Insert (test_module, mutant dict from parse_mutpy_report, status, killer) rows."""
+        with self.conn:
+            values = [
+                (run_id, test_module, target_module,
+                 self._mutant_id(m.get("module") or target_module, m.get("operator"), m.get("lineno")),
+                 status, killer)
+                for test_module, m, status, killer in rows
+            ]
+            self.conn.executemany(
+                "INSERT INTO outcomes (run_id, test_module, target_module, mutant_id, status, killer) "
+                "VALUES (?,?,?,?,?,?)", values,
+            )
+        return len(values)
+
+    # ----- queries -----
+
+    def labels(self) -> List[str]:
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT label FROM runs ORDER BY label")]
+
+    def union_score(self, label: str) -> Tuple[int, int, int]:
+        """(killed, eligible, not_covered) over the union of all tests of a label."""
+        killed, eligible, not_covered = self.conn.execute(
+            """
+            SELECT COALESCE(SUM(killed), 0),
+                   COALESCE(SUM(executed), 0),
+                   COALESCE(SUM(not_covered AND NOT executed), 0)
+            FROM mutant_status WHERE label = ?
+            """, (label,),
+        ).fetchone()
+        return killed, eligible, not_covered
+
+    def operator_breakdown(self, label: Optional[str] = None) -> List[Tuple[str, str, int, int]]:
+        """(label, operator, killed, eligible) per operator."""
+        query = """
+            SELECT s.label, m.operator, SUM(s.killed), SUM(s.executed)
+            FROM mutant_status s JOIN mutants m ON m.mutant_id = s.mutant_id
+            {where} GROUP BY s.label, m.operator ORDER BY s.label, m.operator
+        """
+        if label:
+            return self.conn.execute(query.format(where="WHERE s.label = ?"), (label,)).fetchall()
+        return self.conn.execute(query.format(where="")).fetchall()
+
+    def killers(self, module: str, lineno: int, operator: Optional[str] = None) -> List[Tuple[str, str, str]]:
+        """(label, test_module, operator) of every test that killed a mutant at module:lineno."""
+        query = """
+            SELECT DISTINCT r.label, o.test_module, m.operator
+            FROM outcomes o JOIN runs r ON r.run_id = o.run_id JOIN mutants m ON m.mutant_id = o.mutant_id
+            WHERE o.status = 'killed' AND m.module = ? AND m.lineno = ?
+        """
+        params: List = [module, lineno]
+        if operator:
+            query += " AND m.operator = ?"
+            params.append(operator)
+        return self.conn.execute(query + " ORDER BY r.label, o.test_module", params).fetchall()
+
+    def kills(self, test_module: str, label: Optional[str] = None) -> List[Tuple[str, str, int]]:
+        """(module, operator, lineno) of the mutants a test killed."""
+        query = """
+            SELECT DISTINCT m.module, m.operator, m.lineno
+            FROM outcomes o JOIN runs r ON r.run_id = o.run_id JOIN mutants m ON m.mutant_id = o.mutant_id
+            WHERE o.status = 'killed' AND o.test_module = ?
+        """
+        params: List = [test_module]
+        if label:
+            query += " AND r.label = ?"
+            params.append(label)
+        return self.conn.execute(query + " ORDER BY m.module, m.lineno, m.operator", params).fetchall()
+
+    def exclusive_kills(self, label: str, other: str) -> int:
+        """Mutants killed under `label` that no test of `other` killed."""
+        return self.conn.execute(
+            """
+            SELECT COUNT(*) FROM mutant_status a
+            WHERE a.label = ? AND a.killed AND NOT EXISTS (
+                SELECT 1 FROM mutant_status b WHERE b.label = ? AND b.mutant_id = a.mutant_id AND b.killed)
+            """, (label, other),
+        ).fetchone()[0]
+
+
+def _pct(killed: int, total: int) -> float:
+    return killed / total * 100.0 if total else 0.0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Query the mutant x test kill matrix.")
+    ap.add_argument("store", help="SQLite file written by compute_mutation_score.py --store.")
+    sub = ap.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("summary", help="Union score per label.")
+    p.add_argument("--label", default=None)
+    sub.add_parser("compare", help="Union scores and exclusive kills for every pair of labels.")
+    p = sub.add_parser("operators", help="Killed / eligible per mutation operator.")
+    p.add_argument("--label", default=None)
+    p = sub.add_parser("killers", help="Tests that kill the mutants at a source line.")
+    p.add_argument("--module", required=True)
+    p.add_argument("--lineno", type=int, required=True)
+    p.add_argument("--operator", default=None)
+    p = sub.add_parser("kills", help="Mutants a test kills.")
+    p.add_argument("--test", required=True)
+    p.add_argument("--label", default=None)
+    args = ap.parse_args()
+
+    matrix = KillMatrix(args.store)
+    if args.command == "summary":
+        for label in ([args.label] if args.label else matrix.labels()):
+            killed, eligible, not_covered = matrix.union_score(label)
+            print(f"{label}\tscore={_pct(killed, eligible):.2f}%\tkilled={killed}\ttotal={eligible}\tnot_covered={not_covered}")
+    elif args.command == "compare":
+        labels = matrix.labels()
+        for label in labels:
+            killed, eligible, _ = matrix.union_score(label)
+            print(f"{label}\t{_pct(killed, eligible):.2f}% ({killed}/{eligible})")
+        for a in labels:
+            for b in labels:
+                if a != b:
+                    print(f"killed by {a} but not {b}: {matrix.exclusive_kills(a, b)}")
+    elif args.command == "operators":
+        for label, operator, killed, eligible in matrix.operator_breakdown(args.label):
+            print(f"{label}\t{operator}\t{_pct(killed, eligible):.2f}%\t({killed}/{eligible})")
+    elif args.command == "killers":
+        for label, test_module, operator in matrix.killers(args.module, args.lineno, args.operator):
+            print(f"{label}\t{operator}\t{test_module}")
+    elif args.command == "kills":
+        for module, operator, lineno in matrix.kills(args.test, args.label):
+            print(f"{module}:{lineno}\t{operator}")
+    matrix.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Run MutPy, skipping mutants on lines the tests never execute.
+
+Drop-in replacement for mut.py used by compute_mutation_score.py --prune-uncovered.
+The covered lines come from a coverage.py pre-pass ({"<abs source path>": [lines]});
+a mutant is executed only if every mutated node sits on a covered line (or on a
+continuation line of a covered statement, see covered_lines.py). Skipped
+mutants never reach the report (so the score is over covered mutants only) and
+are written as [module, operator, lineno] to --not-covered-out instead.
+
+MutPy's own --coverage does the same at node level but its coverage injector
+fails to compile on Python >= 3.8, which is why this wraps the generator.
+
+Usage (with the interpreter MutPy is installed in):
+    python mutpy_pruned.py --covered-lines FILE --not-covered-out FILE [mut.py arguments]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from mutpy import commandline
+
+# Shared helpers live in scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from covered_lines import CoveredLines, load_covered_lines  # noqa: E402
+
+
+class CoveredLinesFilter:
+    """Wraps a MutPy mutant generator and drops mutants outside the covered lines."""
+
+    def __init__(self, generator, covered, skipped):
+        self.generator = generator
+        self.covered = covered
+        self.skipped = skipped
+
+    def mutate(self, target_ast, to_mutate=None, coverage_injector=None, module=None):
+        path = os.path.realpath(getattr(module, "__file__", "") or "")
+        lines = self.covered.get(path)
+        if lines is not None:
+            lines = CoveredLines(lines, target_ast)
+        for mutations, mutant in self.generator.mutate(target_ast, to_mutate, coverage_injector, module=module):
+            if lines is not None and any(getattr(m.node, "lineno", None) not in lines for m in mutations):
+                self.skipped.append([module.__name__, mutations[0].operator.name(), mutations[0].node.lineno])
+                continue
+            yield mutations, mutant
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(add_help=False)
+    ap.add_argument("--covered-lines", required=True)
+    ap.add_argument("--not-covered-out", required=True)
+    args, mutpy_args = ap.parse_known_args()
+
+    covered = load_covered_lines(args.covered_lines)
+
+    cfg = commandline.build_parser().parse_args(mutpy_args)
+    controller = commandline.build_controller(cfg)
+    skipped = []
+    controller.mutant_generator = CoveredLinesFilter(controller.mutant_generator, covered, skipped)
+    try:
+        controller.run()
+    finally:
+        with open(args.not_covered_out, "w") as f:
+            json.dump(skipped, f)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,618 @@
+#!/usr/bin/env python3
+"""
+Native AST mutation engine with a fork-server test executor.
+
+Each mut.py process pays interpreter startup, the import of the whole target
+package and pytest collection before the first mutant runs. Here the target
+module, its tests and pytest are imported once in a parent process; every
+mutant is then run in a forked child that mutates the (copy-on-write) AST in
+place, installs the mutated module and runs pytest with a hard timeout. The
+per-mutant cost is a fork plus the test itself.
+
+The per-mutant timeout is timeout_factor x baseline + timeout_margin, where
+baseline is the unmutated tests' runtime in the fork server, so a mutant that
+loops forever is killed within a few baseline runs. Each child is also held to
+that many CPU seconds (and to --memory-limit-mb) by rlimits; a child the
+kernel stops for CPU time counts as a timeout.
+
+Installing a mutant re-executes the mutated code in the already imported
+module's namespace, rebinds names other modules imported from it (`from mod
+import f`) and puts a finder on sys.meta_path so a fresh import of the module
+also gets the mutant.
+
+Operators use MutPy's names and rules: AOD, AOR, ASR, BCR, COD, COI, CRP, DDL,
+EHD, EXS, LCR, LOD, LOR, ROR, SIR (standard set) and SDL (with -e). The
+inheritance operators (HVD, IOD, IOP, SCD, SCI) are not implemented. Mutants
+are ordered like MutPy's (by operator name, then source order) and the report
+uses MutPy's YAML schema, so compute_mutation_score.py reads both the same way.
+
+Usage (accepts the mut.py arguments compute_mutation_score.py passes):
+    python native_mutation.py --target MODULE --unit-test TEST [TEST ...] [--path DIR ...]
+        [--runner pytest] [--report FILE] [--timeout-factor F] [--timeout-margin S]
+        [--memory-limit-mb N] [--operator OP ...] [--disable-operator OP ...] [-e] [--jobs N]
+        [--covered-lines FILE --not-covered-out FILE]
+"""
+
+import argparse
+import ast
+import importlib
+import importlib.abc
+import importlib.util
+import inspect
+import json
+import os
+import signal
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+# Shared helpers live in scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from covered_lines import CoveredLines, load_covered_lines  # noqa: E402
+from resource_limits import (DEFAULT_TIMEOUT_FACTOR, DEFAULT_TIMEOUT_MARGIN,  # noqa: E402
+                             adaptive_timeout, apply_limits, exit_code, killed_by_cpu_limit)
+
+# Child exit payload is small JSON; tracebacks are truncated so the pipe never fills
+_MAX_TRACEBACK = 4000
+
+# ----- operators -----
+
+_AOR = {
+    ast.Add: [ast.Sub], ast.Sub: [ast.Add],
+    ast.Mult: [ast.Div, ast.FloorDiv, ast.Pow],
+    ast.Div: [ast.Mult, ast.FloorDiv], ast.FloorDiv: [ast.Div, ast.Mult],
+    ast.Mod: [ast.Mult], ast.Pow: [ast.Mult],
+}
+_ROR = {
+    ast.Lt: [ast.Gt, ast.LtE], ast.Gt: [ast.Lt, ast.GtE],
+    ast.LtE: [ast.GtE, ast.Lt], ast.GtE: [ast.LtE, ast.Gt],
+    ast.Eq: [ast.NotEq], ast.NotEq: [ast.Eq],
+}
+_LOR = {
+    ast.BitAnd: [ast.BitOr], ast.BitOr: [ast.BitAnd], ast.BitXor: [ast.BitAnd],
+    ast.LShift: [ast.RShift], ast.RShift: [ast.LShift],
+}
+_CRP_FIRST, _CRP_SECOND = "mutpy", "python"
+
+STANDARD_OPERATORS = ["AOD", "AOR", "ASR", "BCR", "COD", "COI", "CRP", "DDL",
+                      "EHD", "EXS", "LCR", "LOD", "LOR", "ROR", "SIR"]
+EXPERIMENTAL_OPERATORS = ["SDL"]
+
+
+@dataclass
+class Mutation:
+    """One first-order mutant; apply() edits the tree in place (only ever called in a child)."""
+    operator: str
+    lineno: int
+    apply: Callable[[], None] = field(repr=False)
+
+
+def _set(parent: ast.AST, name: str, index: Optional[int], node: ast.AST) -> Callable[[], None]:
+    def apply() -> None:
+        if index is None:
+            setattr(parent, name, node)
+        else:
+            getattr(parent, name)[index] = node
+    return apply
+
+
+def _children(tree: ast.AST) -> Iterator[Tuple[ast.AST, str, Optional[int], ast.AST]]:
+    """(parent, field, index, child) for every node, in ast.walk order."""
+    for parent in ast.walk(tree):
+        for name, value in ast.iter_fields(parent):
+            if isinstance(value, list):
+                for i, child in enumerate(value):
+                    if isinstance(child, ast.AST):
+                        yield parent, name, i, child
+            elif isinstance(value, ast.AST):
+                yield parent, name, None, value
+
+
+def _docstring_nodes(tree: ast.AST) -> Set[int]:
+    ids = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and node.body:
+            first = node.body[0]
+            if isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant) and isinstance(first.value.value, str):
+                ids.add(id(first))
+                ids.add(id(first.value))
+    return ids
+
+
+def _unary_deletion(op_types: tuple, name: str):
+    def gen(parent, fname, index, node, ctx):
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, op_types):
+            yield Mutation(name, node.lineno, _set(parent, fname, index, node.operand))
+    return gen
+
+
+def _aor(parent, fname, index, node, ctx):
+    if isinstance(node, ast.BinOp):
+        for new in _AOR.get(type(node.op), []):
+            yield Mutation("AOR", node.lineno, _set(node, "op", None, new()))
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        new = ast.USub if isinstance(node.op, ast.UAdd) else ast.UAdd
+        yield Mutation("AOR", node.lineno, _set(node, "op", None, new()))
+
+
+def _asr(parent, fname, index, node, ctx):
+    if isinstance(node, ast.AugAssign):
+        for new in _AOR.get(type(node.op), []):
+            yield Mutation("ASR", node.lineno, _set(node, "op", None, new()))
+
+
+def _bcr(parent, fname, index, node, ctx):
+    if isinstance(node, ast.Break):
+        yield Mutation("BCR", node.lineno, _set(parent, fname, index, ast.copy_location(ast.Continue(), node)))
+    elif isinstance(node, ast.Continue):
+        yield Mutation("BCR", node.lineno, _set(parent, fname, index, ast.copy_location(ast.Break(), node)))
+
+
+def _cod(parent, fname, index, node, ctx):
+    yield from _unary_deletion((ast.Not,), "COD")(parent, fname, index, node, ctx)
+    if isinstance(node, ast.Compare):
+        for i, op in enumerate(node.ops):
+            if isinstance(op, ast.NotIn):
+                yield Mutation("COD", node.lineno, _set(node, "ops", i, ast.In()))
+
+
+def _coi(parent, fname, index, node, ctx):
+    if isinstance(node, (ast.If, ast.While)):
+        negated = ast.copy_location(ast.UnaryOp(op=ast.Not(), operand=node.test), node.test)
+        yield Mutation("COI", node.lineno, _set(node, "test", None, negated))
+    elif isinstance(node, ast.Compare):
+        for i, op in enumerate(node.ops):
+            if isinstance(op, ast.In):
+                yield Mutation("COI", node.lineno, _set(node, "ops", i, ast.NotIn()))
+
+
+def _crp(parent, fname, index, node, ctx):
+    if not isinstance(node, ast.Constant) or id(node) in ctx["docstrings"] or isinstance(parent, ast.JoinedStr):
+        return
+    value = node.value
+    if isinstance(value, bool) or value is None or value is Ellipsis:
+        return
+    if isinstance(value, (int, float, complex)):
+        yield Mutation("CRP", node.lineno, _set(node, "value", None, value + 1))
+    elif isinstance(value, str):
+        yield Mutation("CRP", node.lineno,
+                       _set(node, "value", None, _CRP_FIRST if value != _CRP_FIRST else _CRP_SECOND))
+        if value:
+            yield Mutation("CRP", node.lineno, _set(node, "value", None, ""))
+
+
+def _ddl(parent, fname, index, node, ctx):
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and node.decorator_list:
+        yield Mutation("DDL", node.decorator_list[0].lineno, _set(node, "decorator_list", None, []))
+
+
+def _ehd(parent, fname, index, node, ctx):
+    if isinstance(node, ast.ExceptHandler):
+        body = node.body
+        if not (len(body) == 1 and isinstance(body[0], ast.Raise) and body[0].exc is None):
+            yield Mutation("EHD", body[0].lineno, _set(node, "body", None, [ast.copy_location(ast.Raise(), body[0])]))
+
+
+def _exs(parent, fname, index, node, ctx):
+    if isinstance(node, ast.ExceptHandler):
+        body = node.body
+        if not (len(body) == 1 and isinstance(body[0], ast.Pass)):
+            yield Mutation("EXS", body[0].lineno, _set(node, "body", None, [ast.copy_location(ast.Pass(), body[0])]))
+
+
+def _lcr(parent, fname, index, node, ctx):
+    if isinstance(node, ast.BoolOp):
+        new = ast.Or if isinstance(node.op, ast.And) else ast.And
+        yield Mutation("LCR", node.lineno, _set(node, "op", None, new()))
+
+
+def _lor(parent, fname, index, node, ctx):
+    if isinstance(node, ast.BinOp):
+        for new in _LOR.get(type(node.op), []):
+            yield Mutation("LOR", node.lineno, _set(node, "op", None, new()))
+
+
+def _ror(parent, fname, index, node, ctx):
+    if isinstance(node, ast.Compare):
+        for i, op in enumerate(node.ops):
+            for new in _ROR.get(type(op), []):
+                yield Mutation("ROR", node.lineno, _set(node, "ops", i, new()))
+
+
+def _sdl(parent, fname, index, node, ctx):
+    if isinstance(node, (ast.Assign, ast.Return)) or (isinstance(node, ast.Expr) and id(node) not in ctx["docstrings"]):
+        yield Mutation("SDL", node.lineno, _set(parent, fname, index, ast.copy_location(ast.Pass(), node)))
+
+
+def _sir(parent, fname, index, node, ctx):
+    if isinstance(node, ast.Slice):
+        for part in ("lower", "upper", "step"):
+            if getattr(node, part) is not None:
+                yield Mutation("SIR", getattr(node, "lineno", None) or getattr(node, part).lineno,
+                               _set(node, part, None, None))
+
+
+OPERATORS = {
+    "AOD": _unary_deletion((ast.UAdd, ast.USub), "AOD"),
+    "AOR": _aor,
+    "ASR": _asr,
+    "BCR": _bcr,
+    "COD": _cod,
+    "COI": _coi,
+    "CRP": _crp,
+    "DDL": _ddl,
+    "EHD": _ehd,
+    "EXS": _exs,
+    "LCR": _lcr,
+    "LOD": _unary_deletion((ast.Invert,), "LOD"),
+    "LOR": _lor,
+    "ROR": _ror,
+    "SDL": _sdl,
+    "SIR": _sir,
+}
+
+
+def generate_mutations(tree: ast.AST, operators: List[str]) -> List[Mutation]:
+    """All first-order mutants of tree, ordered by operator name and then source order."""
+    ctx = {"docstrings": _docstring_nodes(tree)}
+    edges = list(_children(tree))
+    mutations = []
+    for name in sorted(operators):
+        gen = OPERATORS[name]
+        for parent, fname, index, node in edges:
+            mutations.extend(gen(parent, fname, index, node, ctx))
+    return mutations
+
+
+# ----- installing a mutant -----
+
+class _MutantFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """Serves the mutated code for the target module on any fresh import."""
+
+    def __init__(self, name: str, code, filename: str):
+        self.name = name
+        self.code = code
+        self.filename = filename
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname == self.name:
+            return importlib.util.spec_from_loader(fullname, self, origin=self.filename)
+        return None
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        module.__file__ = self.filename
+        exec(self.code, module.__dict__)
+
+
+def _rebind(old: Dict[str, object], module) -> None:
+    """Point names other modules imported from `module` at the re-executed definitions."""
+    replaced = {}
+    for name, value in old.items():
+        new = module.__dict__.get(name)
+        if new is not None and new is not value and (inspect.isfunction(value) or inspect.isclass(value)):
+            replaced[id(value)] = (value, new)
+    if not replaced:
+        return
+    for other in list(sys.modules.values()):
+        namespace = getattr(other, "__dict__", None)
+        if other is module or not isinstance(namespace, dict):
+            continue
+        for name, value in list(namespace.items()):
+            pair = replaced.get(id(value))
+            if pair is not None and pair[0] is value:
+                namespace[name] = pair[1]
+
+
+class _Recorder:
+    """pytest plugin recording how many tests ran and the first failure."""
+
+    def __init__(self):
+        self.tests_run = 0
+        self.killer: Optional[str] = None
+        self.traceback: Optional[str] = None
+
+    def _fail(self, report) -> None:
+        if self.killer is None:
+            self.killer = report.nodeid or "<collection>"
+            self.traceback = str(report.longrepr)[-_MAX_TRACEBACK:]
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call":
+            self.tests_run += 1
+        if report.failed:
+            self._fail(report)
+
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self._fail(report)
+
+
+# ----- fork server -----
+
+@dataclass
+class Outcome:
+    status: str                     # killed | survived | incompetent | timeout
+    time: float
+    killer: Optional[str] = None
+    exception_traceback: Optional[str] = None
+    tests_run: Optional[int] = None
+
+
+class ForkServer:
+    """Holds the preloaded target, tests and pytest; runs each mutant in a forked child."""
+
+    def __init__(self, target: str, tests: List[str], paths: List[str], memory_mb: Optional[int] = None):
+        self.memory_mb = memory_mb
+        for p in reversed(paths):
+            if p not in sys.path:
+                sys.path.insert(0, p)
+        import pytest  # noqa: F401  (preloaded for the children)
+        self.pytest = pytest
+        self.module = importlib.import_module(target)
+        self.filename = self.module.__file__
+        with open(self.filename, "r") as f:
+            self.tree = ast.parse(f.read(), self.filename)
+        self.test_paths = []
+        for test in tests:
+            test_module = importlib.import_module(test)
+            self.test_paths.append(test_module.__file__)
+        self.pytest_args = self.test_paths + ["-x", "-q", "-p", "no:cacheprovider"]
+
+    def _child(self, mutation: Optional[Mutation], wfd: int, cpu_seconds: Optional[float]) -> None:
+        apply_limits(cpu_seconds, self.memory_mb)
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+        result = {"status": "survived", "killer": None, "exception_traceback": None, "tests_run": 0}
+        try:
+            if mutation is not None:
+                mutation.apply()
+                ast.fix_missing_locations(self.tree)
+                code = compile(self.tree, self.filename, "exec")
+                sys.meta_path.insert(0, _MutantFinder(self.module.__name__, code, self.filename))
+                old = dict(self.module.__dict__)
+                exec(code, self.module.__dict__)
+                _rebind(old, self.module)
+        except BaseException as e:
+            result.update(status="incompetent", exception_traceback=repr(e)[-_MAX_TRACEBACK:])
+        else:
+            recorder = _Recorder()
+            try:
+                rc = int(self.pytest.main(list(self.pytest_args), plugins=[recorder]))
+            except BaseException as e:
+                rc = 3
+                recorder.traceback = repr(e)[-_MAX_TRACEBACK:]
+            result["tests_run"] = recorder.tests_run
+            if rc in (1, 2) or recorder.killer is not None:
+                # 1: a test failed, 2: interrupted (e.g. the mutant breaks test collection)
+                result.update(status="killed", killer=recorder.killer or "<collection>",
+                              exception_traceback=recorder.traceback)
+            elif rc != 0:
+                result.update(status="incompetent", exception_traceback=recorder.traceback)
+        try:
+            os.write(wfd, json.dumps(result).encode())
+        finally:
+            os._exit(0)
+
+    def _spawn(self, mutation: Optional[Mutation], cpu_seconds: Optional[float]) -> Tuple[int, int]:
+        rfd, wfd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(rfd)
+            self._child(mutation, wfd, cpu_seconds)
+        os.close(wfd)
+        return pid, rfd
+
+    def run(self, mutations: List[Optional[Mutation]], timeout: float, jobs: int = 1,
+            on_done: Optional[Callable[[int, Outcome], None]] = None,
+            cpu_limit: bool = True) -> List[Outcome]:
+        """
+        Run mutants (None = original code) with up to `jobs` children at a time.
+        With cpu_limit each child may use at most `timeout` CPU seconds.
+        """
+        outcomes: List[Optional[Outcome]] = [None] * len(mutations)
+        running: Dict[int, Tuple[int, int, float]] = {}  # index -> (pid, rfd, start)
+        next_index = 0
+        while next_index < len(mutations) or running:
+            while next_index < len(mutations) and len(running) < max(1, jobs):
+                pid, rfd = self._spawn(mutations[next_index], timeout if cpu_limit else None)
+                running[next_index] = (pid, rfd, time.monotonic())
+                next_index += 1
+            for index, (pid, rfd, start) in list(running.items()):
+                done_pid, wait_status, usage = os.wait4(pid, os.WNOHANG)
+                elapsed = time.monotonic() - start
+                if done_pid == 0 and elapsed <= timeout:
+                    continue
+                if done_pid == 0:
+                    os.kill(pid, signal.SIGKILL)
+                    os.waitpid(pid, 0)
+                    os.close(rfd)
+                    outcome = Outcome("timeout", elapsed)
+                elif cpu_limit and killed_by_cpu_limit(exit_code(wait_status), usage.ru_utime + usage.ru_stime,
+                                                       timeout):
+                    os.close(rfd)
+                    outcome = Outcome("timeout", elapsed)
+                else:
+                    payload = self._collect_exited(rfd)
+                    if payload is None:
+                        outcome = Outcome("incompetent", elapsed, exception_traceback="child exited without a result")
+                    else:
+                        outcome = Outcome(payload["status"], elapsed, payload["killer"],
+                                          payload["exception_traceback"], payload["tests_run"])
+                del running[index]
+                outcomes[index] = outcome
+                if on_done is not None:
+                    on_done(index, outcome)
+            if running:
+                time.sleep(0.002)
+        return outcomes  # type: ignore[return-value]
+
+    @staticmethod
+    def _collect_exited(rfd: int) -> Optional[dict]:
+        chunks = []
+        while True:
+            chunk = os.read(rfd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        os.close(rfd)
+        try:
+            return json.loads(b"".join(chunks).decode())
+        except ValueError:
+            return None
+
+
+# ----- report -----
+
+def _scalar(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return json.dumps(str(value))
+
+
+def write_report(path: str, target: str, tests: List[Tuple[str, float]], number_of_tests: int,
+                 mutants: List[Tuple[int, Mutation, Outcome]], score: float, total_time: float) -> None:
+    """MutPy's YAML report layout (keys sorted as yaml.dump writes them)."""
+    lines = ["coverage:", "  all_nodes: 0", "  covered_nodes: 0",
+             f"mutation_score: {_scalar(score)}", "mutations:"]
+    if not mutants:
+        lines[-1] = "mutations: []"
+    for i, (number, mutation, outcome) in enumerate(mutants):
+        module = f"&id001 !!python/module:{target}" if i == 0 else "*id001"
+        lines += [
+            f"- exception_traceback: {_scalar(outcome.exception_traceback)}",
+            f"  killer: {_scalar(outcome.killer)}",
+            f"  module: {module}",
+            "  mutations:",
+            f"  - lineno: {mutation.lineno}",
+            f"    operator: {mutation.operator}",
+            f"  number: {number}",
+            f"  status: {outcome.status}",
+            f"  tests_run: {_scalar(outcome.tests_run)}",
+            f"  time: {_scalar(round(outcome.time, 6))}",
+        ]
+    lines += [f"number_of_tests: {number_of_tests}", "targets:", f"- {target}", "tests:"]
+    for name, duration in tests:
+        lines += [f"- name: {name}", "  target: null", f"  time: {_scalar(round(duration, 6))}"]
+    lines += ["time_stats: {}", f"total_time: {_scalar(round(total_time, 6))}"]
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+# ----- command line -----
+
+def _select_operators(args) -> List[str]:
+    if args.operator:
+        selected = set(args.operator)
+    else:
+        selected = set(STANDARD_OPERATORS)
+    if args.experimental_operators:
+        selected |= set(EXPERIMENTAL_OPERATORS)
+    selected -= set(args.disable_operator or [])
+    unknown = selected - set(OPERATORS)
+    if unknown:
+        raise SystemExit(f"Unknown operators: {', '.join(sorted(unknown))}")
+    return sorted(selected)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Native AST mutation testing with a fork-server executor.")
+    ap.add_argument("--target", "-t", nargs="+", required=True)
+    ap.add_argument("--unit-test", "-u", nargs="+", required=True)
+    ap.add_argument("--path", "-p", action="append", default=[])
+    ap.add_argument("--runner", default="pytest", choices=["pytest"])
+    ap.add_argument("--report", "-r", default=None)
+    ap.add_argument("--timeout-factor", "-f", type=float, default=DEFAULT_TIMEOUT_FACTOR)
+    ap.add_argument("--timeout-margin", type=float, default=DEFAULT_TIMEOUT_MARGIN,
+                    help="Seconds added to timeout-factor x baseline for each mutant.")
+    ap.add_argument("--memory-limit-mb", type=int, default=None, help="Address-space limit of each mutant run.")
+    ap.add_argument("--operator", "-o", nargs="+", default=None)
+    ap.add_argument("--disable-operator", nargs="+", default=[])
+    ap.add_argument("--experimental-operators", "-e", action="store_true")
+    ap.add_argument("--jobs", type=int, default=1, help="Mutants run concurrently (forked children).")
+    ap.add_argument("--covered-lines", default=None,
+                    help="JSON {source path: [lines]}; mutants on other lines are skipped.")
+    ap.add_argument("--not-covered-out", default=None, help="Where to write skipped mutants.")
+    args, _ignored = ap.parse_known_args()
+
+    if len(args.target) != 1:
+        raise SystemExit("native engine mutates one target module per run")
+    target = args.target[0]
+    operators = _select_operators(args)
+    total_timer = time.monotonic()
+
+    print("[*] Start mutation process:")
+    print(f"   - targets: {target}")
+    print(f"   - tests: {', '.join(args.unit_test)}")
+    server = ForkServer(target, args.unit_test, args.path + [os.getcwd()], args.memory_limit_mb)
+
+    baseline = server.run([None], timeout=3600, cpu_limit=False)[0]
+    if baseline.status != "survived":
+        print(f"[*] Tests failed:")
+        print(f"   - {baseline.status} {baseline.killer or ''}")
+        if baseline.exception_traceback:
+            print(baseline.exception_traceback)
+        sys.exit(255)
+    number_of_tests = baseline.tests_run or 0
+    print(f"[*] {number_of_tests} tests passed:")
+    for test in args.unit_test:
+        print(f"   - {test} [{baseline.time:.5f} s]")
+
+    mutations = generate_mutations(server.tree, operators)
+    skipped: List[List] = []
+    if args.covered_lines:
+        lines = load_covered_lines(args.covered_lines).get(os.path.realpath(server.filename))
+        if lines is not None:
+            # Mutants on continuation lines count as covered when their statement ran
+            lines = CoveredLines(lines, server.tree)
+            kept = []
+            for m in mutations:
+                (kept if m.lineno in lines else skipped).append(m)
+            skipped = [[target, m.operator, m.lineno] for m in skipped]
+            mutations = kept
+
+    timeout = adaptive_timeout(baseline.time, args.timeout_factor, args.timeout_margin)
+    print("[*] Start mutants generation and execution:")
+
+    def on_done(index: int, outcome: Outcome) -> None:
+        m = mutations[index]
+        detail = f" by {outcome.killer}" if outcome.status == "killed" else ""
+        print(f"   - [# {index + 1:>3}] {m.operator} {target}:{m.lineno}: [{outcome.time:.5f} s] {outcome.status}{detail}",
+              flush=True)
+
+    outcomes = server.run(mutations, timeout=timeout, jobs=args.jobs, on_done=on_done)
+
+    counts = {"killed": 0, "survived": 0, "incompetent": 0, "timeout": 0}
+    for outcome in outcomes:
+        counts[outcome.status] += 1
+    all_mutants = len(outcomes)
+    bottom = all_mutants - counts["incompetent"]
+    score = ((counts["killed"] + counts["timeout"]) / bottom * 100) if bottom else 0
+    total_time = time.monotonic() - total_timer
+
+    print(f"[*] Mutation score [{total_time:.5f} s]: {score:.1f}%")
+    print(f"   - all: {all_mutants}")
+    for status in ("killed", "survived", "incompetent", "timeout"):
+        pct = counts[status] / all_mutants * 100 if all_mutants else 0.0
+        print(f"   - {status}: {counts[status]} ({pct:.1f}%)")
+    if args.covered_lines:
+        print(f"   - not covered (skipped): {len(skipped)}")
+
+    if args.report:
+        write_report(args.report, target, [(t, baseline.time) for t in args.unit_test], number_of_tests,
+                     [(i + 1, m, o) for i, (m, o) in enumerate(zip(mutations, outcomes))], score, total_time)
+    if args.not_covered_out:
+        with open(args.not_covered_out, "w") as f:
+            json.dump(skipped, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+pytest plugin recording what one evaluation run needs besides coverage.
+
+Loaded by python_evaluator.py with `-p pytest_outcome_plugin` in the same
+`coverage run -m pytest` process that collects coverage, so pass rate,
+coverage and the assertion summary come from a single execution. At the end
+of the session it writes $LSPRAG_OUTCOME_FILE:
+
+    {"category": "pass" | "assertion" | "error",
+     "passed": N, "failed": N, "errors": N, "collected": N,
+     "assertion_failures": [{"nodeid", "text"}],
+     "exceptions": [{"nodeid", "when", "type"}]}
+
+A test failing with AssertionError is an assertion failure; any other
+exception in a test, a setup/teardown error or a collection error makes the
+file an error (the runtime/compilation errors python_passrate.py counts).
+A run that never writes the file (killed on timeout) is a hang.
+"""
+
+import json
+import os
+
+import pytest
+
+OUTCOME_FILE_ENV = "LSPRAG_OUTCOME_FILE"
+# Failure texts end up in assertion_errors.log; keep each one readable but bounded
+MAX_TEXT = 20000
+
+
+class OutcomeRecorder:
+    def __init__(self, path: str):
+        self.path = path
+        self.passed = 0
+        self.failed = 0
+        self.errors = 0
+        self.collected = 0
+        self.assertion_failures = []
+        self.exceptions = []
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if not report.failed:
+            return
+        is_assertion = call.excinfo is not None and call.excinfo.errisinstance(AssertionError)
+        if report.when == "call" and is_assertion:
+            self.assertion_failures.append({"nodeid": report.nodeid, "text": report.longreprtext[-MAX_TEXT:]})
+        else:
+            exc_type = call.excinfo.typename if call.excinfo is not None else None
+            self.exceptions.append({"nodeid": report.nodeid, "when": report.when, "type": exc_type})
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call":
+            if report.passed:
+                self.passed += 1
+            elif report.failed:
+                self.failed += 1
+        elif report.failed:
+            self.errors += 1
+
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self.errors += 1
+            self.exceptions.append({"nodeid": report.nodeid, "when": "collect", "type": None})
+
+    def pytest_collection_finish(self, session):
+        self.collected = len(session.items)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self.exceptions:
+            category = "error"
+        elif self.assertion_failures:
+            category = "assertion"
+        elif exitstatus == 0:
+            category = "pass"
+        else:
+            # No tests collected, usage/internal errors, interrupted sessions
+            category = "error"
+        data = {
+            "category": category,
+            "exit_status": int(exitstatus),
+            "passed": self.passed,
+            "failed": self.failed,
+            "errors": self.errors,
+            "collected": self.collected,
+            "assertion_failures": self.assertion_failures,
+            "exceptions": self.exceptions,
+        }
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+
+def pytest_configure(config):
+    path = os.environ.get(OUTCOME_FILE_ENV)
+    if path:
+        config.pluginmanager.register(OutcomeRecorder(path), "lsprag-outcome-recorder")
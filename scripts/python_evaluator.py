@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+"""
+Per-file evaluation of generated Python tests.
+
+This is the Python counterpart of python_coverage.bash: every test file runs
+once under `coverage run -m pytest` with a timeout, is classified as passed /
+failed (assertion) / error / hanging, and the per-test coverage data files are
+combined into the same report layout and summary lines the bash script prints
+(so Parser.python_output_parser in result_verifier.py reads both).
+
+Because the unit of work is a single file it can also be driven incrementally,
+e.g. by the verifier's --watch mode while generation is still running.
+
+The same run loads pytest_outcome_plugin.py, which records each file's
+outcome category (pass / assertion / error; a killed run is a hang) and the
+assertion failure texts. Pass rate, coverage and assertion_errors.log
+therefore all come from one execution instead of a separate
+python_passrate.py run.
+
+Each run is capped at its timeout in CPU seconds and, with --memory-limit-mb,
+in address space. With --hang-retry a file that hits the timeout is run once
+more with adaptive_timeout(timeout) (k x timeout + margin, see
+resource_limits.py) before it counts as hanging, so slow-but-correct tests
+are not misclassified.
+
+Identical test files (LSPRAG's initial/ and final/ folders, repeated runs of
+a baseline) are executed once: EvaluationCache keys each outcome by the file
+content, the target project and the interpreter, and replays the stored
+outcome, log and coverage data into every other report folder. Outcomes
+are kept across runs only with --cache-dir.
+
+With --tracer monitoring the tests run under monitoring_coverage.py instead
+of `coverage run`: on Python 3.12+ it traces with sys.monitoring, only in the
+project's files and only until each line has been seen once, and writes the
+same coverage data files; older interpreters fall back to `coverage run`.
+
+Usage:
+    python python_evaluator.py <target_project_path> <test_save_dir> [report_dir] [timeout_seconds]
+        [--no-cache] [--cache-dir [DIR]] [--hang-retry] [--memory-limit-mb N] [--tracer coverage|monitoring]
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from focal_coverage import popcount, read_coverage_py_data
+from resource_limits import adaptive_timeout, killed_by_cpu_limit, limited_command, run_measured
+from test_file_map import discover_test_files
+
+DEFAULT_TIMEOUT_SECONDS = 3
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Module and environment variable of pytest_outcome_plugin.py (not imported here: it needs pytest)
+OUTCOME_PLUGIN = "pytest_outcome_plugin"
+OUTCOME_FILE_ENV = "LSPRAG_OUTCOME_FILE"
+CATEGORIES = ("pass", "assertion", "error", "hang")
+TRACERS = ("coverage", "monitoring")
+MONITORING_TRACER = os.path.join(SCRIPTS_DIR, "monitoring_coverage.py")
+# Part of every EvaluationCache key (with the plugin's source): bump when the stored outcome
+# or the category rules change
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "lsprag", "evaluations"
+)
+
+
+def project_pythonpath(project_path: str) -> str:
+    """Same import roots python_coverage.bash exports."""
+    return f"{project_path}:{project_path}/src:{project_path}/src/black:{project_path}/crawl4ai"
+
+
+def coverage_include(project_path: str) -> Optional[str]:
+    """The --include glob python_coverage.bash reports on, relative to the project."""
+    if project_path.endswith("crawl4ai"):
+        return "crawl4ai/"
+    if project_path.endswith("black"):
+        return "src/"
+    if project_path.endswith("tornado"):
+        return "tornado/"
+    return None
+
+
+def coverage_command(project_path: str, data_file: str, tracer: str = "coverage") -> List[str]:
+    """Command prefix that runs `-m pytest ...` with coverage recorded into data_file."""
+    if tracer == "monitoring":
+        include = os.path.join(os.path.abspath(project_path), coverage_include(project_path) or "")
+        return [MONITORING_TRACER, "--data-file", data_file, "--include", include]
+    return ["-m", "coverage", "run", f"--data-file={data_file}"]
+
+
+def project_fingerprint(project_path: str) -> str:
+    """Hash of (path, size, mtime) of the project's sources, so cached outcomes expire when it changes."""
+    root = os.path.join(project_path, coverage_include(project_path) or "")
+    h = hashlib.sha256()
+    for dirpath, dirnames, files in os.walk(root):
+        dirnames.sort()
+        for file_name in sorted(files):
+            if not file_name.endswith(".py"):
+                continue
+            path = os.path.join(dirpath, file_name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            h.update(f"{os.path.relpath(path, root)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+@dataclass
+class FileOutcome:
+    """Result of running one test file."""
+    test_file: str
+    status: str                  # "passed" | "failed" | "error" | "hanging"
+    exit_code: int
+    duration: float
+    data_file: Optional[str]     # coverage data, None unless passed/failed
+    log_path: str
+    category: str = "error"      # "pass" | "assertion" | "error" | "hang" (see pytest_outcome_plugin.py)
+    outcome_file: Optional[str] = None  # the plugin's JSON (counts, assertion failure texts)
+
+
+def _name(test_file: str) -> str:
+    test_name = os.path.basename(test_file)
+    return test_name[:-3] if test_name.endswith(".py") else test_name
+
+
+def fallback_category(status: str) -> str:
+    """Category when the plugin wrote nothing (killed run, pytest never started)."""
+    return {"passed": "pass", "failed": "assertion", "hanging": "hang"}.get(status, "error")
+
+
+def read_outcome(outcome_file: Optional[str]) -> Optional[Dict]:
+    if not outcome_file or not os.path.exists(outcome_file):
+        return None
+    try:
+        with open(outcome_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def evaluate_test_file(
+    project_path: str,
+    test_file: str,
+    report_dir: str,
+    python: str = sys.executable,
+    env: Optional[Dict[str, str]] = None,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    retry_hangs: bool = False,
+    memory_mb: Optional[int] = None,
+    tracer: str = "coverage",
+) -> FileOutcome:
+    """
+    Run one test file under coverage + pytest and classify it like python_coverage.bash.
+    With retry_hangs a timed-out file gets a second run with adaptive_timeout(timeout).
+    """
+    test_name = os.path.basename(test_file)
+    logs_dir = os.path.join(report_dir, "logs")
+    data_dir = os.path.join(report_dir, "per_test_coverage")
+    os.makedirs(logs_dir, exist_ok=True)
+    os.makedirs(data_dir, exist_ok=True)
+    log_path = os.path.join(logs_dir, f"{test_name[:-3] if test_name.endswith('.py') else test_name}.log")
+    data_file = os.path.join(data_dir, f"{test_name}.coverage")
+    outcomes_dir = os.path.join(report_dir, "outcomes")
+    os.makedirs(outcomes_dir, exist_ok=True)
+    outcome_file = os.path.join(outcomes_dir, f"{_name(test_file)}.json")
+    if os.path.exists(outcome_file):
+        os.remove(outcome_file)
+
+    run_env = dict(os.environ if env is None else env)
+    # The plugin's directory goes last so it never shadows a project module
+    run_env["PYTHONPATH"] = f"{project_pythonpath(project_path)}:{SCRIPTS_DIR}"
+    run_env[OUTCOME_FILE_ENV] = outcome_file
+    cmd = [python] + coverage_command(project_path, data_file, tracer) + [
+        "-m", "pytest", "-vv", "--tb=long", "-p", OUTCOME_PLUGIN, test_file]
+
+    attempts = [timeout, adaptive_timeout(timeout)] if retry_hangs else [timeout]
+    start = time.monotonic()
+    with open(log_path, "w") as log:
+        log.write(f"Running test file: {test_name} (timeout: {timeout}s)\n")
+        log.flush()
+        for attempt, attempt_timeout in enumerate(attempts):
+            if attempt:
+                log.write(f"Retrying {test_name} with timeout {attempt_timeout}s\n")
+                log.flush()
+            try:
+                returncode, cpu_used = run_measured(limited_command(cmd, attempt_timeout, memory_mb),
+                                                    attempt_timeout, stdout=log, stderr=subprocess.STDOUT,
+                                                    cwd=project_path, env=run_env)
+                exit_code = 124 if killed_by_cpu_limit(returncode, cpu_used, attempt_timeout) else returncode
+            except subprocess.TimeoutExpired:
+                exit_code = 124
+            if exit_code != 124:
+                break
+            log.write(f"⚠ Hanging: {test_name} (timed out after {attempt_timeout}s)\n")
+    duration = time.monotonic() - start
+
+    if exit_code == 0:
+        status = "passed"
+    elif exit_code == 1:
+        status = "failed"
+    elif exit_code == 124:
+        status = "hanging"
+    else:
+        status = "error"
+    if status in ("hanging", "error") and os.path.exists(data_file):
+        os.remove(data_file)
+    recorded = read_outcome(outcome_file) if status != "hanging" else None
+    category = recorded["category"] if recorded else fallback_category(status)
+    return FileOutcome(test_file, status, exit_code, duration,
+                       data_file if os.path.exists(data_file) else None, log_path,
+                       category, outcome_file if recorded else None)
+
+
+@functools.lru_cache(maxsize=None)
+def _plugin_digest() -> str:
+    with open(os.path.join(SCRIPTS_DIR, OUTCOME_PLUGIN + ".py"), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class EvaluationCache:
+    """
+    Content-addressed store of test file outcomes.
+
+    The key is the sha256 of the test file bytes together with the project
+    path and source fingerprint, the interpreter and the timeout. Each entry
+    holds the outcome, the pytest log and the coverage data file; a hit copies
+    them into the requesting report folder instead of running pytest again.
+    Concurrent requests for the same key wait for the first one to finish.
+    Entries are written to cache_dir only when one is given. Hanging and
+    error outcomes are only shared within the process, since a timeout
+    under load or a broken environment says little about the next run.
+    Entries that are not in cache_dir keep their files in a private temp
+    dir, so a report folder deleted later cannot take them away.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._memory: Dict[str, Dict] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._private: Optional[tempfile.TemporaryDirectory] = None
+
+    def _fingerprint(self, project_path: str) -> str:
+        with self._lock:
+            if project_path not in self._fingerprints:
+                self._fingerprints[project_path] = project_fingerprint(project_path)
+            return self._fingerprints[project_path]
+
+    def key(self, project_path: str, test_file: str, python: str, timeout: float,
+            retry_hangs: bool = False, memory_mb: Optional[int] = None, tracer: str = "coverage") -> str:
+        h = hashlib.sha256(f"v{CACHE_VERSION}\0{_plugin_digest()}\0".encode())
+        with open(test_file, "rb") as f:
+            h.update(f.read())
+        h.update(f"\0{os.path.abspath(project_path)}\0{self._fingerprint(project_path)}".encode())
+        h.update(f"\0{os.path.realpath(python)}\0{timeout}\0{retry_hangs}\0{memory_mb}\0{tracer}".encode())
+        return h.hexdigest()
+
+    def _entry_dir(self, key: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, key[:2], key) if self.cache_dir else None
+
+    def _load(self, key: str) -> Optional[Dict]:
+        if key in self._memory:
+            return self._memory[key]
+        entry_dir = self._entry_dir(key)
+        if entry_dir is None:
+            return None
+        try:
+            with open(os.path.join(entry_dir, "outcome.json"), "r") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        self._memory[key] = self._point_at(entry, entry_dir)
+        return entry
+
+    @staticmethod
+    def _point_at(entry: Dict, entry_dir: str) -> Dict:
+        entry["log"] = os.path.join(entry_dir, "pytest.log")
+        entry["data"] = os.path.join(entry_dir, "data.coverage") if entry["has_data"] else None
+        entry["outcome"] = os.path.join(entry_dir, "tests.json") if entry.get("has_outcome") else None
+        return entry
+
+    @staticmethod
+    def _copy_files(outcome: FileOutcome, entry_dir: str) -> None:
+        os.makedirs(entry_dir, exist_ok=True)
+        shutil.copyfile(outcome.log_path, os.path.join(entry_dir, "pytest.log"))
+        if outcome.data_file:
+            shutil.copyfile(outcome.data_file, os.path.join(entry_dir, "data.coverage"))
+        if outcome.outcome_file:
+            shutil.copyfile(outcome.outcome_file, os.path.join(entry_dir, "tests.json"))
+
+    def _private_dir(self, key: str) -> str:
+        with self._lock:
+            if self._private is None:
+                self._private = tempfile.TemporaryDirectory(prefix="evaluation-cache-")
+            return os.path.join(self._private.name, key)
+
+    def _store(self, key: str, outcome: FileOutcome) -> None:
+        entry = {"status": outcome.status, "exit_code": outcome.exit_code,
+                 "duration": outcome.duration, "has_data": outcome.data_file is not None,
+                 "category": outcome.category, "has_outcome": outcome.outcome_file is not None,
+                 "source": outcome.test_file, "log": outcome.log_path, "data": outcome.data_file,
+                 "outcome": outcome.outcome_file}
+        # Replays must not depend on the report folder the outcome was written to
+        entry_dir = self._entry_dir(key)
+        if entry_dir is not None and outcome.status not in ("hanging", "error"):
+            tmp = f"{entry_dir}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                self._copy_files(outcome, tmp)
+                with open(os.path.join(tmp, "outcome.json"), "w") as f:
+                    json.dump({k: entry[k] for k in ("status", "exit_code", "duration", "has_data", "category",
+                                                     "has_outcome", "source")}, f)
+                os.rename(tmp, entry_dir)
+                self._memory[key] = self._point_at(entry, entry_dir)
+                return
+            except OSError:
+                # Another process stored the same key first, or the cache is not writable
+                shutil.rmtree(tmp, ignore_errors=True)
+        private_dir = self._private_dir(key)
+        try:
+            self._copy_files(outcome, private_dir)
+            self._point_at(entry, private_dir)
+        except OSError as e:
+            print(f"Warning: could not keep the outcome of {outcome.test_file} for reuse: {e}")
+        self._memory[key] = entry
+
+    def evaluate(
+        self,
+        project_path: str,
+        test_file: str,
+        report_dir: str,
+        python: str = sys.executable,
+        env: Optional[Dict[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        retry_hangs: bool = False,
+        memory_mb: Optional[int] = None,
+        tracer: str = "coverage",
+    ) -> FileOutcome:
+        """Drop-in replacement for evaluate_test_file that runs each unique file once."""
+        key = self.key(project_path, test_file, python, timeout, retry_hangs, memory_mb, tracer)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._load(key)
+            if entry is None:
+                self.misses += 1
+                outcome = evaluate_test_file(project_path, test_file, report_dir, python, env, timeout,
+                                             retry_hangs, memory_mb, tracer)
+                self._store(key, outcome)
+                return outcome
+            self.hits += 1
+            return self._replay(entry, test_file, report_dir)
+
+    @staticmethod
+    def _replay(entry: Dict, test_file: str, report_dir: str) -> FileOutcome:
+        test_name = os.path.basename(test_file)
+        logs_dir = os.path.join(report_dir, "logs")
+        data_dir = os.path.join(report_dir, "per_test_coverage")
+        os.makedirs(logs_dir, exist_ok=True)
+        os.makedirs(data_dir, exist_ok=True)
+        log_path = os.path.join(logs_dir, f"{test_name[:-3] if test_name.endswith('.py') else test_name}.log")
+        with open(log_path, "w") as log:
+            log.write(f"Reused result of identical test file: {entry['source']}\n")
+            if entry["log"] and os.path.exists(entry["log"]):
+                with open(entry["log"], "r", errors="replace") as f:
+                    log.write(f.read())
+        data_file = None
+        if entry["data"] and os.path.exists(entry["data"]):
+            data_file = os.path.join(data_dir, f"{test_name}.coverage")
+            shutil.copyfile(entry["data"], data_file)
+        elif entry["data"]:
+            print(f"Warning: cached coverage data {entry['data']} is missing; {test_name} counts as covering nothing")
+        outcome_file = None
+        if entry.get("outcome") and os.path.exists(entry["outcome"]):
+            outcomes_dir = os.path.join(report_dir, "outcomes")
+            os.makedirs(outcomes_dir, exist_ok=True)
+            outcome_file = os.path.join(outcomes_dir, f"{_name(test_file)}.json")
+            shutil.copyfile(entry["outcome"], outcome_file)
+        category = entry.get("category") or fallback_category(entry["status"])
+        return FileOutcome(test_file, entry["status"], entry["exit_code"], 0.0, data_file, log_path,
+                           category, outcome_file)
+
+
+class FolderEvaluation:
+    """Running totals for one test folder; outcomes can be added in any order."""
+
+    def __init__(self, project_path: str, test_dir: str, report_dir: Optional[str] = None):
+        self.project_path = os.path.abspath(project_path)
+        self.test_dir = os.path.abspath(test_dir)
+        self.report_dir = os.path.abspath(report_dir or f"{self.test_dir.rstrip(os.sep)}-report")
+        self.outcomes: Dict[str, FileOutcome] = {}
+        self.covered: Dict[str, int] = {}
+        self._include = coverage_include(self.project_path)
+        self._lock = threading.Lock()
+
+    def reset_report_dir(self) -> None:
+        shutil.rmtree(self.report_dir, ignore_errors=True)
+        os.makedirs(self.report_dir, exist_ok=True)
+
+    def add(self, outcome: FileOutcome) -> None:
+        """Record an outcome and merge its covered lines into the running totals."""
+        file_cov = {}
+        if outcome.data_file:
+            try:
+                file_cov = read_coverage_py_data(outcome.data_file, self.project_path)
+            except Exception as e:
+                print(f"Warning: could not read coverage data {outcome.data_file}: {e}")
+        with self._lock:
+            self.outcomes[outcome.test_file] = outcome
+            for path, cov in file_cov.items():
+                if self._include is None or path.startswith(self._include):
+                    self.covered[path] = self.covered.get(path, 0) | cov.covered
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {"passed": 0, "failed": 0, "error": 0, "hanging": 0}
+            for outcome in self.outcomes.values():
+                counts[outcome.status] += 1
+            return counts
+
+    def category_counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {category: 0 for category in CATEGORIES}
+            for outcome in self.outcomes.values():
+                counts[outcome.category] += 1
+            return counts
+
+    def covered_lines(self) -> int:
+        with self._lock:
+            return sum(popcount(bits) for bits in self.covered.values())
+
+    def progress_line(self) -> str:
+        c = self.counts()
+        return (f"{self.test_dir}: {len(self.outcomes)} files | passed={c['passed']} failed={c['failed']} "
+                f"error={c['error']} hanging={c['hanging']} | covered lines={self.covered_lines()}")
+
+    def finalize(self, python: str = sys.executable, env: Optional[Dict[str, str]] = None) -> str:
+        """
+        Write the logs python_coverage.bash writes, combine coverage and return
+        the printed summary (same lines as the bash script).
+        """
+        ordered = sorted(self.outcomes.values(), key=lambda o: o.test_file)
+        out: List[str] = []
+        c = self.counts()
+        categories = self.category_counts()
+        self._write_assertion_errors(ordered)
+
+        with open(os.path.join(self.report_dir, "failed_tests.log"), "w") as failed_log, \
+                open(os.path.join(self.report_dir, "skipped_tests.log"), "w") as skipped_log, \
+                open(os.path.join(self.report_dir, "hanging_tests.txt"), "w") as hanging_log, \
+                open(os.path.join(self.report_dir, "pytest_output.log"), "w") as pytest_log:
+            for o in ordered:
+                name = os.path.basename(o.test_file)
+                if o.status == "passed":
+                    out.append(f"✓ Passed: {name}")
+                elif o.status == "failed":
+                    out.append(f"✗ Failed (Assertion): {name}")
+                    failed_log.write(f"{name} (Assertion Error)\n")
+                elif o.status == "hanging":
+                    out.append(f"⚠ Hanging: {name} (timed out)")
+                    hanging_log.write(f"{o.test_file}\n")
+                else:
+                    out.append(f"⚠ Skipped (Error): {name} (Exit code: {o.exit_code})")
+                    skipped_log.write(f"{name} (Exit code: {o.exit_code})\n")
+                if os.path.exists(o.log_path):
+                    pytest_log.write(f"===== {name} =====\n")
+                    with open(o.log_path, "r", errors="replace") as f:
+                        pytest_log.write(f.read())
+                    pytest_log.write("\n")
+
+        out.append("Test execution completed")
+        out.append("-------------------")
+        out.append(f"Files: {c['passed']} passed, {c['failed']} failed (assertions), "
+                   f"{c['error']} skipped (errors), {c['hanging']} hanging (timeout)")
+        out.append(f"Outcome categories: {categories['pass']} pass, {categories['assertion']} assertion failure, "
+                   f"{categories['error']} error, {categories['hang']} hang")
+
+        out.extend(self._coverage_report(ordered, python, env))
+
+        with open(os.path.join(self.report_dir, "summary.txt"), "w") as f:
+            f.write("Coverage Collection Summary\n")
+            f.write("=========================\n")
+            f.write(f"Total test files: {len(ordered)}\n")
+            f.write(f"Passed files: {c['passed']}\n")
+            f.write(f"Failed files (assertions): {c['failed']}\n")
+            f.write(f"Skipped files (errors): {c['error']}\n")
+            f.write(f"Hanging files (timeout): {c['hanging']}\n")
+            for category in CATEGORIES:
+                f.write(f"Category {category}: {categories[category]}\n")
+            f.write(f"Assertion errors (with tracebacks) in: {os.path.join(self.report_dir, 'assertion_errors.log')}\n")
+            f.write(f"Coverage data file: {os.path.join(self.report_dir, '.coverage')}\n")
+
+        out.append(f"Coverage collection completed. Summary saved to {os.path.join(self.report_dir, 'summary.txt')}")
+        out.append(f"PassRate ((passed files + failed files)/ total files): {c['passed'] + c['failed']}/{len(ordered)}")
+        # python_passrate.py's metric, from the same run: assertion failures are allowed, errors and hangs are not
+        no_errors = categories["pass"] + categories["assertion"]
+        out.append(f"Files without runtime/compilation errors: {no_errors}")
+        out.append(f"Pass Rate (per-file basis): {no_errors / len(ordered) * 100 if ordered else 0.0:.2f}%")
+        return "\n".join(out)
+
+    def _write_assertion_errors(self, ordered: List[FileOutcome]) -> None:
+        """assertion_errors.log as python_coverage.bash writes it, from the plugin's failure texts."""
+        with open(os.path.join(self.report_dir, "assertion_errors.log"), "w") as log:
+            for o in ordered:
+                recorded = read_outcome(o.outcome_file)
+                if not recorded or not recorded.get("assertion_failures"):
+                    continue
+                log.write(f"===== {os.path.basename(o.test_file)} =====\n")
+                for failure in recorded["assertion_failures"]:
+                    log.write(f"{failure['nodeid']}\n{failure['text']}\n")
+                log.write("\n")
+
+    def _coverage_report(self, ordered: List[FileOutcome], python: str, env: Optional[Dict[str, str]]) -> List[str]:
+        """Combine per-test data (keeping the originals) and run `coverage report`."""
+        data_files = [o.data_file for o in ordered if o.data_file and os.path.exists(o.data_file)]
+        combined = os.path.join(self.report_dir, ".coverage")
+        run_env = dict(os.environ if env is None else env)
+        lines = ["Combining coverage data..."]
+        with tempfile.TemporaryDirectory(dir=self.report_dir) as tmp:
+            # `coverage combine` deletes its inputs; combine copies so per_test_coverage stays intact
+            copies = []
+            for i, data_file in enumerate(data_files):
+                copy = os.path.join(tmp, f"{i}.coverage")
+                shutil.copyfile(data_file, copy)
+                copies.append(copy)
+            if copies:
+                run_env["COVERAGE_FILE"] = combined
+                subprocess.run([python, "-m", "coverage", "combine"] + copies, cwd=self.project_path,
+                               env=run_env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        lines.append("Generating coverage report...")
+        include = coverage_include(self.project_path)
+        if include and os.path.exists(combined):
+            proc = subprocess.run(
+                [python, "-m", "coverage", "report", f"--data-file={combined}",
+                 f"--include={os.path.join(self.project_path, include)}*"],
+                cwd=self.project_path, env=run_env, capture_output=True, text=True,
+            )
+            lines.append(proc.stdout.rstrip("\n"))
+        return lines
+
+
+def evaluate_folder(
+    project_path: str,
+    test_dir: str,
+    report_dir: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    python: str = sys.executable,
+    env: Optional[Dict[str, str]] = None,
+    jobs: Optional[int] = None,
+    cache: Optional[EvaluationCache] = None,
+    retry_hangs: bool = False,
+    memory_mb: Optional[int] = None,
+    tracer: str = "coverage",
+) -> str:
+    """
+    Evaluate every test file in test_dir in parallel and return the summary output.
+    With a cache, files already evaluated (in this or an earlier run) are not run again.
+    """
+    evaluation = FolderEvaluation(project_path, test_dir, report_dir)
+    evaluation.reset_report_dir()
+    # Same file set as python_coverage.bash: *_test.py only
+    test_files = discover_test_files(evaluation.test_dir, prefixes=())
+    jobs = jobs or max(1, (os.cpu_count() or 4) * 3 // 4)
+    print(f"Found {len(test_files)} test files")
+    print(f"Running tests in parallel with {timeout}s timeout using {jobs} jobs...")
+
+    evaluate = cache.evaluate if cache is not None else evaluate_test_file
+    with ThreadPoolExecutor(max_workers=jobs) as ex:
+        futures = [
+            ex.submit(evaluate, evaluation.project_path, tf, evaluation.report_dir, python, env, timeout,
+                      retry_hangs, memory_mb, tracer)
+            for tf in test_files
+        ]
+        for fut in futures:
+            evaluation.add(fut.result())
+    return evaluation.finalize(python, env)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Evaluate a folder of generated Python tests (pass rate + coverage).")
+    ap.add_argument("project_path")
+    ap.add_argument("test_dir")
+    ap.add_argument("report_dir", nargs="?", default=None)
+    ap.add_argument("timeout", nargs="?", type=float, default=DEFAULT_TIMEOUT_SECONDS)
+    ap.add_argument("--no-cache", action="store_true", help="Run every file even if an identical one was evaluated.")
+    ap.add_argument("--cache-dir", nargs="?", const=DEFAULT_CACHE_DIR, default=None, metavar="DIR",
+                    help=f"Also keep outcomes across runs in DIR (default DIR: {DEFAULT_CACHE_DIR}).")
+    ap.add_argument("--hang-retry", action="store_true",
+                    help="Run a file that timed out once more with a longer timeout before counting it as hanging.")
+    ap.add_argument("--memory-limit-mb", type=int, default=None, help="Address-space limit of each test run.")
+    ap.add_argument("--tracer", choices=TRACERS, default="coverage",
+                    help="monitoring: sys.monitoring line tracer limited to the project (Python 3.12+).")
+    args = ap.parse_args()
+    cache = None if args.no_cache else EvaluationCache(args.cache_dir)
+    print(evaluate_folder(args.project_path, args.test_dir, args.report_dir, args.timeout, cache=cache,
+                          retry_hangs=args.hang_retry, memory_mb=args.memory_limit_mb, tracer=args.tracer))
+    if cache is not None:
+        print(f"Evaluation cache: {cache.hits} reused, {cache.misses} executed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,110 @@
 #!/usr/bin/env python3
+"""
+Per-file pass rate of generated Python tests.
 
+A file passes if running it produces no runtime/compilation error: assertion
+failures are allowed, while anything printed to stderr or the word "Error" in
+pytest's output makes the file an error (see file_errors).
+
+By default the tests run in a fork pool: this process imports pytest and the
+target package (black, tornado, ...) once, and every test file runs in a
+forked child of it with pytest.main() (after one warm-up session has
+imported pytest's plugins). The children write their output to
+files and stream a small summary back over a pipe, so a file costs a fork
+plus its own collection instead of a new interpreter, plugin loading and the
+import of the whole project. --subprocess keeps the original one `pytest`
+process per file (with pytest-json-report).
+
+When coverage is collected anyway, python_evaluator.py prints the same
+"Files without runtime/compilation errors" / "Pass Rate" lines from its
+single coverage run (via pytest_outcome_plugin.py), without this script.
+
+Usage:
+    python python_passrate.py <project_path> <test_directory> [--jobs N] [--timeout SEC]
+        [--preload MODULE ...] [--subprocess]
+"""
+
+import argparse
+import gc
+import importlib
+import json
 import os
+import select
+import shutil
+import signal
 import sys
 import subprocess
-import json
 import tempfile
 import multiprocessing
+import time
 from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from test_file_map import discover_test_files as _discover
+
+PYTEST_ARGS = ["--maxfail=1", "--disable-warnings"]  # stop on first fail/error within that file
+
 
 def discover_test_files(test_dir):
     """
-    Returns a list of test-file paths. 
+    Returns a list of test-file paths.
     Adjust the pattern as desired (e.g. test_*.py).
     """
-    test_files = []
-    for root, dirs, files in os.walk(test_dir):
-        for file_name in files:
-            if file_name.endswith("_test.py"):
-                test_files.append(os.path.join(root, file_name))
-    return test_files
+    return _discover(test_dir, prefixes=(), skip_reports=False)
+
+
+def project_roots(project_path: str) -> List[str]:
+    return [project_path, f"{project_path}/src", f"{project_path}/src/black", f"{project_path}/crawl4ai"]
+
+
+def default_preload(project_path: str) -> List[str]:
+    """The project's own package (black, tornado, crawl4ai, ...) if it sits on one of the import roots."""
+    name = os.path.basename(os.path.normpath(project_path))
+    for root in project_roots(project_path):
+        if os.path.isfile(os.path.join(root, name, "__init__.py")):
+            return [name]
+    return []
+
+
+def file_errors(stdout: str, stderr: str, summary: Optional[Dict[str, int]]) -> Dict[str, int]:
+    """
+    Classify one file's run: any "Error" in pytest's output, anything on stderr or a run that
+    produced no summary counts as an error, in both modes, so pass rates stay comparable.
+    """
+    if "Error" in stdout:
+        return {"errors": 1, "failures": 0}
+    if stderr:
+        return {"errors": 1, "failures": 0}
+    if summary is None:
+        # If it didn't produce a summary, something big went wrong (treat as error).
+        return {"errors": 1, "failures": 0}
+    return {"errors": summary.get("errors", 0), "failures": summary.get("failures", 0)}
+
 
 def run_pytest(project_path, file_path):
     """
-    Runs pytest on a single test file with JSON output, 
+    Runs pytest on a single test file with JSON output,
     returning a dict with 'errors' and 'failures'.
     """
     with tempfile.TemporaryDirectory() as tmp_dir:
         # File to store the JSON report
         report_json = os.path.join(tmp_dir, "report.json")
-        
+
         # Run pytest with JSON reporting
         cmd = [
             "pytest",
             file_path,
-            "--maxfail=1",           # stop on first fail/error within that file
+            *PYTEST_ARGS,
             "--json-report",         # enable JSON plugin
             f"--json-report-file={report_json}",
-            "--disable-warnings",
         ]
         env = os.environ.copy()
-        env["PYTHONPATH"] = f"{project_path}:{project_path}/src:{project_path}/src/black:{project_path}/crawl4ai"
-        
+        env["PYTHONPATH"] = ":".join(project_roots(project_path))
+
         # We don’t rely on returncode alone, because any test fail or error => returncode=1
         result = subprocess.run(
-            cmd, 
-            stdout=subprocess.PIPE, 
+            cmd,
+            stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             cwd=project_path,  # Set working directory
             env=env        # Set environment variables
@@ -52,83 +112,243 @@ def run_pytest(project_path, file_path):
         print(f"\nTest file: {file_path}")
         print("stdout:", result.stdout.decode())
         print("stderr:", result.stderr.decode())
-        if "Error" in result.stdout.decode():
-            return {"errors": 1, "failures": 0}
-        if result.stderr:
-            return {"errors": 1, "failures": 0}
-        # Now parse the JSON report
-        if not os.path.exists(report_json):
-            # If it didn't produce a JSON, something big went wrong (treat as error).
-            return {"errors": 1, "failures": 0}
-        
-        with open(report_json, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            # The JSON includes "summary": {"passed", "failed", "errors", "skipped"}
-            summary = data.get("summary", {})
-            return {
-                "errors": summary.get("errors", 0),
-                "failures": summary.get("failed", 0)
-            }
+        summary = None
+        if os.path.exists(report_json):
+            with open(report_json, "r", encoding="utf-8") as f:
+                # The JSON includes "summary": {"passed", "failed", "errors", "skipped"}
+                data = json.load(f).get("summary", {})
+                summary = {"errors": data.get("errors", 0), "failures": data.get("failed", 0)}
+        return file_errors(result.stdout.decode(), result.stderr.decode(), summary)
+
+
+class _Summary:
+    """pytest plugin counting failed tests and errors (collection, setup, teardown) in the child."""
+
+    def __init__(self):
+        self.failures = 0
+        self.errors = 0
+
+    def pytest_runtest_logreport(self, report):
+        if report.failed:
+            if report.when == "call":
+                self.failures += 1
+            else:
+                self.errors += 1
+
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self.errors += 1
+
+
+class PytestForkPool:
+    """Imports pytest and the target package once; runs each test file in a forked child."""
+
+    def __init__(self, project_path: str, preload: Sequence[str] = (), jobs: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        self.project_path = os.path.abspath(project_path)
+        roots = project_roots(self.project_path)
+        # Same environment the per-file pytest processes got
+        os.environ["PYTHONPATH"] = ":".join(roots)
+        for root in reversed(roots):
+            if root not in sys.path:
+                sys.path.insert(0, root)
+        os.chdir(self.project_path)
+        import pytest
+        self.pytest = pytest
+        self.preloaded = []
+        for name in preload:
+            try:
+                importlib.import_module(name)
+                self.preloaded.append(name)
+            except Exception as e:
+                print(f"[warn] could not preload {name}: {e!r}")
+        self.jobs = max(1, jobs or multiprocessing.cpu_count())
+        self.timeout = timeout
+        self.out_dir = tempfile.mkdtemp(prefix="passrate-")
+        self._warm_up()
+        # Keep the preloaded objects out of the children's garbage collections (and their pages shared)
+        gc.freeze()
+
+    def _warm_up(self) -> None:
+        """One empty pytest session, so the children find pytest's plugins already imported."""
+        empty = os.path.join(self.out_dir, "warm-up")
+        os.makedirs(empty)
+        sys.stdout.flush()
+        saved = os.dup(1)
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+        try:
+            self.pytest.main([empty, "-q", "-p", "no:cacheprovider"])
+        except BaseException:
+            pass
+        finally:
+            sys.stdout.flush()
+            os.dup2(saved, 1)
+            os.close(saved)
+            os.close(devnull)
+
+    def close(self) -> None:
+        shutil.rmtree(self.out_dir, ignore_errors=True)
+
+    def _outputs(self, index: int) -> Tuple[str, str]:
+        return os.path.join(self.out_dir, f"{index}.out"), os.path.join(self.out_dir, f"{index}.err")
+
+    def _child(self, index: int, test_file: str, wfd: int) -> None:
+        out_path, err_path = self._outputs(index)
+        for fd, path in ((1, out_path), (2, err_path)):
+            target = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            os.dup2(target, fd)
+            os.close(target)
+        summary = _Summary()
+        try:
+            exit_code = int(self.pytest.main([test_file] + PYTEST_ARGS, plugins=[summary]))
+        except BaseException as e:
+            exit_code = 3
+            print(f"Internal error running {test_file}: {e!r}", file=sys.stderr)
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.write(wfd, json.dumps({"exit_code": exit_code, "errors": summary.errors,
+                                      "failures": summary.failures}).encode())
+        finally:
+            os._exit(0)
+
+    def _spawn(self, index: int, test_file: str) -> Tuple[int, int]:
+        # Unflushed output of this process would otherwise be written again by the child
+        sys.stdout.flush()
+        sys.stderr.flush()
+        rfd, wfd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(rfd)
+            self._child(index, test_file, wfd)
+        os.close(wfd)
+        return pid, rfd
+
+    def _finish(self, index: int, test_file: str, pid: int, rfd: int, timed_out: bool, start: float) -> Dict:
+        if timed_out:
+            os.kill(pid, signal.SIGKILL)
+        chunks = []
+        while not timed_out:
+            chunk = os.read(rfd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        os.close(rfd)
+        os.waitpid(pid, 0)
+        out_path, err_path = self._outputs(index)
+        outputs = []
+        for path in (out_path, err_path):
+            try:
+                with open(path, "r", errors="replace") as f:
+                    outputs.append(f.read())
+                os.remove(path)
+            except OSError:
+                outputs.append("")
+        stdout, stderr = outputs
+        if timed_out:
+            stderr += f"\nTimed out after {self.timeout}s\n"
+        try:
+            summary = json.loads(b"".join(chunks).decode()) if chunks else None
+        except ValueError:
+            summary = None
+        return {"test_file": test_file, "stdout": stdout, "stderr": stderr, "summary": summary,
+                "duration": time.monotonic() - start, **file_errors(stdout, stderr, summary)}
+
+    def run(self, test_files: List[str]) -> Iterator[Dict]:
+        """Yield one result per test file as children finish (up to `jobs` at a time)."""
+        running: Dict[int, Tuple[int, int, str, float]] = {}  # rfd -> (index, pid, test_file, start)
+        next_index = 0
+        while next_index < len(test_files) or running:
+            while next_index < len(test_files) and len(running) < self.jobs:
+                pid, rfd = self._spawn(next_index, test_files[next_index])
+                running[rfd] = (next_index, pid, test_files[next_index], time.monotonic())
+                next_index += 1
+            wait = None
+            if self.timeout:
+                oldest = min(start for _, _, _, start in running.values())
+                wait = max(0.0, oldest + self.timeout - time.monotonic())
+            # A child's pipe becomes readable when it wrote its summary or died
+            ready, _, _ = select.select(list(running), [], [], wait)
+            now = time.monotonic()
+            for rfd in list(running):
+                index, pid, test_file, start = running[rfd]
+                timed_out = rfd not in ready and self.timeout is not None and now - start >= self.timeout
+                if rfd in ready or timed_out:
+                    del running[rfd]
+                    yield self._finish(index, test_file, pid, rfd, timed_out, start)
+
 
 def main():
-    if len(sys.argv) < 3:
-        print(f"Usage: {sys.argv[0]} <project_path> <test_directory> ")
-        sys.exit(1)
-    
-    project_path = sys.argv[1]
-    test_dir = sys.argv[2]
+    ap = argparse.ArgumentParser(description="Per-file pass rate (no runtime/compilation errors) of generated tests.")
+    ap.add_argument("project_path")
+    ap.add_argument("test_directory")
+    ap.add_argument("--jobs", type=int, default=multiprocessing.cpu_count())
+    ap.add_argument("--timeout", type=float, default=None, help="Seconds per test file (fork pool; a timeout is an error).")
+    ap.add_argument("--preload", nargs="*", default=None,
+                    help="Modules imported once before forking (default: the project's own package).")
+    ap.add_argument("--subprocess", action="store_true", help="Run one pytest process per file instead of forking.")
+    args = ap.parse_args()
+
+    project_path = args.project_path
+    test_dir = args.test_directory
     if not os.path.isdir(test_dir):
         print(f"Error: {test_dir} is not a directory.")
         sys.exit(1)
-    
-    test_files = discover_test_files(test_dir)
+
+    test_files = [os.path.abspath(f) for f in discover_test_files(test_dir)]
     total_tests = len(test_files)
     if total_tests == 0:
         print("No test files discovered.")
         return
-    
+
     passed_files_count = 0
     completed_count = 0
 
-    max_workers = multiprocessing.cpu_count()
-    print(f"Running tests using {max_workers} cores")
-    
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all test files to the process pool
-        future_to_file = {
-            executor.submit(run_pytest, project_path, tfile): tfile 
-            for tfile in test_files
-        }
-        
-        # Process results as they complete
-        for future in as_completed(future_to_file):
-            tfile = future_to_file[future]
-            try:
-                results = future.result()
-                completed_count += 1
-                if results["errors"] == 0:
-                    passed_files_count += 1
-                print(f"##### Test file: {tfile}, current pass rate: {passed_files_count / completed_count * 100:.2f}% ({completed_count}/{total_tests}) #####")
-            except Exception as e:
-                print(f"Test file {tfile} generated an exception: {e}")
-    
+    def report(tfile: str, results: Dict) -> None:
+        nonlocal passed_files_count, completed_count
+        completed_count += 1
+        # Our rule: if "errors" == 0 => the file is "okay."
+        # (failures via assertion are allowed and do NOT count as an error)
+        if results["errors"] == 0:
+            passed_files_count += 1
+        print(f"##### Test file: {tfile}, current pass rate: {passed_files_count / completed_count * 100:.2f}% ({completed_count}/{total_tests}) #####")
+
+    max_workers = args.jobs
+    if args.subprocess or not hasattr(os, "fork"):
+        print(f"Running tests using {max_workers} cores")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # Submit all test files to the process pool
+            future_to_file = {
+                executor.submit(run_pytest, project_path, tfile): tfile
+                for tfile in test_files
+            }
+
+            # Process results as they complete
+            for future in as_completed(future_to_file):
+                tfile = future_to_file[future]
+                try:
+                    report(tfile, future.result())
+                except Exception as e:
+                    print(f"Test file {tfile} generated an exception: {e}")
+    else:
+        preload = default_preload(os.path.abspath(project_path)) if args.preload is None else args.preload
+        pool = PytestForkPool(project_path, preload, max_workers, args.timeout)
+        print(f"Running tests in {pool.jobs} forked workers (preloaded: {', '.join(pool.preloaded) or 'pytest only'})")
+        try:
+            for results in pool.run(test_files):
+                print(f"\nTest file: {results['test_file']}")
+                print("stdout:", results["stdout"])
+                print("stderr:", results["stderr"])
+                report(results["test_file"], results)
+        finally:
+            pool.close()
+
     pass_rate = (passed_files_count / total_tests) * 100
     print(f"\nFinal Results:")
     print(f"Total test files: {total_tests}")
     print(f"Files without runtime/compilation errors: {passed_files_count}")
     print(f"Pass Rate (per-file basis): {pass_rate:.2f}%")
-    # for i, tfile in enumerate(test_files):
-    #     results = run_pytest(project_path, tfile)
-    #     # Our rule: if "errors" == 0 => the file is “okay.” 
-    #     # (failures via assertion are allowed and do NOT count as an error)
-    #     if results["errors"] == 0:
-    #         passed_files_count += 1
-    #     print(f"##### Test file: {tfile}, current pass rate: {passed_files_count / (i + 1) * 100:.2f}% ##### ")
-    
-    # pass_rate = (passed_files_count / total_tests) * 100
-    # print(f"Total test files: {total_tests}")
-    # print(f"Files without runtime/compilation errors: {passed_files_count}")
-    # print(f"Pass Rate (per-file basis): {pass_rate:.2f}%")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Timeouts and resource limits for child processes that run generated tests.
+
+A single global timeout is either too short for slow-but-correct tests or
+far too long for an infinite loop. The runners here measure how long the
+unmodified tests take and give each run k x baseline + margin instead
+(adaptive_timeout), and cap every child with rlimits so a runaway test
+or mutant is stopped by the kernel: RLIMIT_CPU sends SIGXCPU to a busy
+loop, RLIMIT_AS turns a memory blow-up into a MemoryError.
+
+Used by python_evaluator.py (coverage runs) and by
+mutationTesting/compute_mutation_score.py and native_mutation.py.
+"""
+
+import math
+import os
+import signal
+import subprocess
+import time
+from typing import List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # not available on Windows; limits become no-ops
+    resource = None
+
+DEFAULT_TIMEOUT_FACTOR = 5.0
+DEFAULT_TIMEOUT_MARGIN = 1.0
+
+# Exit signal of a child past the RLIMIT_CPU soft limit; past the hard limit it gets SIGKILL,
+# which is only a CPU-limit kill if the child really used that much CPU (see killed_by_cpu_limit)
+CPU_LIMIT_SIGNAL = getattr(signal, "SIGXCPU", None)
+
+
+def adaptive_timeout(baseline: float, factor: float = DEFAULT_TIMEOUT_FACTOR,
+                     margin: float = DEFAULT_TIMEOUT_MARGIN) -> float:
+    """Timeout for a run whose unmodified version took `baseline` seconds."""
+    return factor * max(baseline, 0.0) + margin
+
+
+def apply_limits(cpu_seconds: Optional[float] = None, memory_mb: Optional[int] = None) -> None:
+    """Limit the calling process (and whatever it forks) in CPU seconds and address space."""
+    if resource is None:
+        return
+    if cpu_seconds:
+        _lower(resource.RLIMIT_CPU, *cpu_limits(cpu_seconds))
+    if memory_mb:
+        size = int(memory_mb) * 1024 * 1024
+        _lower(resource.RLIMIT_AS, size, size)
+
+
+def cpu_limits(cpu_seconds: float) -> Tuple[int, int]:
+    """(soft, hard) RLIMIT_CPU for a run allowed `cpu_seconds`: SIGXCPU at soft, SIGKILL at hard."""
+    soft = max(1, math.ceil(cpu_seconds))
+    return soft, soft + 1
+
+
+def _lower(which: int, soft: int, hard: int) -> None:
+    # Never raise an existing limit (that needs privileges) and never fail the child over it
+    cur_soft, cur_hard = resource.getrlimit(which)
+    if cur_hard != resource.RLIM_INFINITY:
+        hard = min(hard, cur_hard)
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(which, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def limited_command(cmd: List[str], cpu_seconds: Optional[float] = None,
+                    memory_mb: Optional[int] = None) -> List[str]:
+    """
+    cmd wrapped in `sh -c 'ulimit ...; exec "$@"'`. Unlike preexec_fn this is safe to
+    use from the worker threads the runners start subprocesses from.
+    """
+    if os.name != "posix" or not (cpu_seconds or memory_mb):
+        return list(cmd)
+    script = ""
+    if cpu_seconds:
+        # Both limits at hard first, then the soft one below it, as apply_limits sets them
+        soft, hard = cpu_limits(cpu_seconds)
+        script += f"ulimit -t {hard} 2>/dev/null; ulimit -S -t {soft} 2>/dev/null; "
+    if memory_mb:
+        script += f"ulimit -v {int(memory_mb) * 1024} 2>/dev/null; "
+    return ["sh", "-c", script + 'exec "$@"', "sh"] + list(cmd)
+
+
+def killed_by_cpu_limit(returncode: int, cpu_used: Optional[float] = None,
+                        cpu_seconds: Optional[float] = None) -> bool:
+    """
+    True for the returncode (subprocess) of a child the CPU limit of `cpu_seconds`
+    terminated: SIGXCPU, or SIGKILL once the child's `cpu_used` reached the hard
+    limit. Any other SIGKILL (the OOM killer, a user) is not a hang.
+    """
+    if returncode >= 0 or CPU_LIMIT_SIGNAL is None:
+        return False
+    if -returncode == CPU_LIMIT_SIGNAL:
+        return True
+    if -returncode != signal.SIGKILL or cpu_used is None or not cpu_seconds:
+        return False
+    # rusage is accounted in ticks, so allow the child to be a little short of the limit
+    return cpu_used >= cpu_limits(cpu_seconds)[1] - 0.1
+
+
+def exit_code(wait_status: int) -> int:
+    """A wait status as a subprocess returncode (-signal for a killed child)."""
+    if os.WIFSIGNALED(wait_status):
+        return -os.WTERMSIG(wait_status)
+    return os.WEXITSTATUS(wait_status)
+
+
+def run_measured(cmd: List[str], timeout: Optional[float] = None, **popen_kwargs) -> Tuple[int, Optional[float]]:
+    """
+    subprocess.run(cmd, timeout=timeout) that also returns the CPU seconds the
+    child used (None where os.wait4 is missing). Kills the child and raises
+    subprocess.TimeoutExpired on timeout.
+    """
+    proc = subprocess.Popen(cmd, **popen_kwargs)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    if not hasattr(os, "wait4"):
+        try:
+            return proc.wait(timeout), None
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+    delay = 0.001
+    while True:
+        pid, wait_status, usage = os.wait4(proc.pid, os.WNOHANG)
+        if pid:
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            proc.kill()
+            proc.wait()
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+    # Reaped here, so tell Popen not to wait for it again
+    proc.returncode = exit_code(wait_status)
+    return proc.returncode, usage.ru_utime + usage.ru_stime
@@ -0,0 +1,266 @@
+"""
+Persistent store for result_verifier.py runs.
+
+Every folder evaluation is one row in a SQLite table, so results from many
+verifier invocations accumulate in one file and can be re-aggregated without
+re-running the coverage scripts. Summaries (mean, spread, 95% confidence
+interval) are computed with GROUP BY in SQLite and every export (console CSV,
+CSV files, XLSX, LaTeX) is generated from the same aggregated table.
+"""
+
+import csv
+import math
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Column order and display names of the paper tables
+BASELINE_ORDER = ['code_qa', 'standard', 'naive', 'symprompt', 'lsprag', 'draco', 'lsprag-nofix']
+BASELINE_DISPLAY_NAMES = {
+    'code_qa': 'codeQA',
+    'standard': 'StandardRAG',
+    'naive': 'Naive',
+    'symprompt': 'SymPrompt',
+    'lsprag': 'LSPRAG',
+    'draco': 'DraCo',
+    'lsprag-nofix': 'LSPRAG-nofix'
+}
+MODEL_ORDER = {'gpt-4o-mini': 0, 'gpt-4o': 1, 'deepseek-chat': 2}
+METRICS = {'coverage': 'coverage_output', 'validrate': 'validrate_output'}
+
+# Two-sided 95% Student t critical values by degrees of freedom
+_T_95 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at TEXT NOT NULL,
+    project TEXT NOT NULL,
+    model TEXT NOT NULL,
+    baseline TEXT NOT NULL,
+    target_type TEXT NOT NULL,
+    folder_name TEXT NOT NULL,
+    folder_path TEXT,
+    coverage_output REAL,
+    validrate_output REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (project, model, baseline, target_type);
+-- Only the most recent evaluation of each folder counts towards summaries
+CREATE VIEW IF NOT EXISTS latest_runs AS
+    SELECT * FROM runs WHERE run_id IN (
+        SELECT MAX(run_id) FROM runs GROUP BY COALESCE(folder_path, folder_name), project, model, baseline, target_type
+    );
+"""
+
+
+def t_critical(df: int) -> float:
+    if df <= 0:
+        return float('nan')
+    return _T_95[df - 1] if df <= len(_T_95) else 1.96
+
+
+def row_label(project: str, model: str) -> str:
+    """Row id used in the paper tables, e.g. ("commons-cli", "gpt-4o-mini") -> "cli-4o-mini"."""
+    project_short = project.replace('commons-', '')
+    model_short = model.replace('gpt-4o-mini', '4o-mini').replace('gpt-4o', '4o').replace('deepseek-chat', 'deepseek')
+    return f"{project_short}-{model_short}"
+
+
+@dataclass
+class Aggregate:
+    """Aggregated metric of one (project, model, table column) cell."""
+    project: str
+    model: str
+    column: str
+    n: int
+    mean: Optional[float]
+    std: Optional[float]
+
+    @property
+    def ci95(self) -> Optional[float]:
+        """Half-width of the 95% confidence interval of the mean."""
+        if self.std is None or self.n < 2:
+            return None
+        return t_critical(self.n - 1) * self.std / math.sqrt(self.n)
+
+
+class ResultStore:
+    """SQLite-backed table with one row per evaluated result folder."""
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def add_results(self, results: Iterable, recorded_at: Optional[str] = None) -> int:
+        """Insert TestResult objects; returns the number of rows written."""
+        recorded_at = recorded_at or datetime.now().isoformat(timespec="seconds")
+        rows = [
+            (recorded_at, r.project, r.model, r.baseline, r.target_type, r.folder_name,
+             getattr(r, "folder_path", None), r.coverage_output, r.validrate_output, r.error)
+            for r in results
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO runs (recorded_at, project, model, baseline, target_type, folder_name, "
+                "folder_path, coverage_output, validrate_output, error) VALUES (?,?,?,?,?,?,?,?,?,?)",
+                rows,
+            )
+        return len(rows)
+
+    def aggregate(self, metric: str) -> List[Aggregate]:
+        """
+        Mean, sample standard deviation and count per (project, model, column).
+
+        Columns follow the paper tables: every baseline uses its "final" folders
+        (or "codes" when a baseline has no "final" folders) and "lsprag-nofix"
+        is the "initial" folders of the lsprag baseline.
+        """
+        col = METRICS[metric]
+        query = f"""
+            WITH selected AS (
+                SELECT project, model, baseline AS col, {col} AS v FROM latest_runs r
+                WHERE error IS NULL AND (
+                    target_type = 'final' OR (target_type = 'codes' AND NOT EXISTS (
+                        SELECT 1 FROM latest_runs f WHERE f.target_type = 'final'
+                        AND f.project = r.project AND f.model = r.model AND f.baseline = r.baseline))
+                )
+                UNION ALL
+                SELECT project, model, 'lsprag-nofix' AS col, {col} AS v FROM latest_runs
+                WHERE error IS NULL AND baseline = 'lsprag' AND target_type = 'initial'
+            )
+            SELECT project, model, col, COUNT(v), AVG(v), SUM(v * v)
+            FROM selected GROUP BY project, model, col
+        """
+        aggregates = []
+        for project, model, column, n, mean, sumsq in self.conn.execute(query):
+            std = None
+            if n >= 2:
+                std = math.sqrt(max(0.0, (sumsq - n * mean * mean) / (n - 1)))
+            aggregates.append(Aggregate(project, model, column, n, mean if n else None, std))
+        return aggregates
+
+    def project_models(self) -> List[Tuple[str, str]]:
+        """All (project, model) pairs, ordered as 4o-mini -> 4o -> deepseek within a project."""
+        pairs = self.conn.execute("SELECT DISTINCT project, model FROM latest_runs").fetchall()
+        return sorted(pairs, key=lambda pm: (pm[0], MODEL_ORDER.get(pm[1], 999)))
+
+    def pivot(self, metric: str) -> List[List]:
+        """Paper table as rows: [row_label, value per BASELINE_ORDER column (None if missing)]."""
+        cells: Dict[Tuple[str, str, str], Aggregate] = {
+            (a.project, a.model, a.column): a for a in self.aggregate(metric)
+        }
+        table = []
+        for project, model in self.project_models():
+            row = [row_label(project, model)]
+            for baseline in BASELINE_ORDER:
+                agg = cells.get((project, model, baseline))
+                row.append(agg.mean if agg is not None and agg.n else None)
+            table.append(row)
+        return table
+
+    # ----- exports -----
+
+    @staticmethod
+    def header() -> List[str]:
+        return ['project'] + [BASELINE_DISPLAY_NAMES[b] for b in BASELINE_ORDER]
+
+    def format_tsv(self, metric: str) -> List[str]:
+        lines = ["\t".join(self.header())]
+        for row in self.pivot(metric):
+            lines.append("\t".join([row[0]] + [f"{v:.9f}" if v is not None else "None" for v in row[1:]]))
+        return lines
+
+    def export_csv(self, metric: str, path: str) -> None:
+        with open(path, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(self.header())
+            for row in self.pivot(metric):
+                writer.writerow([row[0]] + [f"{v:.9f}" if v is not None else "None" for v in row[1:]])
+
+    def export_stats_csv(self, path: str) -> None:
+        """Long-format table with count, mean, std and 95% CI for every cell and metric."""
+        with open(path, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['metric', 'project', 'model', 'baseline', 'n', 'mean', 'std', 'ci95_low', 'ci95_high'])
+            for metric in METRICS:
+                for a in self.aggregate(metric):
+                    ci = a.ci95
+                    writer.writerow([
+                        metric, a.project, a.model, a.column, a.n,
+                        _fmt(a.mean), _fmt(a.std),
+                        _fmt(a.mean - ci if ci is not None else None),
+                        _fmt(a.mean + ci if ci is not None else None),
+                    ])
+
+    def export_latex(self, metric: str, path: str) -> None:
+        """Tabular with mean ± 95% CI half-width per cell."""
+        cells = {(a.project, a.model, a.column): a for a in self.aggregate(metric)}
+        lines = [
+            "\\begin{tabular}{l" + "r" * len(BASELINE_ORDER) + "}",
+            "\\hline",
+            " & ".join(self.header()) + " \\\\",
+            "\\hline",
+        ]
+        for project, model in self.project_models():
+            row = [row_label(project, model)]
+            for baseline in BASELINE_ORDER:
+                a = cells.get((project, model, baseline))
+                if a is None or a.mean is None:
+                    row.append("--")
+                elif a.ci95 is not None:
+                    row.append(f"{a.mean * 100:.2f} $\\pm$ {a.ci95 * 100:.2f}")
+                else:
+                    row.append(f"{a.mean * 100:.2f}")
+            lines.append(" & ".join(row) + " \\\\")
+        lines += ["\\hline", "\\end{tabular}"]
+        with open(path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+
+    def export_xlsx(self, path: str) -> bool:
+        """Write one sheet per metric. Returns False when openpyxl is not installed."""
+        try:
+            from openpyxl import Workbook
+            from openpyxl.styles import Font, PatternFill, Alignment
+        except ImportError:
+            return False
+
+        wb = Workbook()
+        wb.remove(wb.active)
+        header = self.header()
+        for metric, title in (('coverage', 'Coverage'), ('validrate', 'Valid Rate')):
+            ws = wb.create_sheet(title)
+            table = self.pivot(metric)
+            ws.append(header)
+            for row in table:
+                ws.append(row)
+
+            for cell in ws[1]:
+                cell.font = Font(bold=True)
+                cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+                cell.alignment = Alignment(horizontal="center")
+            for row_cells in ws.iter_rows(min_row=2):
+                row_cells[0].font = Font(bold=True)
+                for cell in row_cells[1:]:
+                    if cell.value is not None:
+                        cell.number_format = '0.000000000'
+
+            # Column widths from the data instead of re-reading every cell
+            for idx, column in enumerate(zip(header, *table)):
+                width = max(len(str(v)) for v in column)
+                ws.column_dimensions[ws.cell(row=1, column=idx + 1).column_letter].width = min(width + 2, 50)
+        wb.save(path)
+        return True
+
+
+def _fmt(value: Optional[float]) -> str:
+    return f"{value:.9f}" if value is not None else "None"
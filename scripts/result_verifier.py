@@ -1,12 +1,22 @@
 import os
+import sys
 import glob
 import subprocess
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import re
 import concurrent.futures
 from dataclasses import dataclass
 from collections import defaultdict
+import shutil
+import time
+from result_store import ResultStore
+from conda_env import resolve_conda_env
+from go_overlay import evaluate_go_folder, overlay_available
+from jacoco_report import read_totals
+from python_evaluator import (DEFAULT_CACHE_DIR, DEFAULT_TIMEOUT_SECONDS, EvaluationCache, FolderEvaluation,
+                              evaluate_folder, evaluate_test_file)
+from test_file_map import is_test_file
 
 @dataclass
 class TestResult:
@@ -19,12 +29,14 @@ class TestResult:
     coverage_output: float = None
     validrate_output: float = None
     error: str = None
+    folder_path: str = None
 
 class ParallelRunner:
     """Parallel test runner that extends the original Runner"""
     
-    def __init__(self, max_workers: int = 4):
-        self.runner = Runner()
+    def __init__(self, max_workers: int = 4, evaluation_cache: Optional[EvaluationCache] = None,
+                 go_overlay: bool = True):
+        self.runner = Runner(evaluation_cache, go_overlay)
         self.max_workers = max_workers
     
     def run_single_test(self, project: str, folder: Path, target_type: str) -> TestResult:
@@ -38,6 +50,7 @@ class ParallelRunner:
                 baseline=self._extract_baseline_from_path(folder),
                 target_type=target_type,
                 folder_name=folder.name,
+                folder_path=str(folder),
                 coverage_output=result.get("coverage_output"),
                 validrate_output=result.get("validrate_output")
             )
@@ -48,6 +61,7 @@ class ParallelRunner:
                 baseline=self._extract_baseline_from_path(folder),
                 target_type=target_type,
                 folder_name=folder.name,
+                folder_path=str(folder),
                 error=str(e)
             )
     
@@ -167,409 +181,71 @@ class ResultSummarizer:
                     else:
                         print(f"  No successful results for {target_type}")
 
-    def print_as_csv(self, organized_results: Dict[Tuple[str, str, str], Dict[str, List[TestResult]]]) -> None:
+    def print_as_csv(self, organized_results: Dict[Tuple[str, str, str], Dict[str, List[TestResult]]],
+                     store: Optional[ResultStore] = None) -> None:
         """
         Print the results as a csv file and also save to CSV files
         project codeQA	StandardRAG	Naive	SymPrompt	LSPRAG	DraCo	LSPRAG-nofix
         cli-4o-mini	0.120916031	0.071653944	0.056386768	0.02778626	0.332926209	None	0.271043257
         cli-4o	0.123256997	0.035012723	0.137709924	0.045903308	0.346870229	None	0.231552163
         cli-deepseek	0.226666667	0.176793893	0.097811705	0.069720102	0.377201018	None	0.287735369
+
+        All tables are aggregated from a ResultStore; pass a persistent store to
+        summarize historical runs, otherwise the given results are loaded into an
+        in-memory one.
         """
+        if store is None:
+            store = ResultStore()
+            store.add_results(r for target_dict in organized_results.values()
+                              for results in target_dict.values() for r in results)
+
         # First print to console as before
-        self._print_csv_to_console(organized_results)
+        self._print_csv_to_console(store)
         
         # Then save to CSV files
-        self._save_csv_to_files(organized_results)
+        self._save_csv_to_files(store)
     
-    def _print_csv_to_console(self, organized_results: Dict[Tuple[str, str, str], Dict[str, List[TestResult]]]) -> None:
+    def _print_csv_to_console(self, store: ResultStore) -> None:
         """Print CSV format results to console"""
-        print("\n" + "="*100)
-        print("COVERAGE RESULTS SUMMARY (CSV FORMAT)")
-        print("="*100)
-        
-        # Define baseline order for consistent output
-        baseline_order = ['code_qa', 'standard', 'naive', 'symprompt', 'lsprag', 'draco', 'lsprag-nofix']
-        baseline_display_names = {
-            'code_qa': 'codeQA',
-            'standard': 'StandardRAG', 
-            'naive': 'Naive',
-            'symprompt': 'SymPrompt',
-            'lsprag': 'LSPRAG',
-            'draco': 'DraCo',
-            'lsprag-nofix': 'LSPRAG-nofix'
-        }
-        
-        # Collect all unique project-model combinations
-        project_model_combinations = set()
-        for (project, model, baseline) in organized_results.keys():
-            project_model_combinations.add((project, model))
-        
-        # Sort project-model combinations for consistent output
-        # Order models as: 4o-mini -> 4o -> deepseek
-        def model_sort_key(project_model):
-            project, model = project_model
-            model_order = {'gpt-4o-mini': 0, 'gpt-4o': 1, 'deepseek-chat': 2}
-            return (project, model_order.get(model, 999))
-        
-        project_model_combinations = sorted(project_model_combinations, key=model_sort_key)
-        
-        # Print header
-        header = "project"
-        for baseline in baseline_order:
-            header += f"\t{baseline_display_names[baseline]}"
-        print(header)
-        
-        # Print results for each project-model combination
-        for project, model in project_model_combinations:
-            # Create project-model identifier (e.g., "cli-4o-mini")
-            project_short = project.replace('commons-', '')  # Remove "commons-" prefix
-            model_short = model.replace('gpt-4o-mini', '4o-mini').replace('gpt-4o', '4o').replace('deepseek-chat', 'deepseek')
-            row_id = f"{project_short}-{model_short}"
-            
-            row = row_id
-            
-            # Get coverage values for each baseline
-            for baseline in baseline_order:
-                if baseline == 'lsprag-nofix':
-                    # For lsprag-nofix, get initial results from lsprag baseline
-                    key = (project, model, 'lsprag')
-                    if key in organized_results:
-                        target_dict = organized_results[key]
-                        results = target_dict.get('initial', [])
-                        
-                        if results:
-                            # Calculate average coverage from successful results
-                            successful_results = [r for r in results if r.error is None and r.coverage_output is not None]
-                            if successful_results:
-                                avg_coverage = sum(r.coverage_output for r in successful_results) / len(successful_results)
-                                row += f"\t{avg_coverage:.9f}"
-                            else:
-                                row += "\tNone"
-                        else:
-                            row += "\tNone"
-                    else:
-                        row += "\tNone"
-                else:
-                    # For other baselines (naive, symprompt, lsprag, draco), use final results
-                    key = (project, model, baseline)
-                    if key in organized_results:
-                        target_dict = organized_results[key]
-                        results = target_dict.get('final', []) or target_dict.get('codes', [])
-                        
-                        if results:
-                            # Calculate average coverage from successful results
-                            successful_results = [r for r in results if r.error is None and r.coverage_output is not None]
-                            if successful_results:
-                                avg_coverage = sum(r.coverage_output for r in successful_results) / len(successful_results)
-                                row += f"\t{avg_coverage:.9f}"
-                            else:
-                                row += "\tNone"
-                        else:
-                            row += "\tNone"
-                    else:
-                        row += "\tNone"
-            
-            print(row)
-        
-        print("\n" + "="*100)
-        print("VALID RATE RESULTS SUMMARY (CSV FORMAT)")
-        print("="*100)
-        
-        # Print header for valid rate
-        print(header)
-        
-        # Print valid rate results for each project-model combination
-        for project, model in project_model_combinations:
-            # Create project-model identifier (e.g., "cli-4o-mini")
-            project_short = project.replace('commons-', '')  # Remove "commons-" prefix
-            model_short = model.replace('gpt-4o-mini', '4o-mini').replace('gpt-4o', '4o').replace('deepseek-chat', 'deepseek')
-            row_id = f"{project_short}-{model_short}"
-            
-            row = row_id
-            
-            # Get valid rate values for each baseline
-            for baseline in baseline_order:
-                if baseline == 'lsprag-nofix':
-                    # For lsprag-nofix, get initial results from lsprag baseline
-                    key = (project, model, 'lsprag')
-                    if key in organized_results:
-                        target_dict = organized_results[key]
-                        results = target_dict.get('initial', [])
-                        
-                        if results:
-                            # Calculate average valid rate from successful results
-                            successful_results = [r for r in results if r.error is None and r.validrate_output is not None]
-                            if successful_results:
-                                avg_validrate = sum(r.validrate_output for r in successful_results) / len(successful_results)
-                                row += f"\t{avg_validrate:.9f}"
-                            else:
-                                row += "\tNone"
-                        else:
-                            row += "\tNone"
-                    else:
-                        row += "\tNone"
-                else:
-                    # For other baselines (naive, symprompt, lsprag, draco), use final results
-                    key = (project, model, baseline)
-                    if key in organized_results:
-                        target_dict = organized_results[key]
-                        results = target_dict.get('final', []) or target_dict.get('codes', [])
-                        
-                        if results:
-                            # Calculate average valid rate from successful results
-                            successful_results = [r for r in results if r.error is None and r.validrate_output is not None]
-                            if successful_results:
-                                avg_validrate = sum(r.validrate_output for r in successful_results) / len(successful_results)
-                                row += f"\t{avg_validrate:.9f}"
-                            else:
-                                row += "\tNone"
-                        else:
-                            row += "\tNone"
-                    else:
-                        row += "\tNone"
-            
-            print(row)
+        for metric, title in (('coverage', 'COVERAGE'), ('validrate', 'VALID RATE')):
+            print("\n" + "="*100)
+            print(f"{title} RESULTS SUMMARY (CSV FORMAT)")
+            print("="*100)
+            for line in store.format_tsv(metric):
+                print(line)
     
-    def _save_csv_to_files(self, organized_results: Dict[Tuple[str, str, str], Dict[str, List[TestResult]]]) -> None:
-        """Save CSV and Excel format results to files"""
-        import csv
+    def _save_csv_to_files(self, store: ResultStore) -> None:
+        """Save CSV, Excel and LaTeX format results to files"""
         from datetime import datetime
         
-        # Try to import openpyxl for Excel support
-        try:
-            import openpyxl
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, PatternFill, Alignment
-            excel_available = True
-        except ImportError:
-            excel_available = False
-            print("Warning: openpyxl not installed. Excel files will not be generated.")
-            print("Install with: pip install openpyxl")
-        
-        # Define baseline order for consistent output
-        baseline_order = ['code_qa', 'standard', 'naive', 'symprompt', 'lsprag', 'draco', 'lsprag-nofix']
-        baseline_display_names = {
-            'code_qa': 'codeQA',
-            'standard': 'StandardRAG', 
-            'naive': 'Naive',
-            'symprompt': 'SymPrompt',
-            'lsprag': 'LSPRAG',
-            'draco': 'DraCo',
-            'lsprag-nofix': 'LSPRAG-nofix'
-        }
-        
-        # Collect all unique project-model combinations
-        project_model_combinations = set()
-        for (project, model, baseline) in organized_results.keys():
-            project_model_combinations.add((project, model))
-        
-        # Sort project-model combinations for consistent output
-        def model_sort_key(project_model):
-            project, model = project_model
-            model_order = {'gpt-4o-mini': 0, 'gpt-4o': 1, 'deepseek-chat': 2}
-            return (project, model_order.get(model, 999))
-        
-        project_model_combinations = sorted(project_model_combinations, key=model_sort_key)
-        
         # Create timestamp for filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Prepare data for both CSV and Excel
-        coverage_data = []
-        validrate_data = []
-        
-        # Prepare coverage data
-        for project, model in project_model_combinations:
-            project_short = project.replace('commons-', '')
-            model_short = model.replace('gpt-4o-mini', '4o-mini').replace('gpt-4o', '4o').replace('deepseek-chat', 'deepseek')
-            row_id = f"{project_short}-{model_short}"
-            
-            row = [row_id]
-            
-            # Get coverage values for each baseline
-            for baseline in baseline_order:
-                if baseline == 'lsprag-nofix':
-                    key = (project, model, 'lsprag')
-                    if key in organized_results:
-                        target_dict = organized_results[key]
-                        results = target_dict.get('initial', [])
-                        
-                        if results:
-                            successful_results = [r for r in results if r.error is None and r.coverage_output is not None]
-                            if successful_results:
-                                avg_coverage = sum(r.coverage_output for r in successful_results) / len(successful_results)
-                                row.append(avg_coverage)
-                            else:
-                                row.append(None)
-                        else:
-                            row.append(None)
-                    else:
-                        row.append(None)
-                else:
-                    key = (project, model, baseline)
-                    if key in organized_results:
-                        target_dict = organized_results[key]
-                        results = target_dict.get('final', []) or target_dict.get('codes', [])
-                        
-                        if results:
-                            successful_results = [r for r in results if r.error is None and r.coverage_output is not None]
-                            if successful_results:
-                                avg_coverage = sum(r.coverage_output for r in successful_results) / len(successful_results)
-                                row.append(avg_coverage)
-                            else:
-                                row.append(None)
-                        else:
-                            row.append(None)
-                    else:
-                        row.append(None)
-            
-            coverage_data.append(row)
-        
-        # Prepare valid rate data
-        for project, model in project_model_combinations:
-            project_short = project.replace('commons-', '')
-            model_short = model.replace('gpt-4o-mini', '4o-mini').replace('gpt-4o', '4o').replace('deepseek-chat', 'deepseek')
-            row_id = f"{project_short}-{model_short}"
-            
-            row = [row_id]
-            
-            # Get valid rate values for each baseline
-            for baseline in baseline_order:
-                if baseline == 'lsprag-nofix':
-                    key = (project, model, 'lsprag')
-                    if key in organized_results:
-                        target_dict = organized_results[key]
-                        results = target_dict.get('initial', [])
-                        
-                        if results:
-                            successful_results = [r for r in results if r.error is None and r.validrate_output is not None]
-                            if successful_results:
-                                avg_validrate = sum(r.validrate_output for r in successful_results) / len(successful_results)
-                                row.append(avg_validrate)
-                            else:
-                                row.append(None)
-                        else:
-                            row.append(None)
-                    else:
-                        row.append(None)
-                else:
-                    key = (project, model, baseline)
-                    if key in organized_results:
-                        target_dict = organized_results[key]
-                        results = target_dict.get('final', []) or target_dict.get('codes', [])
-                        
-                        if results:
-                            successful_results = [r for r in results if r.error is None and r.validrate_output is not None]
-                            if successful_results:
-                                avg_validrate = sum(r.validrate_output for r in successful_results) / len(successful_results)
-                                row.append(avg_validrate)
-                            else:
-                                row.append(None)
-                        else:
-                            row.append(None)
-                    else:
-                        row.append(None)
-            
-            validrate_data.append(row)
-        
-        # Save CSV files
         coverage_filename = f"coverage_results_{timestamp}.csv"
-        with open(coverage_filename, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            
-            # Write header
-            header = ['project'] + [baseline_display_names[baseline] for baseline in baseline_order]
-            writer.writerow(header)
-            
-            # Write data rows
-            for row in coverage_data:
-                csv_row = [row[0]] + [f"{val:.9f}" if val is not None else "None" for val in row[1:]]
-                writer.writerow(csv_row)
+        store.export_csv('coverage', coverage_filename)
         
         validrate_filename = f"validrate_results_{timestamp}.csv"
-        with open(validrate_filename, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            
-            # Write header
-            header = ['project'] + [baseline_display_names[baseline] for baseline in baseline_order]
-            writer.writerow(header)
-            
-            # Write data rows
-            for row in validrate_data:
-                csv_row = [row[0]] + [f"{val:.9f}" if val is not None else "None" for val in row[1:]]
-                writer.writerow(csv_row)
+        store.export_csv('validrate', validrate_filename)
+
+        stats_filename = f"summary_stats_{timestamp}.csv"
+        store.export_stats_csv(stats_filename)
+
+        latex_filename = f"coverage_results_{timestamp}.tex"
+        store.export_latex('coverage', latex_filename)
         
         # Save Excel file if openpyxl is available
-        excel_filename = None
-        if excel_available:
-            excel_filename = f"test_results_{timestamp}.xlsx"
-            wb = Workbook()
-            
-            # Remove default sheet
-            wb.remove(wb.active)
-            
-            # Create Coverage sheet
-            ws_coverage = wb.create_sheet("Coverage")
-            ws_coverage.title = "Coverage"
-            
-            # Add header to coverage sheet
-            header = ['project'] + [baseline_display_names[baseline] for baseline in baseline_order]
-            for col, value in enumerate(header, 1):
-                cell = ws_coverage.cell(row=1, column=col, value=value)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center")
-            
-            # Add data to coverage sheet
-            for row_idx, row_data in enumerate(coverage_data, 2):
-                for col_idx, value in enumerate(row_data, 1):
-                    cell = ws_coverage.cell(row=row_idx, column=col_idx, value=value)
-                    if col_idx == 1:  # Project column
-                        cell.font = Font(bold=True)
-                    elif value is not None:  # Numeric values
-                        cell.number_format = '0.000000000'
-            
-            # Create Valid Rate sheet
-            ws_validrate = wb.create_sheet("Valid Rate")
-            ws_validrate.title = "Valid Rate"
-            
-            # Add header to valid rate sheet
-            for col, value in enumerate(header, 1):
-                cell = ws_validrate.cell(row=1, column=col, value=value)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center")
-            
-            # Add data to valid rate sheet
-            for row_idx, row_data in enumerate(validrate_data, 2):
-                for col_idx, value in enumerate(row_data, 1):
-                    cell = ws_validrate.cell(row=row_idx, column=col_idx, value=value)
-                    if col_idx == 1:  # Project column
-                        cell.font = Font(bold=True)
-                    elif value is not None:  # Numeric values
-                        cell.number_format = '0.000000000'
-            
-            # Auto-adjust column widths
-            for ws in [ws_coverage, ws_validrate]:
-                for column in ws.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    ws.column_dimensions[column_letter].width = adjusted_width
-            
-            # Save Excel file
-            wb.save(excel_filename)
+        excel_filename = f"test_results_{timestamp}.xlsx"
+        if not store.export_xlsx(excel_filename):
+            excel_filename = None
+            print("Warning: openpyxl not installed. Excel files will not be generated.")
+            print("Install with: pip install openpyxl")
         
         # Print file information
         print(f"\nFiles saved:")
         print(f"  Coverage results: {coverage_filename}")
         print(f"  Valid rate results: {validrate_filename}")
+        print(f"  Summary statistics (n, mean, std, 95% CI): {stats_filename}")
+        print(f"  LaTeX coverage table: {latex_filename}")
         if excel_filename:
             print(f"  Excel results: {excel_filename}")
 
@@ -666,6 +342,22 @@ Pass rate: 54.55%
             result["validrate_output"] = class_files / total_java_files if total_java_files > 0 else 0.0
         
         return result
+
+    @staticmethod
+    def java_report_coverage(report_dir: str) -> dict:
+        """
+        Line coverage straight from <report_dir>/jacoco.xml (java_coverage.bash writes it
+        next to the HTML report); empty if there is no readable XML report.
+        """
+        xml_report = os.path.join(report_dir, "jacoco.xml")
+        if not os.path.exists(xml_report):
+            return {}
+        try:
+            lines = read_totals(xml_report).counter("LINE")
+        except (OSError, ValueError, SyntaxError) as e:  # ParseError is a SyntaxError
+            print(f"Warning: could not read {xml_report}: {e}")
+            return {}
+        return {"coverage": f"{lines.covered} / {lines.total}", "coverage_output": lines.ratio}
     
     @staticmethod
     def python_output_parser(output: str, project_name: str = None) -> dict:
@@ -730,7 +422,14 @@ class Runner:
         "logrus": "/LSPRAG/experiments/projects/logrus",
     }
     
-    def __init__(self):
+    def __init__(self, evaluation_cache: Optional[EvaluationCache] = None, go_overlay: bool = True):
+        # With --eval-cache, Python projects are evaluated in-process through this cache,
+        # so byte-identical test files across folders run only once; otherwise by python_coverage.bash
+        self.evaluation_cache = evaluation_cache
+        # Go projects run through go_overlay.py (no per-folder copy of the project) unless disabled
+        # or its smoke test fails, in which case go_coverage.bash is used
+        self.go_overlay = go_overlay
+
         # Define which script to use for each project
         self.project_scripts = {
             "commons-cli": "/LSPRAG/scripts/java_coverage.bash",
@@ -751,6 +450,23 @@ class Runner:
             "logrus": Parser.go_output_parser,
         }
     
+    def _conda_environ(self, conda_env_name: str) -> Optional[Dict[str, str]]:
+        """
+        Environment of an activated conda env, resolved once and cached (see conda_env.py).
+        Returns None if it cannot be resolved, in which case callers fall back to `conda run`.
+        """
+        try:
+            return resolve_conda_env(conda_env_name).environ()
+        except (subprocess.CalledProcessError, FileNotFoundError, ValueError, KeyError, IndexError) as e:
+            print(f"Warning: could not resolve conda env {conda_env_name} ({e}); falling back to conda run")
+            return None
+
+    def python_for(self, project_name: str) -> Tuple[str, Optional[Dict[str, str]]]:
+        """Interpreter and environment used to evaluate a Python project's tests."""
+        env = self._conda_environ(project_name)
+        python = shutil.which("python3", path=env.get("PATH")) if env else None
+        return python or sys.executable, env
+
     def run_test(self, project_name: str, experiment_save_folder_path: str) -> dict:
         """
         Run the test for a specific project and experiment folder
@@ -783,17 +499,42 @@ class Runner:
             raise FileNotFoundError(f"Experiment folder does not exist: {experiment_save_folder_path}")
         
         # Run the test command
+        cmd = []
         try:
+            if project_name in ["black", "tornado"] and self.evaluation_cache is not None:
+                python, env = self.python_for(project_name)
+                output = evaluate_folder(project_path, experiment_save_folder_path, python=python, env=env,
+                                         cache=self.evaluation_cache)
+                print(f"Command output for {project_name}:")
+                print("-" * 50)
+                print(output)
+                print("-" * 50)
+                return self.project_parsers[project_name](output, project_name)
+
+            # go_overlay.py is only used once its smoke test passed with this toolchain
+            if project_name in ["cobra", "logrus"] and self.go_overlay and overlay_available():
+                output = evaluate_go_folder(project_path, experiment_save_folder_path)
+                print(f"Command output for {project_name}:")
+                print("-" * 50)
+                print(output)
+                print("-" * 50)
+                return self.project_parsers[project_name](output)
+
             if project_name in ["black", "tornado"]:
                 # Both black and tornado need conda environment
                 conda_env_name = project_name  # Use project name as conda env name
-                cmd = ["conda", "run", "-n", conda_env_name, "bash", script_path, project_path, experiment_save_folder_path]
+                env = self._conda_environ(conda_env_name)
+                if env is not None:
+                    cmd = ["bash", script_path, project_path, experiment_save_folder_path]
+                else:
+                    cmd = ["conda", "run", "-n", conda_env_name, "bash", script_path, project_path, experiment_save_folder_path]
                 result = subprocess.run(
                     cmd,
                     capture_output=True,
                     text=True,
                     check=True,
-                    cwd=os.path.dirname(script_path)
+                    cwd=os.path.dirname(script_path),
+                    env=env
                 )
             else :
                 cmd = ["bash", script_path, project_path, experiment_save_folder_path]
@@ -820,6 +561,9 @@ class Runner:
                 parsed_result = parser(output, project_name)
             else:
                 parsed_result = parser(output)
+            if project_name in ["commons-cli", "commons-csv"]:
+                # Structured counters from the XML report take precedence over the printed text
+                parsed_result.update(Parser.java_report_coverage(f"{experiment_save_folder_path}-report"))
             
             return parsed_result
             
@@ -1064,10 +808,217 @@ class FileFounder:
         
         print("=" * 80)
 
+class WatchRunner:
+    """
+    Evaluate generated tests while generation is still running (--watch).
+
+    The watch root (an LSPRAG-workspace run directory or a results folder) is
+    polled; each Python test file is evaluated as soon as it has been saved
+    (size and mtime unchanged between two polls) and merged into the running
+    totals of its target folder (final/initial/codes). When the run completes
+    (done file appears or no new files for idle_timeout seconds) every folder
+    is finalized and summarized like a batch run. Go and Java projects have no
+    per-file evaluator, so their folders are evaluated once at completion.
+    """
+
+    def __init__(self, project_name: str, watch_root: str, max_workers: int = 8,
+                 poll_interval: float = 5.0, idle_timeout: float = 600.0,
+                 done_file: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 evaluation_cache: Optional[EvaluationCache] = None, go_overlay: bool = True,
+                 retry_hangs: bool = False):
+        self.project_name = project_name
+        self.watch_root = Path(watch_root)
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.done_file = done_file
+        self.timeout = timeout
+        self.retry_hangs = retry_hangs
+        self.evaluation_cache = evaluation_cache
+        self.go_overlay = go_overlay
+        self.runner = Runner(evaluation_cache, go_overlay)
+        self.founder = FileFounder(str(self.watch_root))
+        self.evaluations: Dict[Path, FolderEvaluation] = {}
+        self._seen: Dict[str, Tuple[float, int]] = {}
+        self._pending: Dict[str, Tuple[float, int]] = {}
+
+    def _target_folder(self, test_file: Path) -> Path:
+        for parent in test_file.parents:
+            if parent.name in self.founder.target_folders:
+                return parent
+            if parent == self.watch_root:
+                break
+        return self.watch_root
+
+    def _scan(self) -> List[Path]:
+        """Return test files that are new or changed and have stopped growing."""
+        ready = []
+        for path in self.watch_root.rglob("*.py"):
+            if "-report" in str(path.parent) or not is_test_file(path.name, prefixes=()):
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            key, sig = str(path), (st.st_mtime, st.st_size)
+            if self._seen.get(key) == sig:
+                continue
+            if self._pending.get(key) == sig:
+                del self._pending[key]
+                self._seen[key] = sig
+                ready.append(path)
+            else:
+                self._pending[key] = sig
+        return ready
+
+    def _finished(self, last_activity: float) -> bool:
+        if self.done_file and os.path.exists(self.done_file):
+            return True
+        return time.monotonic() - last_activity > self.idle_timeout
+
+    def run(self) -> List[TestResult]:
+        if self.project_name not in ["black", "tornado"]:
+            return self._run_batch_at_completion()
+
+        project_path = self.runner.projectpath[self.project_name]
+        python, env = self.runner.python_for(self.project_name)
+        evaluate = self.evaluation_cache.evaluate if self.evaluation_cache is not None else evaluate_test_file
+        print(f"Watching {self.watch_root} for {self.project_name} tests (python={python})")
+
+        last_activity = time.monotonic()
+        futures: Dict[concurrent.futures.Future, Tuple[FolderEvaluation, Path]] = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                ready = self._scan()
+                if ready or self._pending:
+                    last_activity = time.monotonic()
+                for test_file in ready:
+                    folder = self._target_folder(test_file)
+                    evaluation = self.evaluations.get(folder)
+                    if evaluation is None:
+                        evaluation = FolderEvaluation(project_path, str(folder))
+                        evaluation.reset_report_dir()
+                        self.evaluations[folder] = evaluation
+                    fut = executor.submit(evaluate, project_path, str(test_file), evaluation.report_dir,
+                                          python, env, self.timeout, retry_hangs=self.retry_hangs)
+                    futures[fut] = (evaluation, test_file)
+
+                for fut in [f for f in futures if f.done()]:
+                    evaluation, test_file = futures.pop(fut)
+                    # One file that cannot be evaluated must not end the watch
+                    try:
+                        evaluation.add(fut.result())
+                    except Exception as e:
+                        print(f"Error evaluating {test_file}: {e}")
+                        continue
+                    print(evaluation.progress_line())
+
+                if not self._pending and not futures and self._finished(last_activity):
+                    break
+                time.sleep(self.poll_interval)
+
+        results = []
+        for folder, evaluation in sorted(self.evaluations.items()):
+            output = evaluation.finalize(python, env)
+            print(output)
+            parsed = Parser.python_output_parser(output, self.project_name)
+            results.append(self._to_result(folder, parsed))
+        return results
+
+    def _run_batch_at_completion(self) -> List[TestResult]:
+        print(f"No per-file evaluator for {self.project_name}; waiting for the run to complete")
+        last_activity = time.monotonic()
+        while not self._finished(last_activity):
+            if self._scan_any_change():
+                last_activity = time.monotonic()
+            time.sleep(self.poll_interval)
+        runner = ParallelRunner(max_workers=self.max_workers, evaluation_cache=self.evaluation_cache,
+                                go_overlay=self.go_overlay)
+        organized = self.founder.organize_folders()
+        return runner.run_tests_parallel(organized)
+
+    def _scan_any_change(self) -> bool:
+        changed = False
+        for path in self.watch_root.rglob("*"):
+            if "-report" in str(path.parent):
+                continue
+            try:
+                if not path.is_file():
+                    continue
+                st = path.stat()
+            except OSError:
+                # Deleted or replaced between rglob and stat
+                continue
+            sig = (st.st_mtime, st.st_size)
+            if self._seen.get(str(path)) != sig:
+                self._seen[str(path)] = sig
+                changed = True
+        return changed
+
+    def _to_result(self, folder: Path, parsed: dict) -> TestResult:
+        _, model, baseline, target_type = self.founder.classify_folder(folder)
+        return TestResult(
+            project=self.project_name,
+            model=model or "unknown",
+            baseline=baseline or "unknown",
+            target_type=target_type or folder.name,
+            folder_name=folder.name,
+            folder_path=str(folder),
+            coverage_output=parsed.get("coverage_output"),
+            validrate_output=parsed.get("validrate_output"),
+        )
+
 if __name__ == "__main__":
     # data_root_path = "/LSPRAG/experiments/data/main_result/commons-cli"
-    import sys 
-    data_root_path = sys.argv[1]
+    import argparse
+    ap = argparse.ArgumentParser(description="Run coverage/valid-rate evaluation over experiment result folders.")
+    ap.add_argument("data_root_path", nargs="?", help="Root folder of experiment results (e.g. .../main_result/commons-cli).")
+    ap.add_argument("--store", default=None,
+                    help="SQLite results store; every evaluated folder is appended as one row.")
+    ap.add_argument("--from-store", action="store_true",
+                    help="Only aggregate the runs already in --store, without re-running the verifier.")
+    ap.add_argument("--watch", default=None, metavar="DIR",
+                    help="Evaluate tests under DIR incrementally while generation is running.")
+    ap.add_argument("--project", default=None, help="Project name for --watch (e.g. black, tornado).")
+    ap.add_argument("--done-file", default=None,
+                    help="With --watch: the run is complete once this file exists.")
+    ap.add_argument("--idle-timeout", type=float, default=600.0,
+                    help="With --watch: the run is complete after this many seconds without new test files.")
+    ap.add_argument("--poll-interval", type=float, default=5.0, help="With --watch: seconds between scans.")
+    ap.add_argument("--eval-cache", nargs="?", const=DEFAULT_CACHE_DIR, default=None, metavar="DIR",
+                    help="Evaluate black/tornado in-process instead of with python_coverage.bash, reusing "
+                         "outcomes of identical test files from DIR (default DIR: %s)." % DEFAULT_CACHE_DIR)
+    ap.add_argument("--go-bash", action="store_true",
+                    help="Run go_coverage.bash (copies the project into every folder) instead of go_overlay.py.")
+    args = ap.parse_args()
+    evaluation_cache = EvaluationCache(args.eval_cache) if args.eval_cache else None
+
+    if args.watch:
+        if not args.project:
+            ap.error("--watch requires --project")
+        watch_runner = WatchRunner(args.project, args.watch, poll_interval=args.poll_interval,
+                                   idle_timeout=args.idle_timeout, done_file=args.done_file,
+                                   evaluation_cache=evaluation_cache, go_overlay=not args.go_bash)
+        all_results = watch_runner.run()
+        summarizer = ResultSummarizer()
+        organized_results = summarizer.organize_results(all_results)
+        summarizer.print_final_summary(organized_results)
+        store = None
+        if args.store:
+            store = ResultStore(args.store)
+            store.add_results(all_results)
+        summarizer.print_as_csv(organized_results, store=store)
+        sys.exit(0)
+
+    if args.from_store:
+        if not args.store:
+            ap.error("--from-store requires --store")
+        ResultSummarizer().print_as_csv({}, store=ResultStore(args.store))
+        sys.exit(0)
+    if not args.data_root_path:
+        ap.error("data_root_path is required unless --from-store is given")
+
+    data_root_path = args.data_root_path
     # data_root_path = "/LSPRAG/experiments/data/main_result/commons-cli"
     file_founder = FileFounder(data_root_path)
     max_workers = 30
@@ -1090,11 +1041,18 @@ if __name__ == "__main__":
     # Run tests in parallel
     # test_csv_printing_with_mock_data()
 
-    parallel_runner = ParallelRunner(max_workers=max_workers)
+    parallel_runner = ParallelRunner(max_workers=max_workers, evaluation_cache=evaluation_cache,
+                                     go_overlay=not args.go_bash)
     all_results = parallel_runner.run_tests_parallel(organized)
+    if evaluation_cache is not None:
+        print(f"Evaluation cache: {evaluation_cache.hits} test files reused, {evaluation_cache.misses} executed")
     # Organize and display final results
     summarizer = ResultSummarizer()
     organized_results = summarizer.organize_results(all_results)
     summarizer.print_final_summary(organized_results)
     # Print CSV format results
-    summarizer.print_as_csv(organized_results)
\ No newline at end of file
+    store = None
+    if args.store:
+        store = ResultStore(args.store)
+        store.add_results(all_results)
+    summarizer.print_as_csv(organized_results, store=store)
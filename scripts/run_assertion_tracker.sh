@@ -1,9 +1,14 @@
 #!/bin/bash
 # Wrapper script to run assertion tracker with proper environment
 
-# Activate black conda environment
-source $(conda info --base)/etc/profile.d/conda.sh
-conda activate black
+# Activate black conda environment (resolved once and cached by conda_env.py);
+# if it cannot be resolved, activate it through conda as before
+if conda_exports="$(python3 /LSPRAG/scripts/conda_env.py --shell black)"; then
+    eval "$conda_exports"
+else
+    echo "Warning: conda_env.py could not resolve the black environment; using conda activate" >&2
+    source "$(conda info --base)/etc/profile.d/conda.sh" && conda activate black || exit 1
+fi
 
 # Set PYTHONPATH for black project
 export PYTHONPATH=experiments/projects/black:experiments/projects/black/src:experiments/projects/black/src/black:experiments/projects/black/crawl4ai
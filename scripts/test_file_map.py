@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Shared index over the test file maps in experiments/config.
+
+    <project>_test_file_map.json / <project>_test_file_baselines.json
+        test file name -> {file_name, symbol_name, ...}
+
+Generated test files carry random numbers the map keys do not have
+(parse_atom_1561_test.py vs parse_atom_test.py), so files are matched on
+normalize_test_name(). TestFileMap normalizes every key once and answers
+lookups from a dict; the reverse indexes give the tests of a source file or
+of a focal symbol. When two keys normalize to the same name the first one in
+file order wins, as the original linear scan did.
+
+discover_test_files() is the one directory scan for generated tests used by
+the evaluator, the verifier, focal_coverage.py and compute_mutation_score.py.
+
+Usage:
+    python test_file_map.py MAP.json [TEST_DIR]   # index stats / unmatched test files
+"""
+
+import json
+import os
+import re
+import sys
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+PYTHON_TEST_SUFFIXES = ("_test.py",)
+PYTHON_TEST_PREFIXES = ("test_",)
+
+_RANDOM_SUFFIX = re.compile(r"_\d+")
+
+
+def normalize_test_name(filename: str) -> str:
+    """Test file name without directory, .py extension and the '_<digits>' parts generation adds."""
+    name = os.path.basename(filename)
+    if name.endswith(".py"):
+        name = name[:-3]
+    return _RANDOM_SUFFIX.sub("", name)
+
+
+def is_test_file(name: str, suffixes: Sequence[str] = PYTHON_TEST_SUFFIXES,
+                 prefixes: Sequence[str] = PYTHON_TEST_PREFIXES) -> bool:
+    if name.endswith(tuple(suffixes)):
+        return True
+    # A prefix alone only marks Python files (test_foo.py), never test_data.json
+    return bool(prefixes) and name.endswith(".py") and name.startswith(tuple(prefixes))
+
+
+def discover_test_files(test_dir: str, suffixes: Sequence[str] = PYTHON_TEST_SUFFIXES,
+                        prefixes: Sequence[str] = PYTHON_TEST_PREFIXES,
+                        skip_reports: bool = True) -> List[str]:
+    """Sorted paths of the test files under test_dir (report folders '*-report' are skipped)."""
+    found = []
+    for root, dirnames, files in os.walk(test_dir):
+        if skip_reports:
+            dirnames[:] = [d for d in dirnames if not d.endswith("-report")]
+        for file_name in files:
+            if is_test_file(file_name, suffixes, prefixes):
+                found.append(os.path.join(root, file_name))
+    return sorted(found)
+
+
+class TestFileMap:
+    """Normalized-name and reverse (source file, symbol) indexes over one test file map."""
+
+    _loaded: Dict[Tuple[str, int], "TestFileMap"] = {}
+
+    def __init__(self, mapping: Dict[str, Dict[str, str]]):
+        self.mapping = mapping
+        self._by_name: Dict[str, str] = {}
+        self._by_source: Dict[str, List[str]] = {}
+        self._by_symbol: Dict[Tuple[str, str], List[str]] = {}
+        for key, info in mapping.items():
+            self._by_name.setdefault(normalize_test_name(key), key)
+            file_name = info.get("file_name")
+            if file_name:
+                self._by_source.setdefault(file_name, []).append(key)
+                self._by_symbol.setdefault((file_name, info.get("symbol_name")), []).append(key)
+
+    @classmethod
+    def load(cls, path: str) -> "TestFileMap":
+        """Load (once per path and mtime) a map file; raises OSError / ValueError like json.load."""
+        real = os.path.realpath(path)
+        cache_key = (real, os.stat(real).st_mtime_ns)
+        index = cls._loaded.get(cache_key)
+        if index is None:
+            with open(real, "r", encoding="utf-8") as f:
+                index = cls(json.load(f))
+            cls._loaded[cache_key] = index
+        return index
+
+    # dict-like access to the raw entries
+    def __len__(self) -> int:
+        return len(self.mapping)
+
+    def __getitem__(self, key: str) -> Dict[str, str]:
+        return self.mapping[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.mapping
+
+    def keys(self):
+        return self.mapping.keys()
+
+    def items(self):
+        return self.mapping.items()
+
+    # lookups
+    def key_for(self, test_filename: str) -> Optional[str]:
+        """Map key a (generated) test file name or path corresponds to."""
+        return self._by_name.get(normalize_test_name(test_filename))
+
+    def lookup(self, test_filename: str) -> Optional[Dict[str, str]]:
+        key = self.key_for(test_filename)
+        return self.mapping[key] if key else None
+
+    def source_files(self) -> List[str]:
+        """Source files (relative to the project root) any test targets."""
+        return list(self._by_source)
+
+    def tests_for_source(self, file_name: str) -> List[str]:
+        return list(self._by_source.get(file_name, []))
+
+    def tests_for_symbol(self, file_name: str, symbol_name: str) -> List[str]:
+        return list(self._by_symbol.get((file_name, symbol_name), []))
+
+    def scan(self, test_dir: str, suffixes: Sequence[str] = PYTHON_TEST_SUFFIXES,
+             prefixes: Sequence[str] = PYTHON_TEST_PREFIXES) -> Iterator[Tuple[str, Optional[str]]]:
+        """(test file path, map key or None) for every test file under test_dir."""
+        for path in discover_test_files(test_dir, suffixes, prefixes):
+            yield path, self.key_for(path)
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} MAP.json [TEST_DIR]")
+        sys.exit(1)
+    index = TestFileMap.load(sys.argv[1])
+    print(f"{len(index)} entries, {len(index._by_name)} distinct normalized names, "
+          f"{len(index.source_files())} source files, {len(index._by_symbol)} focal symbols")
+    if len(sys.argv) > 2:
+        matched = unmatched = 0
+        for path, key in index.scan(sys.argv[2]):
+            if key:
+                matched += 1
+            else:
+                unmatched += 1
+                print(f"unmatched: {os.path.relpath(path, sys.argv[2])}")
+        print(f"{matched} matched, {unmatched} unmatched test files")
+
+
+if __name__ == "__main__":
+    main()